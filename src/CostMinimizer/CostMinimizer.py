@@ -37,6 +37,7 @@ class App:
         #parse_arguments
         raw_arguments = sys.argv[1:]
         self.appConfig.arguments_parsed = ToolingArguments().command_line_arguments(raw_arguments)
+        self.appConfig.cow_execution_type = getattr(self.appConfig.arguments_parsed, 'execution_type', None) or 'sync'
         
         #setup auth manager and authentication
         #TODO this should not be handled inside config
@@ -103,6 +103,12 @@ class ToolingArguments(Singleton):
             help=f"{Fore.GREEN}Auto update the values of the configuration of the tooling{Style.RESET_ALL}",
             default=None)
 
+        # --build-pricing-snapshot; Compile pricing tables into a memory-mapped snapshot
+        parser.add_argument(
+            '--build-pricing-snapshot', action='store_true',
+            help=f"{Fore.GREEN}Compile the pricing and graviton conversion tables into a memory-mapped snapshot loaded at startup{Style.RESET_ALL}",
+            default=False)
+
         # -i --import-dump-configuration; Configuration-related arguments
         parser.add_argument(
             '-i', '--import-dump-configuration', action='store_true',
@@ -179,6 +185,18 @@ class ToolingArguments(Singleton):
             help=f"{Fore.GREEN}Select data from X months before the latest month in CUR table{Style.RESET_ALL}",
             default=0)
 
+        # --execution-type; sync runs the reports one after the other, async submits them and collects results as they complete
+        parser.add_argument(
+            '--execution-type', type=str, choices=['sync', 'async'],
+            help=f"{Fore.GREEN}Report execution type: {Fore.YELLOW}sync{Fore.GREEN} (default) or {Fore.YELLOW}async{Fore.GREEN} with per-report timeouts{Style.RESET_ALL}",
+            default='sync')
+
+        # --resume; Resume a previous run, checkpointed reports are restored and only missing or failed reports run
+        parser.add_argument(
+            '--resume', type=str, metavar='EXECUTION_ID',
+            help=f"{Fore.GREEN}Resume the run of EXECUTION_ID: completed reports are restored from their checkpoint, missing or failed reports run again{Style.RESET_ALL}",
+            default=None)
+
         # --checks; Add checks parameter to skip menu selection
         parser.add_argument(
             '--checks', nargs='+',
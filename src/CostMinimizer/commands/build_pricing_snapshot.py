@@ -0,0 +1,23 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+from ..config.config import Config
+
+class BuildPricingSnapshotCommand:
+    '''compile the pricing and graviton conversion tables into the memory-mapped pricing snapshot'''
+
+    def __init__(self, appInstance) -> None:
+        self.appConfig = Config()
+
+    def run(self):
+        directory = self.appConfig.get_pricing_snapshot_directory()
+        manifest = self.appConfig.database.build_pricing_snapshot(directory)
+
+        for table, definition in manifest['tables'].items():
+            self.appConfig.console.print(f"[green]{table}: {definition['rows']} rows")
+        self.appConfig.console.print(f"[green]Pricing snapshot written to [yellow]{directory}")
@@ -603,7 +603,7 @@ class ConfigureToolingCommand:
             l_default_cur_s3_bucket = self.appConfig.config['cur_s3_bucket']
             # test if l_default_cur_s3_bucket contains ___PAYER_ACCOUNT___ then replace ___PAYER_ACCOUNT___ by aws sts caller identity account
             if '___PAYER_ACCOUNT___' in l_default_cur_s3_bucket:
-                l_default_cur_s3_bucket = l_default_cur_s3_bucket.replace('___PAYER_ACCOUNT___', self.appConfig.auth_manager.aws_cow_account_boto_session.client("sts").get_caller_identity()["Account"])
+                l_default_cur_s3_bucket = l_default_cur_s3_bucket.replace('___PAYER_ACCOUNT___', self.appConfig.get_caller_identity()["Account"])
             default_value = l_default_cur_s3_bucket
             if default_value is not None or '???' in default_value:
                 # read the value of 
@@ -615,7 +615,7 @@ class ConfigureToolingCommand:
             l_default_aws_cow_s3_bucket = self.appConfig.config['aws_cow_s3_bucket']
             # test if l_default_aws_cow_s3_bucket contains ___PAYER_ACCOUNT___ then replace ___PAYER_ACCOUNT___ by aws sts caller identity account
             if '___PAYER_ACCOUNT___' in l_default_aws_cow_s3_bucket:
-                l_default_aws_cow_s3_bucket = l_default_aws_cow_s3_bucket.replace('___PAYER_ACCOUNT___', self.appConfig.auth_manager.aws_cow_account_boto_session.client("sts").get_caller_identity()["Account"])
+                l_default_aws_cow_s3_bucket = l_default_aws_cow_s3_bucket.replace('___PAYER_ACCOUNT___', self.appConfig.get_caller_identity()["Account"])
             default_value = l_default_aws_cow_s3_bucket
             config['aws_cow_s3_bucket'] = click.prompt(f"{GREEN}Enter the {YELLOW}S3 bucket name where the results are saved{GREEN} (like costminimizer-labs-athena-results-123456789012-us-east-1/') (optional){RESET}", default_value)
 
@@ -20,6 +20,7 @@ from .version import VersionCommand
 from .gimport_conf import ImportConfCommand
 from .gexport_conf import ExportConfCommand
 from .question import Question, QuestionSQL
+from .build_pricing_snapshot import BuildPricingSnapshotCommand
 
 class NotImplementedException(Exception):
     pass
@@ -59,6 +60,8 @@ class CommandFactory:
             _class = ImportConfCommand(app)
         elif arguments.configure:
             _class = ConfigureToolingCommand()
+        elif arguments.build_pricing_snapshot:
+            _class = BuildPricingSnapshotCommand(app)
         elif arguments.available_reports:
             _class = AvailableReportsCommand(app)
         elif arguments.question:
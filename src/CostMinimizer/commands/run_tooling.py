@@ -21,6 +21,7 @@ from .configure_tooling import ConfigureToolingCommand
 from ..utils.term_menu import clear_cli_terminal
 from ..report_request_parser.report_request_parser import ToolingReportRequest
 from ..report_controller.report_controller import CowReportController
+from ..report_providers.report_checkpoint import ReportCheckpointStore
 from ..report_output_handler.report_output_pptx import ReportOutputPptxHandler
 from ..report_controller.region_discovery_controller import RegionDiscoveryController
 from ..report_controller.resource_discovery_controller import ResourceDiscoveryController
@@ -29,6 +30,9 @@ from ..report_output_handler.report_output_handler import ReportOutputExcel, Rep
 class ErrorInReportDiscovery(Exception):
     pass
 
+class UnknownExecutionIdException(Exception):
+    pass
+
 class RunToolingRun:
 
     def __init__(self, appInstance, selected_reports=None, selected_accounts=None, selected_regions=None, report_request_mode=None, send_mail=None) -> None:
@@ -175,7 +179,7 @@ class RunToolingRun:
         Generate report xlsx, metadata and csv data
         '''
 
-        if self.appConfig.cow_execution_type == 'sync':
+        if self.appConfig.cow_execution_type in ('sync', 'async'):
             self.logger.info(f'Generating Report Excel Output')
             s = datetime.now()
             roe = ReportOutputExcel(self.appConfig, report_controller.get_completed_reports_from_controller(), completion_time)
@@ -240,6 +244,26 @@ class RunToolingRun:
         self.logger.info(f'Total report time: {str(cm.duration)}')
         self.appConfig.console.print(f'Total report time: {str(cm.duration)}')
 
+        if report_controller.get_failed_reports_from_controller():
+            self.appConfig.console.print(f'[yellow]Some reports failed, run again with [green]--resume {self.appConfig.get_execution_id()}[yellow] to execute only the missing or failed reports')
+
+        self.cleanup_checkpoints(report_controller)
+
+    def cleanup_checkpoints(self, report_controller) -> None:
+        '''delete the checkpoints of a run without failed reports, and the checkpoints of older runs past their retention'''
+        reports_config = self.appConfig.internals['internals']['reports']
+        checkpoint_dir = self.appConfig.app_path / reports_config.get('checkpoint_directory', 'checkpoints')
+
+        try:
+            if not report_controller.get_failed_reports_from_controller():
+                ReportCheckpointStore(checkpoint_dir, self.appConfig.get_execution_id()).delete()
+
+            purged = ReportCheckpointStore.purge_expired(checkpoint_dir, reports_config.get('checkpoint_retention_days', 7))
+            if purged:
+                self.logger.info(f'Deleted the expired checkpoints of executions: {purged}')
+        except Exception as e:
+            self.logger.warning(f'Unable to clean up report checkpoints: {e}')
+
     def make_log_file_copy(self, report_controller, completion_time, ) -> None:
         '''
         Make a copy of the cow log file into the report directory
@@ -479,6 +503,28 @@ class RunToolingRun:
             self.logger.info(f'Running in {self.mode} mode: Report data source from {datasource} : {datasource_file}')
             return report_request.get_all_reports()
     
+    def set_resume_execution_from_arguments(self) -> list:
+        '''
+        --resume: reuse the report time of a previous run so the execution id, checkpoints
+        and output folder are the ones of that run; return the report names it recorded
+        '''
+        execution_id = getattr(self.appConfig.arguments_parsed, 'resume', None)
+        self.appConfig.resume_execution_id = execution_id
+        if not execution_id:
+            return []
+
+        history = self.appConfig.database.get_report_history(execution_id)
+        if not history:
+            raise UnknownExecutionIdException(f'No report history found for execution id {execution_id}')
+
+        self.appConfig.report_time = history[0]['start_time']
+
+        report_names = list(dict.fromkeys(h['report_name'] for h in history))
+        completed = {h['report_name'] for h in history if h['status'] == 'COMPLETED'}
+        self.appConfig.console.print(f'[green]Resuming execution [yellow]{execution_id} [green]of [yellow]{self.appConfig.report_time}[green]: {len(completed)} of {len(report_names)} reports completed')
+
+        return report_names
+
     def set_using_tags_from_arguments(self):
         '''set if tags have been enabled on cli'''
         self.appConfig.using_tags = False
@@ -493,12 +539,13 @@ class RunToolingRun:
         module: cow is imported and run as a module from within another program
         '''
         try:
-            c = self.appConfig.auth_manager.aws_cow_account_boto_session.client('sts')
-            c.get_caller_identity()
+            self.appConfig.get_caller_identity()
         except Exception as e:
             raise
 
         self.set_using_tags_from_arguments()
+        resumed_reports = self.set_resume_execution_from_arguments()
+        self.logger.info(f'Execution id: {self.appConfig.get_execution_id()} ({self.appConfig.report_time})')
 
         self.report_controller = self.report_controller_build(self.writer)
         self.report_controller._controller_setup()
@@ -531,6 +578,10 @@ class RunToolingRun:
                 #sef customer and report requests
                 self.set_report_request_arguments(l_list_reports)
 
+            elif resumed_reports:
+                # without --checks a resumed run selects the reports of the execution it resumes
+                self.set_report_request_arguments(resumed_reports)
+
             elif self.appConfig.report_request_mode == 'menu':
                 # Display reports menu - only if report request is not coming from YAML file or GUI
                 menu_selected_reports = self.display_available_reports_menu()
@@ -561,7 +612,7 @@ class RunToolingRun:
             #run report controller run method
             self.report_controller.run()
 
-            if self.appConfig.cow_execution_type == 'sync':
+            if self.appConfig.cow_execution_type in ('sync', 'async'):
                 #fetch data
                 with self.appConfig.console.status(f'Fetching report results from providers (this may take a while)...'):
                     self.report_controller.fetch()
@@ -630,6 +681,10 @@ class RunToolingRun:
         metric = { 'platform': self.appConfig.platform }
         cm.submit(metric)
 
+        #boto3 client pool and STS caller identity cache usage
+        cm.submit(self.appConfig.client_pool.get_stats())
+        cm.submit(self.appConfig.credential_vault.get_stats())
+
         #Reports and estimated savings
         metric = {}
         metric['reports'] = {}
@@ -0,0 +1,148 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import logging
+import threading
+import time
+
+from botocore.config import Config as BotoConfig
+
+from .rate_limiter import RateLimiter
+
+DEFAULT_CALLER_IDENTITY_TTL = 3600
+
+# botocore defaults of the tooling, overridden by the boto_client_config section of the internals
+DEFAULT_CLIENT_CONFIG = {
+    'max_pool_connections': 10,
+    'connect_timeout': 10,
+    'read_timeout': 60,
+    'retry_mode': 'adaptive',
+    'max_attempts': 10}
+
+def build_client_config(service_name, profile=None, worker_count=1) -> BotoConfig:
+    '''
+    return the botocore Config of service_name from the client config profile
+
+    profile = {'default': {...}, 'services': {service_name: {...}}}, service values override
+    the default ones. The connection pool is never smaller than worker_count, so every worker
+    thread sharing the pooled client gets its own connection.
+    '''
+    profile = profile or {}
+    settings = dict(DEFAULT_CLIENT_CONFIG)
+    settings.update(profile.get('default') or {})
+    settings.update((profile.get('services') or {}).get(service_name) or {})
+
+    return BotoConfig(
+        max_pool_connections=max(int(settings['max_pool_connections']), int(worker_count)),
+        connect_timeout=settings['connect_timeout'],
+        read_timeout=settings['read_timeout'],
+        retries={'mode': settings['retry_mode'], 'max_attempts': int(settings['max_attempts'])})
+
+class ClientPool:
+    '''
+    process-wide pool of boto3 clients
+
+    Clients are keyed by (service, region, session, client config). boto3 clients are
+    thread safe once created, but creating them from a shared session is not, so creation
+    is serialized behind a lock. Every new client is attached to the shared rate limiter.
+    The pool also caches the STS caller identity of each session for ttl seconds, and
+    counts client creations and STS calls for the metrics.
+    '''
+
+    def __init__(self, caller_identity_ttl=DEFAULT_CALLER_IDENTITY_TTL, rate_limiter=None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.caller_identity_ttl = caller_identity_ttl
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        self._lock = threading.RLock()
+        self._clients = {}     # key -> (session, client); the session is held so its id is never reused
+        self._identities = {}  # id(session) -> (session, identity, expiry)
+        self._identity_locks = {}  # id(session) -> (session, lock serializing its STS calls)
+
+        self.stats = {
+            'boto_client_requests': 0,
+            'boto_client_creations': 0,
+            'sts_caller_identity_requests': 0,
+            'sts_caller_identity_calls': 0}
+
+    @staticmethod
+    def config_key(config) -> tuple:
+        '''hashable form of a botocore Config, None when no config is given'''
+        if config is None:
+            return None
+
+        return tuple(sorted((k, repr(v)) for k, v in config._user_provided_options.items()))
+
+    def get_client(self, session, service_name, region_name=None, config=None):
+        '''return the pooled client of session for service_name in region_name, created on first use'''
+        key = (service_name, region_name, session.profile_name, id(session), self.config_key(config))
+
+        with self._lock:
+            self.stats['boto_client_requests'] += 1
+
+            entry = self._clients.get(key)
+            if entry is None:
+                kwargs = {'region_name': region_name}
+                if config is not None:
+                    kwargs['config'] = config
+
+                entry = (session, session.client(service_name, **kwargs))
+                self.rate_limiter.attach(entry[1], service_name, region_name)
+                self._clients[key] = entry
+                self.stats['boto_client_creations'] += 1
+                self.logger.debug(f'boto3 client created: {service_name} {region_name}')
+
+            return entry[1]
+
+    def get_cached_caller_identity(self, session):
+        '''return the cached STS caller identity of session, None when missing or expired'''
+        entry = self._identities.get(id(session))
+        if entry is not None and entry[0] is session and entry[2] > time.monotonic():
+            return entry[1]
+
+        return None
+
+    def get_caller_identity(self, session) -> dict:
+        '''return the STS caller identity of session, cached for caller_identity_ttl seconds'''
+        with self._lock:
+            self.stats['sts_caller_identity_requests'] += 1
+
+            identity = self.get_cached_caller_identity(session)
+            if identity is not None:
+                return identity
+
+            session_lock = self._identity_locks.setdefault(id(session), (session, threading.Lock()))[1]
+
+        # the STS call is made outside the pool lock, one call per session at a time
+        with session_lock:
+            with self._lock:
+                identity = self.get_cached_caller_identity(session)
+            if identity is not None:
+                return identity
+
+            identity = self.get_client(session, 'sts').get_caller_identity()
+
+            with self._lock:
+                self.stats['sts_caller_identity_calls'] += 1
+                self._identities[id(session)] = (session, identity, time.monotonic() + self.caller_identity_ttl)
+
+            return identity
+
+    def clear(self) -> None:
+        '''drop all clients and identities, e.g. after credentials were renewed'''
+        with self._lock:
+            self._clients.clear()
+            self._identities.clear()
+            self._identity_locks.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+
+        stats.update(self.rate_limiter.get_stats())
+        return stats
@@ -17,6 +17,7 @@ It interacts with YAML files, databases, and environment variables to set up the
 
 import yaml
 import os, sys
+import hashlib
 import logging
 import sysconfig
 import pandas as pd
@@ -33,6 +34,8 @@ from ..commands.available_reports import AvailableReportsCommand
 from ..version.version import ToolingVersion
 from ..security.cow_authentication import AuthenticationManager
 from .database import ToolingDatabase
+from .client_pool import ClientPool, DEFAULT_CALLER_IDENTITY_TTL, build_client_config
+from ..security.credential_vault import CredentialVault
 
 class UnableToLoadCowConfigurationFileException(Exception):
     pass
@@ -54,7 +57,15 @@ class Config(Singleton):
 
     def __init__(cls):
         cls.logger = logging.getLogger(__name__)
-        cls.cow_execution_type = 'sync'
+        # __init__ runs on every Config() call, keep the execution type and resumed run selected on the command line
+        if not hasattr(cls, 'cow_execution_type'):
+            cls.cow_execution_type = 'sync'
+        if not hasattr(cls, 'resume_execution_id'):
+            cls.resume_execution_id: Optional[str] = None
+        if not hasattr(cls, 'client_pool'):
+            cls.client_pool = ClientPool()
+        if not hasattr(cls, 'credential_vault'):
+            cls.credential_vault = CredentialVault()
         cls.tag: Optional[str] = None
         cls.debug: bool = False
         
@@ -80,6 +91,8 @@ class Config(Singleton):
         cls.write_installation_type() #write installation type into database configuration table
         cls._setup_user_configuration() #populate cls.config dictionary with account values
         cls._setup_internals_parameters() #load tool parameters
+        cls.client_pool.rate_limiter.configure(cls.internals['internals'].get('rate_limits')) #per api token buckets
+        cls.credential_vault.refresh_margin = float(cls.internals['internals'].get('account_discovery', {}).get('credential_refresh_margin', cls.credential_vault.refresh_margin))
 
     def database_initial_defaults(cls, arguments_parsed=None):
         '''
@@ -180,6 +193,10 @@ class Config(Singleton):
         cls.report_time = cls.start.strftime("%Y-%m-%d-%H-%M")
         cls.end = None
 
+    def get_execution_id(cls) -> str:
+        '''return the execution id of the run, the report_id of its cow_cowreporthistory records'''
+        return hashlib.md5(cls.report_time.encode('utf-8')).hexdigest()
+
     def _setup_home_directory(cls) -> Path:
         '''setup the home directory for the application'''
         cls.local_home = Path.home()
@@ -209,6 +226,7 @@ internals:
     default_profile_role: Admin
     default_region: us-east-1
     default_secret_name: CostMinimizer_secret
+    caller_identity_ttl: 3600
   comparison:
     column_group_by: CostType
     column_report_name: CostDomain
@@ -233,6 +251,10 @@ internals:
     ce_directory: ce_reports
     lookback_period: 1
     report_directory: reports
+    closed_month_cache: true
+    closed_month_grace_days: 3
+    cache_directory: ce_cache
+    tag_catalog_ttl: 86400
   co_reports:
     co_directory: co_reports
     lookback_period: 1
@@ -249,6 +271,7 @@ internals:
     database_directory_for_container: .cow
     database_directory_for_local: cow
     database_file: CostMinimizer.db
+    pricing_snapshot_directory: pricing_snapshot
   logging:
     log_directory: cow
     log_file: CostMinimizer.log
@@ -260,6 +283,8 @@ internals:
     async_report_complete_filename: async_report_complete.txt
     async_run_filename: async_run.txt
     cache_directory: cache_data
+    checkpoint_directory: checkpoints
+    checkpoint_retention_days: 7
     default_decrypted_report_request: report_request_decrypted.yaml
     default_encrypted_report_request: report_request_encrypted.yaml
     default_report_request: report_request.yaml
@@ -282,6 +307,81 @@ internals:
     default_provider_region: us-east-1
     default_genai_model: anthropic.claude-3-5-sonnet-20240620-v1:0
     inference_profile_arn: 
+  concurrency:
+    concurrent_providers: False
+    max_provider_workers: 4
+    max_report_workers: 1
+    max_async_workers: 8
+    async_report_timeout: 900
+    report_timeout: 3600
+  boto_client_config:
+    default:
+      max_pool_connections: 10
+      connect_timeout: 10
+      read_timeout: 60
+      retry_mode: adaptive
+      max_attempts: 10
+    services:
+      athena:
+        read_timeout: 120
+      ce:
+        max_attempts: 15
+      pricing:
+        read_timeout: 120
+      cloudwatch:
+        max_pool_connections: 25
+      ec2:
+        max_pool_connections: 25
+  rate_limits:
+    ce:
+      rate: 5
+      burst: 5
+    support:
+      rate: 10
+      burst: 10
+    trustedadvisor:
+      rate: 10
+      burst: 10
+    pricing:
+      rate: 10
+      burst: 10
+    compute-optimizer:
+      rate: 5
+      burst: 5
+  account_discovery:
+    max_workers: 16
+    support_probe_ttl: 86400
+    credential_refresh_margin: 300
+    org_snapshot_ttl: 86400
+  compute_optimizer:
+    export_bucket: ''
+    export_key_prefix: costminimizer/compute-optimizer
+    bulk_export_threshold: 5000
+    export_poll_interval: 10
+    export_timeout: 900
+    summary_first: false
+  ebs_snapshots:
+    max_workers: 8
+  trusted_advisor:
+    catalog_ttl: 604800
+    max_workers: 8
+  cloudwatch:
+    max_workers: 8
+    cache_directory: metrics_cache
+    cache_retention_days: 35
+  dynamodb:
+    max_workers: 8
+  cloudtrail:
+    max_workers: 8
+  savings_plans:
+    products:
+      - EC2
+      - Fargate
+      - Lambda
+    plan_types:
+      - Compute
+      - EC2Instance
+    rates_ttl: 604800
   version: 0.0.1
 """
         return internals_yaml_defaults
@@ -290,21 +390,33 @@ internals:
         """Create database and all tables if needed"""
         cls.database = ToolingDatabase()
 
+        # a prebuilt pricing snapshot (i.e. shipped in containers) replaces the sql dump imports of the tables it holds
+        cls.database.load_pricing_snapshot(cls.get_pricing_snapshot_directory())
+
         # in case the API interfaces are not accessible to get the ec2 instances prices 
-        cls.database.insert_awspricingec2()
+        if not cls.database.snapshot_has_table('cow_awspricingec2'):
+            cls.database.insert_awspricingec2()
 
         # in case the API interfaces are not accessible to get the db instances prices 
-        cls.database.insert_awspricingdb()
+        if not cls.database.snapshot_has_table('cow_awspricingdb'):
+            cls.database.insert_awspricingdb()
 
         # in case the API interfaces are not accessible to get the lambda instances prices 
-        cls.database.insert_awspricinglambda()
+        if not cls.database.snapshot_has_table('cow_awspricinglambda'):
+            cls.database.insert_awspricinglambda()
 
         # in case the API interfaces are not accessible to get the gravition instances equivalence 
-        cls.database.insert_gravitonconversion()
+        if not cls.database.snapshot_has_table('cow_gravitonconversion'):
+            cls.database.insert_gravitonconversion()
 
         #process table schema updates
         cls.database.process_table_schema_updates()
 
+    def get_pricing_snapshot_directory(cls) -> Path:
+        '''return the directory of the memory-mapped pricing snapshot, next to the database file'''
+        snapshot_directory = cls.internals['internals']['database'].get('pricing_snapshot_directory', 'pricing_snapshot')
+        return cls.database.database_directory / snapshot_directory
+
     def __set_installation_type(cls) -> str:
         '''
         set installation type:
@@ -502,9 +614,7 @@ internals:
             cls.report_classes = reports_result
             table_name = 'cow_availablereports'
 
-            #truncate table first
-            cls.database.clear_table(table_name)
-            
+            requests = []
             for report in cls.reports:
                 if usertags == False or (report.supports_user_tags(cls) == True and usertags == True):
                     try:
@@ -534,20 +644,22 @@ internals:
                         'configurable':report.is_report_configurable(cls),
                         'report_parameters' : str(report.get_report_parameters(cls))
                     }
-                    cls.database.insert_record(request, table_name)
+                    requests.append(request)
+
+            #truncate table and insert all reports in a single transaction
+            with cls.database.unit_of_work():
+                cls.database.clear_table(table_name)
+                cls.database.insert_records(requests, table_name)
                 
     def automate_launch_cow_cust_configure(cls) -> tuple:
         """
         Automatically configure COW customer settings using current AWS session credentials.
         """
         # retrieve the default credentials of current session
-        # Create an STS client
-        sts_client = cls.auth_manager.aws_cow_account_boto_session.client('sts')
-
         account_id = None
         try:
             # Call the get_caller_identity() method
-            response = sts_client.get_caller_identity()
+            response = cls.get_caller_identity()
 
             # Get the user ID and account ID from the response
             user_id = response['UserId']
@@ -556,9 +668,6 @@ internals:
             cls.logger.info(f"[green]User ID: {user_id} - Account ID: {account_id}[/green]")
             cls.console.print(f"[green]User ID: {user_id} - Account ID: {account_id}[/green]")
 
-            # Call the get_session_token() method
-            session_token = sts_client.get_session_token
-
             aws_account_configuration = {}
             aws_account_configuration['aws_cow_account'] = account_id
             aws_account_configuration['aws_cow_profile'] = cls.internals['internals']['boto']['default_profile_name']
@@ -695,12 +804,45 @@ internals:
 
         return [r for r in regions if r not in excludedRegions]
             
-    def get_client(cls, client_name:str, region_name:str=None):
-        '''return boto client '''
-        if region_name: 
-            return cls.auth_manager.aws_cow_account_boto_session.client(client_name, region_name)
-        else:
-            return cls.auth_manager.aws_cow_account_boto_session.client(client_name, 'us-east-1')
+    def get_client(cls, client_name:str, region_name:str=None, config=None):
+        '''return boto client from the process-wide client pool, configured from boto_client_config unless config is given'''
+        if config is None:
+            config = cls.get_client_config(client_name)
+
+        return cls.client_pool.get_client(cls.auth_manager.aws_cow_account_boto_session, client_name, region_name or 'us-east-1', config)
+
+    def get_account_session(cls, account:str):
+        '''return the boto session of account: the tooling session for the caller account, else an OrganizationAccountAccessRole session from the credential vault'''
+        if account == cls.get_caller_identity()['Account']:
+            return cls.auth_manager.aws_cow_account_boto_session
+
+        return cls.credential_vault.get_session(cls.get_client('sts'), f'arn:aws:iam::{account}:role/OrganizationAccountAccessRole', f'{account}-session')
+
+    def get_account_client(cls, account:str, client_name:str, region_name:str=None):
+        '''return the pooled boto client of client_name working on account, see get_account_session'''
+        return cls.client_pool.get_client(cls.get_account_session(account), client_name, region_name or 'us-east-1', cls.get_client_config(client_name))
+
+    def get_client_config(cls, client_name:str):
+        '''return the botocore Config of client_name from the boto_client_config profile'''
+        return build_client_config(client_name, cls.internals['internals'].get('boto_client_config'), cls.get_worker_count())
+
+    def get_worker_count(cls) -> int:
+        '''return the number of threads that may share one pooled client, from the concurrency settings'''
+        concurrency = cls.internals['internals'].get('concurrency', {})
+
+        report_workers = int(concurrency.get('max_report_workers', 1))
+        if str(concurrency.get('concurrent_providers', False)).lower() in ('true', 'yes', '1', 't', 'y'):
+            report_workers *= int(concurrency.get('max_provider_workers', 4))
+
+        if cls.cow_execution_type == 'async':
+            report_workers = max(report_workers, int(concurrency.get('max_async_workers', 8)))
+
+        return report_workers
+
+    def get_caller_identity(cls) -> dict:
+        '''return the STS caller identity of the tooling session, cached for boto.caller_identity_ttl seconds'''
+        cls.client_pool.caller_identity_ttl = cls.internals['internals']['boto'].get('caller_identity_ttl', DEFAULT_CALLER_IDENTITY_TTL)
+        return cls.client_pool.get_caller_identity(cls.auth_manager.aws_cow_account_boto_session)
 
     
     def get_cache_settings(cls) -> dict:
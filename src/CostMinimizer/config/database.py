@@ -8,10 +8,16 @@ from ..constants import __tooling_name__
 
 import logging
 import os
+import re
+import time
 import sqlite3
+import threading
+import functools
 import json
 import csv
+import pandas as pd
 from typing import List
+from contextlib import contextmanager
 #specific imports
 from pathlib import Path
 #application imports
@@ -19,6 +25,26 @@ from .customer import Customer
 from .report import Report
 
 from ..config.database_updates import DatabaseUpdate
+from ..config.pricing_snapshot import PricingSnapshot
+
+# tokens of a sqlite .dump file: quoted text, quoted identifier, number, word or punctuation
+SQL_TOKEN = re.compile(r"""\s*(?:'((?:[^']|'')*)'|"((?:[^"]|"")*)"|([-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?)|(\w+)|(\S))""", re.DOTALL)
+
+# pragmas applied to every connection: WAL journal and relaxed sync keep bookkeeping writes cheap
+CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000"]
+
+def synchronized(method):
+    '''serialize database access, the connection is shared by the provider threads'''
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class UnableToUpdateSQLValue(Exception):
     pass
@@ -34,6 +60,15 @@ class UnableToExecuteSqliteQuery(Exception):
 
 class ToolingDatabase:
 
+    def __new__(cls, *args, **kwargs):
+        instance = super().__new__(cls)
+        # per connection state, set here so that every way of building an instance has it
+        # depth of nested unit_of_work() blocks, commits are deferred while > 0
+        instance._unit_of_work_depth = 0
+        # held by readers, writers and units of work
+        instance._lock = threading.RLock()
+        return instance
+
     def __init__(self) -> None:
         '''class for interacting with the CostMinimizer database '''
         # self.appConfig = appConfig
@@ -54,6 +89,9 @@ class ToolingDatabase:
         #make database cursor
         self.con = self.get_connection()
 
+        #memory-mapped pricing snapshot, set by load_pricing_snapshot()
+        self.pricing_snapshot = None
+
         #creates database and tables if not exists
         self.create_tables()
 
@@ -68,7 +106,10 @@ class ToolingDatabase:
             # Ensure parent directory exists before connecting
             os.makedirs(os.path.dirname(self.database_file), exist_ok=True)
             # SQLite will automatically create the database file if it doesn't exist
-            return sqlite3.connect(self.database_file)
+            con = sqlite3.connect(self.database_file, check_same_thread=False)
+            for pragma in CONNECTION_PRAGMAS:
+                con.execute(pragma)
+            return con
         except sqlite3.Error as e:
             self.logger.error(f"Error connecting to database: {e}")
             raise
@@ -77,6 +118,35 @@ class ToolingDatabase:
         '''return sqllite connection'''
         return self.connect_to_database()
 
+    @contextmanager
+    def unit_of_work(self):
+        '''
+        group database writes into a single transaction
+        writes inside the block are committed once on exit, or rolled back if an exception is raised
+
+        with self.appConfig.database.unit_of_work():
+            database.clear_table(table_name)
+            database.insert_records(requests, table_name)
+        '''
+        with self._lock:
+            self._unit_of_work_depth += 1
+            try:
+                yield self
+            except Exception:
+                if self._unit_of_work_depth == 1:
+                    self.con.rollback()
+                raise
+            else:
+                if self._unit_of_work_depth == 1:
+                    self.con.commit()
+            finally:
+                self._unit_of_work_depth -= 1
+
+    def _commit(self) -> None:
+        '''commit, unless the write is part of a unit of work'''
+        if self._unit_of_work_depth == 0:
+            self.con.commit()
+
     # def make_cursor(self) -> sqlite3.Cursor:
     #     '''return sql connection cursor'''
     #     return self.con.cursor()
@@ -97,7 +167,15 @@ class ToolingDatabase:
             'cowawspricingdb',
             'cowawspricingec2',
             'cowgravitonconversion',
-            'cowawspricinglambda']
+            'cowawspricinglambda',
+            'cowsavingsplanrates',
+            'cowaccountsupportstatus',
+            'coworgsnapshot',
+            'coworgaccounts',
+            'cowsnapshotinfo',
+            'cowtachecks',
+            'cowcetagcatalog',
+            'cowpricingimports']
 
     def get_tables_dict(self) -> list:
         '''return a list of all table definition function names (minus the _table)'''
@@ -114,7 +192,15 @@ class ToolingDatabase:
             'cow_awspricingdb': 'cow_awspricingdb',
             'cow_awspricingec2': 'cow_awspricingec2',
             'cow_gravitonconversion': 'cow_gravitonconversion',
-            'cow_awspricinglambda': 'cow_awspricinglambda'
+            'cow_awspricinglambda': 'cow_awspricinglambda',
+            'cow_savingsplanrates': 'cow_savingsplanrates',
+            'cow_accountsupportstatus': 'cow_accountsupportstatus',
+            'cow_orgsnapshot': 'cow_orgsnapshot',
+            'cow_orgaccounts': 'cow_orgaccounts',
+            'cow_snapshotinfo': 'cow_snapshotinfo',
+            'cow_tachecks': 'cow_tachecks',
+            'cow_cetagcatalog': 'cow_cetagcatalog',
+            'cow_pricingimports': 'cow_pricingimports'
             }
 
     def create_tables(self) -> None:
@@ -124,11 +210,12 @@ class ToolingDatabase:
         for table in self.get_tables_list():
             # get the SQL text that correspond to the name of the table
             sql = getattr(self, f"{table}_table")()
-            parameters = ()
-            cursor.execute(sql, parameters)
+            # executescript allows a table definition to carry its own indexes
+            cursor.executescript(sql)
 
         cursor.close()
 
+    @synchronized
     def clear_table(self, table_name) -> None:
         '''clear all values from table'''
 
@@ -138,7 +225,7 @@ class ToolingDatabase:
             cursor = self.con.cursor()
             parameters = ()
             cursor.execute(sql, parameters)
-            self.con.commit()
+            self._commit()
             cursor.close()
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
@@ -148,18 +235,20 @@ class ToolingDatabase:
         '''process any schema updates necessary for tables of older version CostMinimizer Tooling'''
         du = DatabaseUpdate(self.appConfig).execute_updates()
 
+    @synchronized
     def run_sql_statement(self, sql) -> None:
         '''run provided sql statement'''
 
         try:
             cursor = self.con.cursor()
             cursor.execute(sql)
-            self.con.commit()
+            self._commit()
             cursor.close()
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
 
+    @synchronized
     def select_records(self, sql, rows='all'):
         '''
         return result of select statement
@@ -345,6 +434,7 @@ class ToolingDatabase:
             self.logger.error(f"Database error: {str(e)}")
             raise e
 
+    @synchronized
     def insert_record(self, request, table_name):
         '''function to abstract the insertion of records into our database'''
         keys = list(request.keys())
@@ -360,13 +450,37 @@ class ToolingDatabase:
         try:
             cursor.execute(sql, parameters)
             
-            self.con.commit()
+            self._commit()
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
 
         cursor.close()
 
+    @synchronized
+    def insert_records(self, requests, table_name) -> int:
+        '''insert a list of records with executemany, requests sharing the same keys are sent in one batch'''
+        batches = {}
+        for request in requests:
+            batches.setdefault(tuple(request.keys()), []).append(tuple(str(i) for i in request.values()))
+
+        cursor = self.con.cursor()
+        try:
+            for keys, parameters in batches.items():
+                placeholders = ', '.join(['?' for _ in keys])
+                sql = f'INSERT INTO {self.get_tables_dict()[table_name]} ({", ".join(keys)}) VALUES ({placeholders})'
+                cursor.executemany(sql, parameters)
+
+            self._commit()
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
+        return len(requests)
+
+    @synchronized
     def update_record(self, request, table_name, where):
         '''function to abstract the update of records into our database'''
         keys = list(request.keys())
@@ -386,7 +500,7 @@ class ToolingDatabase:
         try:
             cursor.execute(sql, parameters)
             
-            self.con.commit()
+            self._commit()
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
@@ -599,73 +713,291 @@ class ToolingDatabase:
         );'''
         return sql
 
+    # create cowsavingsplanrates table filled by the SavingsPlansRatesLoader from describe_savings_plans_offering_rates
+    def cowsavingsplanrates_table(self):
+        sql = '''CREATE TABLE IF NOT EXISTS cow_savingsplanrates (
+            rate_key TEXT PRIMARY KEY,
+            offering_id TEXT,
+            plan_type TEXT,
+            payment_option TEXT,
+            duration_seconds INTEGER,
+            product_type TEXT,
+            service_code TEXT,
+            usage_type TEXT,
+            operation TEXT,
+            region TEXT,
+            instance_type TEXT,
+            instance_family TEXT,
+            product_description TEXT,
+            tenancy TEXT,
+            currency TEXT,
+            unit TEXT,
+            rate FLOAT,
+            load_time TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_savingsplanrates_lookup ON cow_savingsplanrates (region, product_type, instance_type, plan_type);'''
+        return sql
+
+    def cowaccountsupportstatus_table(self):
+        sql = '''CREATE TABLE IF NOT EXISTS cow_accountsupportstatus (
+            account_id TEXT PRIMARY KEY,
+            support_status TEXT NOT NULL,
+            probe_time FLOAT NOT NULL
+        );'''
+        return sql
+
+    def coworgsnapshot_table(self):
+        sql = '''CREATE TABLE IF NOT EXISTS cow_orgsnapshot (
+            caller_account_id TEXT PRIMARY KEY,
+            organization_id TEXT,
+            master_account_id TEXT,
+            is_payer INTEGER NOT NULL,
+            fetch_time FLOAT NOT NULL
+        );'''
+        return sql
+
+    def coworgaccounts_table(self):
+        sql = '''CREATE TABLE IF NOT EXISTS cow_orgaccounts (
+            organization_id TEXT NOT NULL,
+            account_id TEXT NOT NULL,
+            arn TEXT,
+            email TEXT,
+            name TEXT,
+            status TEXT,
+            joined_method TEXT,
+            joined_timestamp TEXT,
+            fetch_time FLOAT NOT NULL,
+            PRIMARY KEY (organization_id, account_id)
+        );'''
+        return sql
+
+    def cowsnapshotinfo_table(self):
+        sql = '''CREATE TABLE IF NOT EXISTS cow_snapshotinfo (
+            snapshot_id TEXT PRIMARY KEY,
+            region TEXT,
+            volume_size_gib INTEGER,
+            start_time TEXT,
+            description TEXT,
+            state TEXT,
+            block_count INTEGER
+        );'''
+        return sql
+
+    def cowtachecks_table(self):
+        sql = '''CREATE TABLE IF NOT EXISTS cow_tachecks (
+            language TEXT NOT NULL,
+            check_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            category TEXT,
+            metadata TEXT,
+            fetch_time FLOAT NOT NULL,
+            PRIMARY KEY (language, check_id)
+        );'''
+        return sql
 
-    # More robust version with transaction and error handling
-    def import_sql_dump_with_validation(self, database_path, sql_file_path):
+    # replaces cow_cetagvalues, whose values were not keyed on the account; it only held cached values
+    def cowcetagcatalog_table(self):
+        sql = '''DROP TABLE IF EXISTS cow_cetagvalues;
+        CREATE TABLE IF NOT EXISTS cow_cetagcatalog (
+            account_id TEXT NOT NULL,
+            tag_key TEXT NOT NULL,
+            search_string TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            tag_values TEXT NOT NULL,
+            fetch_time FLOAT NOT NULL,
+            PRIMARY KEY (account_id, tag_key, search_string, start_date, end_date)
+        );'''
+        return sql
+
+    # time of the last sql dump import of each pricing table, compared with the pricing snapshot manifest
+    def cowpricingimports_table(self):
+        sql = '''CREATE TABLE IF NOT EXISTS cow_pricingimports (
+            table_name TEXT PRIMARY KEY,
+            import_time FLOAT NOT NULL
+        );'''
+        return sql
+
+
+    def load_pricing_snapshot(self, directory) -> bool:
+        '''memory-map the pricing snapshot in directory if it exists, return True when loaded'''
+        if not PricingSnapshot.exists(directory):
+            return False
+
+        try:
+            pricing_snapshot = PricingSnapshot.load(directory)
+        except Exception as e:
+            self.logger.warning(f"Unable to load pricing snapshot from {directory}: {str(e)}")
+            self.pricing_snapshot = None
+            return False
+
+        stale_tables = pricing_snapshot.get_stale_tables(self.get_pricing_import_times())
+        if stale_tables:
+            self.logger.warning(f"Pricing snapshot in {directory} is older than tables {stale_tables}, using the database tables until it is rebuilt")
+            self.pricing_snapshot = None
+            return False
+
+        self.pricing_snapshot = pricing_snapshot
+
+        self.logger.info(f"Pricing snapshot loaded from {directory}")
+        return True
+
+    def build_pricing_snapshot(self, directory) -> dict:
+        '''compile the pricing and graviton conversion tables into a memory-mappable snapshot'''
+        return PricingSnapshot.build(self.con, directory, self.get_pricing_import_times())
+
+    @synchronized
+    def get_pricing_import_times(self) -> dict:
+        '''return dict of pricing table name -> time of its last sql dump import'''
+        cursor = self.con.cursor()
+        try:
+            return dict(cursor.execute('SELECT table_name, import_time FROM cow_pricingimports').fetchall())
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
+    def snapshot_has_table(self, table_name) -> bool:
+        '''return True if lookups on table_name are served by the pricing snapshot'''
+        return self.pricing_snapshot is not None and self.pricing_snapshot.has_table(table_name)
+
+    @staticmethod
+    def tokenize_sql(text):
+        '''yield (kind, value) tokens of sql text, kind is text, identifier, number, word or symbol'''
+        position = 0
+        while position < len(text):
+            match = SQL_TOKEN.match(text, position)
+            if match is None or match.end() == position:
+                break
+            position = match.end()
+
+            text_value, identifier, number, word, symbol = match.groups()
+            if text_value is not None:
+                yield 'text', text_value.replace("''", "'")
+            elif identifier is not None:
+                yield 'identifier', identifier.replace('""', '"')
+            elif number is not None:
+                # integers keep their type, only decimals and exponents become floats
+                yield 'number', int(number) if re.fullmatch(r'[-+]?\d+', number) else float(number)
+            elif word is not None:
+                yield 'word', word
+            else:
+                yield 'symbol', symbol
+
+    def parse_sql_dump(self, sql_file_path, table_name) -> list:
+        '''
+        parse the INSERT statements of a sqlite .dump file into a list of row tuples
+        statements may span several lines and insert several rows; other statements are ignored
+        raise UnableToExecuteSqliteQuery if the dump inserts into another table than table_name
+        '''
+        with open(sql_file_path, 'r', encoding='utf8') as sql_file:
+            text = sql_file.read()
+
+        rows = []
+        statement = []
+        for token in self.tokenize_sql(text):
+            if token != ('symbol', ';'):
+                statement.append(token)
+                continue
+
+            if len(statement) > 2 and [v.upper() for k, v in statement[:2] if k == 'word'] == ['INSERT', 'INTO']:
+                rows.extend(self._parse_insert(statement, sql_file_path, table_name))
+            statement = []
+
+        if statement:
+            raise UnableToExecuteSqliteQuery(f"{sql_file_path}: statement not terminated by ; {statement[:5]}")
+
+        return rows
+
+    @staticmethod
+    def _parse_insert(statement, sql_file_path, table_name) -> list:
+        '''return the row tuples of the tokens of one INSERT INTO ... VALUES (...), (...) statement'''
+        target = statement[2][1]
+        if target != table_name:
+            raise UnableToExecuteSqliteQuery(f"{sql_file_path} inserts into {target} instead of {table_name}")
+
+        words = [v.upper() if k == 'word' else None for k, v in statement]
+        if 'VALUES' not in words:
+            raise UnableToExecuteSqliteQuery(f"{sql_file_path}: unable to parse INSERT statement into {target}")
+
+        rows = []
+        row = None
+        for kind, value in statement[words.index('VALUES') + 1:]:
+            if kind == 'symbol' and value == '(' and row is None:
+                row = []
+            elif kind == 'symbol' and value == ')' and row is not None:
+                rows.append(tuple(row))
+                row = None
+            elif kind == 'symbol' and value == ',':
+                continue
+            elif row is not None and kind in ('text', 'number'):
+                row.append(value)
+            elif row is not None and kind == 'word' and value.upper() == 'NULL':
+                row.append(None)
+            else:
+                raise UnableToExecuteSqliteQuery(f"{sql_file_path}: unexpected token {value!r} in INSERT statement into {target}")
+
+        return rows
+
+    @synchronized
+    def import_sql_dump_with_validation(self, table_name, sql_file_path):
         """
-        Import a SQL dump file with additional error handling and validation
-        
+        Import a SQL dump file with executemany in a single transaction, then validate the row count
+
         Args:
-            database_path: Path to the SQLite database
+            table_name: table the dump inserts into
             sql_file_path: Path to the SQL dump file
         """
         # Convert paths to Path objects for cross-platform compatibility
-        db_path = Path(database_path)
         sql_path = Path(sql_file_path)
-        
+
         # Validate files exist
         if not sql_path.exists():
             raise FileNotFoundError(f"SQL file not found: {sql_path}")
-        
+
+        rows = self.parse_sql_dump(sql_path, table_name)
+        if not rows:
+            return 0
+
+        placeholders = ', '.join(['?' for _ in rows[0]])
+        sql = f'INSERT INTO {self.get_tables_dict()[table_name]} VALUES ({placeholders})'
+
+        cursor = self.con.cursor()
         try:
-            # Create connection with extended timeout
-            cursor = self.con.cursor()
-            
-            # Optimize for bulk import
-            cursor.execute("PRAGMA journal_mode = WAL")
-            cursor.execute("PRAGMA synchronous = NORMAL")
-            cursor.execute("PRAGMA cache_size = -2000")  # Use 2GB memory for cache
-            cursor.execute("PRAGMA temp_store = MEMORY")
-            
-            # Read and execute SQL file in chunks whith encode utf8
-            with open(sql_path, 'r', encoding='utf8') as sql_file:
-
-                sql_script = sql_file.read()
-                
-                # Split script into individual statements
-                statements = sql_script.split(';')
-                line_num = 0
-                
-                for statement in statements:
-                    statement = statement.strip()
-                    if statement:  # Skip empty statements
-                        try:
-                            cursor.execute(statement)
-                            line_num = line_num + 1
-                            if line_num % 1000 == 0:
-                                self.appConfig.console.print(".", end="")
-                        except sqlite3.Error as e:
-                            print(f"Error executing statement: {statement[:100]}...")
-                            print(f"Error message: {e}")
-                            raise
-            
-            # Commit transaction
-            # cursor.commit()
-            
-            # Verify import (optional)
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
-            self.logger.info(f"Tables in database after import: {[table[0] for table in tables]}")
-            
-        except sqlite3.Error as e:
-            print(f"SQLite error: {e}")
-            raise
+            before = cursor.execute(f'select count(*) from {table_name}').fetchone()[0]
+            cursor.executemany(sql, rows)
+            after = cursor.execute(f'select count(*) from {table_name}').fetchone()[0]
+
+            if after - before != len(rows):
+                raise UnableToExecuteSqliteQuery(f"Import of {sql_path} into {table_name}: expected {len(rows)} rows, found {after - before}")
+
+            cursor.execute('INSERT OR REPLACE INTO cow_pricingimports (table_name, import_time) VALUES (?, ?)', (table_name, time.time()))
+
+            self._commit()
         except Exception as e:
-            print(f"Error: {e}")
-            raise
+            self.con.rollback()
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
         finally:
-            if cursor:
-                cursor.close()
+            cursor.close()
+
+        self.logger.info(f"Imported {len(rows)} rows into {table_name} from {sql_path}")
+        return len(rows)
+
+    def get_bundled_sql_dump(self, file_name) -> Path:
+        '''return the path of a sql dump shipped with the config package'''
+        return Path(__file__).parent / file_name
+
+    def import_bundled_sql_dump(self, table_name) -> int:
+        '''import the <table_name>.sql dump shipped with the config package, skipped with a warning when it is not shipped'''
+        file_path = self.get_bundled_sql_dump(f'{table_name}.sql')
+        if not file_path.is_file():
+            self.logger.warning(f"No bundled sql dump {file_path.name}, {table_name} is left empty and prices come from the pricing API")
+            return 0
+
+        return self.import_sql_dump_with_validation(table_name, file_path)
 
     # function that read all record from ./cow_awsprincing.sql file and insert the records into cow_awspricingdb table
     def insert_awspricingdb(self):
@@ -679,8 +1011,7 @@ class ToolingDatabase:
                 self.appConfig.console.print("[yellow]\nImporting pricing informations for instances from cow_awsprincing.sql, please wait...")
 
                 # import cow_awspricingdb.sql file
-                file_path = os.path.join("src", "CostMinimizer", "config", "cow_awspricingdb.sql")
-                self.import_sql_dump_with_validation( 'cow_awspricingdb', file_path)
+                self.import_bundled_sql_dump('cow_awspricingdb')
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
@@ -698,8 +1029,7 @@ class ToolingDatabase:
                 self.appConfig.console.print("[yellow]\nImporting pricing informations for instances from cow_awspricingec2.sql, please wait...")
 
                 # import cow_awspricingec2.sql file
-                file_path = os.path.join("src", "CostMinimizer", "config", "cow_awspricingec2.sql")
-                self.import_sql_dump_with_validation( 'cow_awspricingec2', file_path)
+                self.import_bundled_sql_dump('cow_awspricingec2')
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
@@ -717,8 +1047,7 @@ class ToolingDatabase:
                 self.appConfig.console.print("[yellow]Importing graviton conversion informations for instances from cow_gravitonconversion.sql, please wait...")
 
                 # import gravitonconversion.csv file
-                file_path = os.path.join("src", "CostMinimizer", "config", "cow_gravitonconversion.sql")
-                self.import_sql_dump_with_validation( 'cow_gravitonconversion', file_path)
+                self.import_bundled_sql_dump('cow_gravitonconversion')
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
@@ -736,18 +1065,54 @@ class ToolingDatabase:
                 self.appConfig.console.print("[yellow]\nImporting pricing informations for lambda from cow_awspricinglambda.sql, please wait...")
 
                 # import gravitonconversion.csv file
-                file_path = os.path.join("src", "CostMinimizer", "config", "cow_awspricinglambda.sql")
-                self.import_sql_dump_with_validation( 'cow_gravitonconversion', file_path)
+                self.import_bundled_sql_dump('cow_awspricinglambda')
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
         cursor.close()
 
 
-    # function that as a type of instance in parameters and results the unit price read from cow_awsprincing table
-    def get_ec2instance_price_from_db(self, instance_family, region, operating_system, tenancy, pre_installed_software):
+    @staticmethod
+    def _unit_price(value) -> float:
+        '''price of a pricing table cell, 0.0 when the cell is empty or not a number'''
+        try:
+            price = float(value)
+        except (TypeError, ValueError):
+            return float(0)
+        return price if price == price else float(0)
+
+    @synchronized
+    def _find_first_price(self, table_name, conditions, price_column) -> float:
+        '''
+        return price_column of the first row of table_name matching all conditions, 0.0 if no row matches
+        conditions = dict of column -> value, or tuple of accepted values; served by the pricing snapshot when it holds the table
+        '''
+        if self.snapshot_has_table(table_name):
+            row = self.pricing_snapshot.find_first(table_name, conditions, [price_column])
+            return self._unit_price(row[0]) if row is not None else float(0)
+
+        sql_conditions = []
+        parameters = []
+        for column, value in conditions.items():
+            values = value if isinstance(value, tuple) else (value,)
+            sql_conditions.append(f"{column} IN ({', '.join(['?' for _ in values])})")
+            parameters.extend(values)
+
+        sql = f"select {price_column} from {table_name} where {' AND '.join(sql_conditions)}"
+
         cursor = self.con.cursor()
+        try:
+            l_fetchone = cursor.execute(sql, parameters).fetchone()
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
+        return self._unit_price(l_fetchone[0]) if l_fetchone is not None else float(0)
 
+    # function that as a type of instance in parameters and results the unit price read from cow_awsprincing table
+    def get_ec2instance_price_from_db(self, instance_family, region, operating_system, tenancy, pre_installed_software):
         if 'Windows' == operating_system or \
             'RHEL' == operating_system or \
             'Ubuntu Pro' == operating_system or \
@@ -756,118 +1121,376 @@ class ToolingDatabase:
             'Linux' == operating_system or \
             'Linux with HA' == operating_system or \
             'Red Hat Enterprise Linux with HA' == operating_system:
-            l_operating_system = operating_system+'NA'
+            # ConcatField ends with the pre-installed software, NA when there is none
+            l_operating_system = operating_system + (pre_installed_software or 'NA')
         else:
             l_operating_system = operating_system
 
         # check if region is a tuple type
         if isinstance(region, tuple):
-            conditions = [f"ConcatField = '{instance_family}{value}{l_operating_system}'" for value in region]
-            sql_condition = " OR ".join(conditions)
-                
+            keys = tuple(f'{instance_family}{value}{l_operating_system}' for value in region)
         else:
-            sql_condition = f"ConcatField = '{instance_family}{region}{l_operating_system}'"
+            keys = f'{instance_family}{region}{l_operating_system}'
+
+        unit_price = self._find_first_price('cow_awspricingec2', {'ConcatField': keys}, 'odpriceperunit')
+        self.logger.info(f"Unit Price for {instance_family} in region {region}: {unit_price}")
+        return unit_price
 
-        sql = f"select ConcatField,Column1,vcpu,Family,odpriceperunit,ripriceperunit,svpriceperunit from cow_awspricingec2 where {sql_condition}"
+    # function that as a type of instance in parameters and results the unit price read from cow_awsprincing table
+    def get_dbinstance_price_from_db(self, instance_family, region, database_engine, deployment_option, pre_installed_software):
+        # cow_awspricingdb has no pre-installed software column, db instance prices do not depend on it
+        conditions = {'instancetype': instance_family, 'location': region, 'databaseengine': database_engine, 'deploymentoption': deployment_option}
+
+        unit_price = self._find_first_price('cow_awspricingdb', conditions, 'odpriceperunit')
+        self.logger.info(f"Unit Price for {instance_family} in region {region}: {unit_price}")
+        return unit_price
+
+    # function that as a type of instance in parameters and results the unit price read from cow_awsprincing table
+    def get_lambda_price_from_db(self, region, usage_type):
+        unit_price = self._find_first_price('cow_awspricinglambda', {'usagetype': usage_type, 'location': region}, 'odpriceperunit')
+        self.logger.info(f"Unit Price for {usage_type} in region {region}: {unit_price}")
+        return unit_price
+
+    # get graviton equivalent from an instance type in parameter and using cow_gravitonconversion table
+    @synchronized
+    def get_graviton_equivalent_from_db(self, instance_type):
+        cursor = self.con.cursor()
+        sql = "select Graviton2, Graviton3, Graviton4, Default_Graviton_Equivalent from cow_gravitonconversion where family = '{}' ".format(instance_type)
         try:
-            result = cursor.execute(sql)
-            l_fetchone = result.fetchone()
-            if (l_fetchone is not None):
-                unit_price = float(l_fetchone[4])
+            if self.snapshot_has_table('cow_gravitonconversion'):
+                columns = ['Graviton2', 'Graviton3', 'Graviton4', 'Default_Graviton_Equivalent']
+                graviton_equivalence = self.pricing_snapshot.find_first('cow_gravitonconversion', {'Family': instance_type}, columns)
+            else:
+                result = cursor.execute(sql)
+                graviton_equivalence = result.fetchone()
+            # get result[2] if value is not '' otherwise result[1] if value is not '' or result[0]
+            if graviton_equivalence[3] != '':
+                graviton_equivalence = graviton_equivalence[3]
+            elif graviton_equivalence[2] != '':
+                graviton_equivalence = graviton_equivalence[2]
+            elif graviton_equivalence[1] != '':
+                graviton_equivalence = graviton_equivalence[1]
             else:
-                unit_price = float(0)
+                graviton_equivalence = graviton_equivalence[0]
             cursor.close()
-            self.logger.info(f"Unit Price for {instance_family} in region {region}: {unit_price}")
-            return unit_price
+            return graviton_equivalence
+        except Exception as e:
+            self.logger.error(f"Database.error: {str(e)}")
+            raise e
+
+
+    @synchronized
+    def upsert_savings_plan_rates(self, rates) -> int:
+        '''
+        bulk upsert savings plan rates into cow_savingsplanrates in a single transaction
+        rates = list of dict, keys matching the cow_savingsplanrates columns
+        '''
+        if not rates:
+            return 0
+
+        columns = list(rates[0].keys())
+        placeholders = ', '.join(['?' for _ in columns])
+        updates = ', '.join([f'{c} = excluded.{c}' for c in columns if c != 'rate_key'])
+
+        sql = f'INSERT INTO cow_savingsplanrates ({", ".join(columns)}) VALUES ({placeholders}) ON CONFLICT(rate_key) DO UPDATE SET {updates}'
+        parameters = [tuple(rate[c] for c in columns) for rate in rates]
+
+        cursor = self.con.cursor()
+        try:
+            cursor.executemany(sql, parameters)
+            self._commit()
         except Exception as e:
+            self.con.rollback()
             self.logger.error(f"Database error: {str(e)}")
             raise e
+        finally:
+            cursor.close()
+
+        return len(parameters)
+
+    @synchronized
+    def get_savings_plan_rates_from_db(self, region=None, product_type=None, plan_type=None, payment_option=None, instance_types=None) -> pd.DataFrame:
+        '''
+        return savings plan rates as a dataframe, for vectorized on-demand vs savings plan comparisons
+        every parameter is an optional filter; instance_types is a list of instance types
+        '''
+        conditions = []
+        parameters = []
+
+        for column, value in (('region', region), ('product_type', product_type), ('plan_type', plan_type), ('payment_option', payment_option)):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                parameters.append(value)
+
+        if instance_types:
+            conditions.append(f"instance_type IN ({', '.join(['?' for _ in instance_types])})")
+            parameters.extend(instance_types)
+
+        sql = 'select * from cow_savingsplanrates'
+        if conditions:
+            sql = sql + ' where ' + ' AND '.join(conditions)
+
+        try:
+            return pd.read_sql_query(sql, self.con, params=parameters)
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+
+    @synchronized
+    def get_savings_plan_rates_load_time(self, region, product_type=None):
+        '''return the oldest load time (iso format) of the savings plan rates of region, and of product_type if given; None if no rate is stored'''
+        sql = 'SELECT min(load_time) FROM cow_savingsplanrates WHERE region = ?'
+        params = [region]
+        if product_type is not None:
+            sql += ' AND product_type = ?'
+            params.append(product_type)
 
-    # function that as a type of instance in parameters and results the unit price read from cow_awsprincing table
-    def get_dbinstance_price_from_db(self, instance_family, region, database_engine, deployment_option, pre_installed_software):
         cursor = self.con.cursor()
+        try:
+            row = cursor.execute(sql, params).fetchone()
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
 
-        sql_condition = f" instancetype = '{instance_family}' AND "
+        return row[0] if row else None
 
-        # check if region is a tuple type
-        if isinstance(region, tuple):
-            conditions = [f" location = '{value}'" for value in region]
-            sql_condition = sql_condition + "(" + " OR ".join(conditions) + ")"
-                
-        else:
-            sql_condition = sql_condition + f" location = '{region}'"
+    @synchronized
+    def upsert_account_support_status(self, statuses, probe_time) -> int:
+        '''store the support plan probed for each account, statuses = dict of account id -> support status'''
+        if not statuses:
+            return 0
 
-        sql_condition = sql_condition  + f" AND databaseengine = '{database_engine}'"
+        sql = 'INSERT INTO cow_accountsupportstatus (account_id, support_status, probe_time) VALUES (?, ?, ?) ON CONFLICT(account_id) DO UPDATE SET support_status = excluded.support_status, probe_time = excluded.probe_time'
+        parameters = [(account, status, probe_time) for account, status in statuses.items()]
 
-        sql_condition = sql_condition  + f" AND deploymentoption = '{deployment_option}'"
+        cursor = self.con.cursor()
+        try:
+            cursor.executemany(sql, parameters)
+            self._commit()
+        except Exception as e:
+            self.con.rollback()
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
 
-        sql = f"select family,instancetype,databaseengine,deploymentoption,location,odpriceperunit,ripriceperunit from cow_awspricingdb where {sql_condition}"
+        return len(parameters)
+
+    @synchronized
+    def get_account_support_status(self, min_probe_time) -> dict:
+        '''return dict of account id -> support status for the probes done after min_probe_time'''
+        sql = 'SELECT account_id, support_status FROM cow_accountsupportstatus WHERE probe_time >= ?'
+
+        cursor = self.con.cursor()
         try:
-            result = cursor.execute(sql)
-            l_fetchone = result.fetchone()
-            if (l_fetchone is not None):
-                unit_price = float(l_fetchone[5])
-            else:
-                unit_price = float(0)
+            rows = cursor.execute(sql, (min_probe_time,)).fetchall()
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
             cursor.close()
-            self.logger.info(f"Unit Price for {instance_family} in region {region}: {unit_price}")
-            return unit_price
+
+        return dict(rows)
+
+    @synchronized
+    def upsert_org_snapshot(self, snapshot) -> None:
+        '''store the organization of an account, snapshot = dict with the cow_orgsnapshot columns'''
+        sql = 'INSERT OR REPLACE INTO cow_orgsnapshot (caller_account_id, organization_id, master_account_id, is_payer, fetch_time) VALUES (?, ?, ?, ?, ?)'
+        parameters = (snapshot['caller_account_id'], snapshot['organization_id'], snapshot['master_account_id'], int(snapshot['is_payer']), snapshot['fetch_time'])
+
+        cursor = self.con.cursor()
+        try:
+            cursor.execute(sql, parameters)
+            self._commit()
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
+        finally:
+            cursor.close()
+
+    @synchronized
+    def get_org_snapshot(self, caller_account_id) -> dict:
+        '''return the organization snapshot of an account, None if it was never fetched'''
+        sql = 'SELECT caller_account_id, organization_id, master_account_id, is_payer, fetch_time FROM cow_orgsnapshot WHERE caller_account_id = ?'
 
-    # function that as a type of instance in parameters and results the unit price read from cow_awsprincing table
-    def get_lambda_price_from_db(self, region, usage_type):
         cursor = self.con.cursor()
+        try:
+            row = cursor.execute(sql, (caller_account_id,)).fetchone()
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
 
-        sql_condition = f" usagetype = '{usage_type}' AND "
+        if row is None:
+            return None
 
-        # check if region is a tuple type
-        if isinstance(region, tuple):
-            conditions = [f" location = '{value}'" for value in region]
-            sql_condition = sql_condition + "(" + " OR ".join(conditions) + ")"
-                
-        else:
-            sql_condition = sql_condition + f" location = '{region}'"
+        return {'caller_account_id': row[0], 'organization_id': row[1], 'master_account_id': row[2], 'is_payer': bool(row[3]), 'fetch_time': row[4]}
 
-        sql = f"select location,usagetype,odpriceperunit,svpriceperunit from cow_awspricinglambda where {sql_condition}"
+    @synchronized
+    def replace_org_accounts(self, organization_id, accounts, fetch_time) -> int:
+        '''upsert the crawled accounts of an organization and delete the accounts no longer listed, in one transaction'''
+        upsert = '''INSERT INTO cow_orgaccounts (organization_id, account_id, arn, email, name, status, joined_method, joined_timestamp, fetch_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(organization_id, account_id) DO UPDATE SET arn = excluded.arn, email = excluded.email, name = excluded.name,
+            status = excluded.status, joined_method = excluded.joined_method, joined_timestamp = excluded.joined_timestamp, fetch_time = excluded.fetch_time'''
+        parameters = [(organization_id, a['Id'], a['Arn'], a['Email'], a['Name'], a['Status'], a['JoinedMethod'], a['JoinedTimestamp'], fetch_time) for a in accounts]
+
+        cursor = self.con.cursor()
         try:
-            result = cursor.execute(sql)
-            l_fetchone = result.fetchone()
-            if (l_fetchone is not None):
-                unit_price = float(l_fetchone[2])
-            else:
-                unit_price = float(0)
+            cursor.executemany(upsert, parameters)
+            # accounts not refreshed by this crawl have left the organization
+            cursor.execute('DELETE FROM cow_orgaccounts WHERE organization_id = ? AND fetch_time < ?', (organization_id, fetch_time))
+            self._commit()
+        except Exception as e:
+            self.con.rollback()
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
             cursor.close()
-            self.logger.info(f"Unit Price for {usage_type} in region {region}: {unit_price}")
-            return unit_price
+
+        return len(parameters)
+
+    @synchronized
+    def get_org_accounts(self, organization_id) -> tuple:
+        '''return (accounts, fetch time) of the organization snapshot, accounts as list_accounts dicts'''
+        sql = 'SELECT account_id, arn, email, name, status, joined_method, joined_timestamp, fetch_time FROM cow_orgaccounts WHERE organization_id = ? ORDER BY account_id'
+
+        cursor = self.con.cursor()
+        try:
+            rows = cursor.execute(sql, (organization_id,)).fetchall()
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
+        finally:
+            cursor.close()
+
+        accounts = [{'Id': r[0], 'Arn': r[1], 'Email': r[2], 'Name': r[3], 'Status': r[4], 'JoinedMethod': r[5], 'JoinedTimestamp': r[6]} for r in rows]
+        fetch_time = min(r[7] for r in rows) if rows else None
+
+        return accounts, fetch_time
+
+    @synchronized
+    def upsert_snapshot_info(self, snapshots) -> int:
+        '''store completed snapshot metadata, snapshots = list of dict with the cow_snapshotinfo columns'''
+        if not snapshots:
+            return 0
+
+        sql = 'INSERT OR REPLACE INTO cow_snapshotinfo (snapshot_id, region, volume_size_gib, start_time, description, state, block_count) VALUES (?, ?, ?, ?, ?, ?, ?)'
+        parameters = [(s['snapshot_id'], s['region'], s['volume_size_gib'], s['start_time'], s['description'], s['state'], s['block_count']) for s in snapshots]
 
-    # get graviton equivalent from an instance type in parameter and using cow_gravitonconversion table
-    def get_graviton_equivalent_from_db(self, instance_type):
         cursor = self.con.cursor()
-        sql = "select Graviton2, Graviton3, Graviton4, Default_Graviton_Equivalent from cow_gravitonconversion where family = '{}' ".format(instance_type)
         try:
-            result = cursor.execute(sql)
-            # get result[2] if value is not '' otherwise result[1] if value is not '' or result[0]
-            graviton_equivalence = result.fetchone()
-            if graviton_equivalence[3] != '':
-                graviton_equivalence = graviton_equivalence[3]
-            elif graviton_equivalence[2] != '':
-                graviton_equivalence = graviton_equivalence[2]
-            elif graviton_equivalence[1] != '':
-                graviton_equivalence = graviton_equivalence[1]
-            else:
-                graviton_equivalence = graviton_equivalence[0]
+            cursor.executemany(sql, parameters)
+            self._commit()
+        except Exception as e:
+            self.con.rollback()
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
             cursor.close()
-            return graviton_equivalence
+
+        return len(parameters)
+
+    @synchronized
+    def get_snapshot_info(self, snapshot_ids) -> dict:
+        '''return dict of snapshot id -> row dict for the snapshot ids already stored'''
+        snapshot_ids = list(snapshot_ids)
+        rows = []
+
+        cursor = self.con.cursor()
+        try:
+            # stay below the sqlite limit of host parameters per statement
+            for i in range(0, len(snapshot_ids), 500):
+                chunk = snapshot_ids[i:i + 500]
+                sql = f'SELECT snapshot_id, region, volume_size_gib, start_time, description, state, block_count FROM cow_snapshotinfo WHERE snapshot_id IN ({", ".join("?" * len(chunk))})'
+                rows.extend(cursor.execute(sql, chunk).fetchall())
         except Exception as e:
-            self.logger.error(f"Database.error: {str(e)}")
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
+        columns = ['snapshot_id', 'region', 'volume_size_gib', 'start_time', 'description', 'state', 'block_count']
+        return {row[0]: dict(zip(columns, row)) for row in rows}
+
+    @synchronized
+    def replace_ta_checks(self, language, checks, fetch_time) -> int:
+        '''replace the Trusted Advisor check catalog of language, checks as returned by describe_trusted_advisor_checks'''
+        sql = 'INSERT INTO cow_tachecks (language, check_id, name, description, category, metadata, fetch_time) VALUES (?, ?, ?, ?, ?, ?, ?)'
+        parameters = [(language, c['id'], c['name'], c['description'], c['category'], json.dumps(c['metadata']), fetch_time) for c in checks]
+
+        cursor = self.con.cursor()
+        try:
+            cursor.execute('DELETE FROM cow_tachecks WHERE language = ?', (language,))
+            cursor.executemany(sql, parameters)
+            self._commit()
+        except Exception as e:
+            self.con.rollback()
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
+        return len(parameters)
+
+    @synchronized
+    def get_ta_checks(self, language) -> tuple:
+        '''return (checks, fetch time) of the stored Trusted Advisor catalog, checks as describe_trusted_advisor_checks dicts'''
+        sql = 'SELECT check_id, name, description, category, metadata, fetch_time FROM cow_tachecks WHERE language = ?'
+
+        cursor = self.con.cursor()
+        try:
+            rows = cursor.execute(sql, (language,)).fetchall()
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
+        checks = [{'id': r[0], 'name': r[1], 'description': r[2], 'category': r[3], 'metadata': json.loads(r[4])} for r in rows]
+        fetch_time = min(r[5] for r in rows) if rows else None
+
+        return checks, fetch_time
+
+    @synchronized
+    def upsert_ce_tag_values(self, account_id, tag_key, search_string, start_date, end_date, tag_values, fetch_time) -> None:
+        '''store the Cost Explorer get_tags values of tag_key seen from account_id for a search string and time window'''
+        sql = 'INSERT OR REPLACE INTO cow_cetagcatalog (account_id, tag_key, search_string, start_date, end_date, tag_values, fetch_time) VALUES (?, ?, ?, ?, ?, ?, ?)'
+
+        cursor = self.con.cursor()
+        try:
+            cursor.execute(sql, (account_id, tag_key, search_string, start_date, end_date, json.dumps(tag_values), fetch_time))
+            self._commit()
+        except Exception as e:
+            self.con.rollback()
+            self.logger.error(f"Database error: {str(e)}")
             raise e
+        finally:
+            cursor.close()
 
+    @synchronized
+    def get_ce_tag_values(self, account_id, tag_key, search_string, start_date, end_date) -> tuple:
+        '''return (tag values, fetch time) stored for account_id, tag_key, search string and time window; (None, None) if not stored'''
+        sql = 'SELECT tag_values, fetch_time FROM cow_cetagcatalog WHERE account_id = ? AND tag_key = ? AND search_string = ? AND start_date = ? AND end_date = ?'
 
+        cursor = self.con.cursor()
+        try:
+            row = cursor.execute(sql, (account_id, tag_key, search_string, start_date, end_date)).fetchone()
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
+        if row is None:
+            return None, None
+
+        return json.loads(row[0]), row[1]
+
+    @synchronized
     def get_cow_configuration(self) -> list:
         '''return dictionary of cow configuration parameters'''
 
@@ -884,6 +1507,7 @@ class ToolingDatabase:
         cursor.close()
         return retVal
 
+    @synchronized
     def get_cow_internals_parameters(self) -> list:
         '''return dictionary of cow configuration parameters'''
 
@@ -901,6 +1525,7 @@ class ToolingDatabase:
         cursor.close()
         return retVal
 
+    @synchronized
     def get_customer_id(self, customer_name) -> list:
         '''return a list of the customer's ID'''
         sql = f"select cx_id from {self.get_tables_dict()[self.customer_table_name]} where cx_name = ?"
@@ -917,6 +1542,7 @@ class ToolingDatabase:
         cursor.close()
         return retVal
 
+    @synchronized
     def get_all_customers(self) -> List[Customer]:
         '''return all customers'''
         cursor = self.con.cursor()
@@ -941,6 +1567,7 @@ class ToolingDatabase:
         cursor.close()
         return customers
 
+    @synchronized
     def get_customer(self, customer_name) -> List[Customer]:
         '''return customer by name'''
         cursor = self.con.cursor()
@@ -958,6 +1585,7 @@ class ToolingDatabase:
         return retVal
 
 
+    @synchronized
     def get_customer_payers(self, customer_name) -> list:
         cx_id = self.get_customer_id(customer_name)
 
@@ -978,6 +1606,7 @@ class ToolingDatabase:
         else:
             return []
 
+    @synchronized
     def get_available_reports(self) -> List[Report]:
         '''return available reports'''
 
@@ -997,6 +1626,7 @@ class ToolingDatabase:
         cursor.close()
         return reports
     
+    @synchronized
     def get_configurable_reports(self)->List:
         '''return available reports'''
         
@@ -1015,6 +1645,7 @@ class ToolingDatabase:
 
         return reports
     
+    @synchronized
     def get_report_parameters(self, report_name)->List:
         '''return available reports'''
         cursor = self.con.cursor()
@@ -1033,6 +1664,7 @@ class ToolingDatabase:
 
         return reports
     
+    @synchronized
     def update_report_parameters(self, report_name, report_parameters):
         '''upsert cow_reportparameters table with new or updated cow report parameters'''
 
@@ -1046,11 +1678,12 @@ class ToolingDatabase:
         sql = "insert into cow_reportparameters (report_name, report_parameters) values (?, ?) on conflict(report_name) do update set report_parameters = ? where report_name = ?"
         try:
             cursor.execute(sql, parameters)
-            self.con.commit()
+            self._commit()
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
 
+    @synchronized
     def delete_report(self, customer, report_time):
         # delete report history record for a given report_id
         table_name = 'cow_cowreporthistory'
@@ -1062,7 +1695,7 @@ class ToolingDatabase:
         parameters = report_time, cx_id
         try:
             cursor.execute(sql, parameters)
-            self.con.commit()
+            self._commit()
         except Exception as e:
             self.logger.error(f"Database error: {str(e)}")
             raise e
@@ -1071,6 +1704,40 @@ class ToolingDatabase:
         cursor.close()
         return None
 
+    @synchronized
+    def update_report_history_status(self, report_id, report_name, report_provider, status) -> int:
+        '''set the status of the history records of a report execution, return the number of records updated'''
+        sql = "UPDATE cow_cowreporthistory SET status = ? WHERE report_id = ? AND report_name = ? AND report_provider = ?"
+        cursor = self.con.cursor()
+
+        try:
+            result = cursor.execute(sql, (status, report_id, report_name, report_provider))
+            self._commit()
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
+        return result.rowcount
+
+    @synchronized
+    def get_report_history(self, report_id) -> list:
+        '''return the history records (report_name, report_provider, start_time, status) of an execution id'''
+        sql = "SELECT report_name, report_provider, start_time, status FROM cow_cowreporthistory WHERE report_id = ? ORDER BY hist_id"
+        cursor = self.con.cursor()
+
+        try:
+            rows = cursor.execute(sql, (report_id,)).fetchall()
+        except Exception as e:
+            self.logger.error(f"Database error: {str(e)}")
+            raise e
+        finally:
+            cursor.close()
+
+        return [{'report_name': r[0], 'report_provider': r[1], 'start_time': r[2], 'status': r[3]} for r in rows]
+
+    @synchronized
     def update_table_value(self, table_name, column_name, id, new_value, sql_provided=None) -> None:
         '''update value for table where key lookup is cx_id'''
 
@@ -1092,12 +1759,13 @@ class ToolingDatabase:
             self.logger.exception(msg)
             raise UnableToUpdateSQLValue(msg)
 
-        self.con.commit()
+        self._commit()
 
         cursor.close()
 
         return None
 
+    @synchronized
     def get_configuration(self):
         '''return cow configuration'''
         cursor = self.con.cursor()
@@ -1113,6 +1781,7 @@ class ToolingDatabase:
         cursor.close()
         return retVal
 
+    @synchronized
     def table_colum_check(self, table_name, column_name) -> bool:
         '''return true if column exists false if not exists'''
         sql = "select %s from %s"
@@ -1128,6 +1797,7 @@ class ToolingDatabase:
 
         return True
 
+    @synchronized
     def get_table_schema(self, table_name) -> list:
         '''return table schema '''
 
@@ -1145,6 +1815,7 @@ class ToolingDatabase:
 
         return result
 
+    @synchronized
     def get_secrets_manager_name(self) -> str:
         '''return secrets manager name'''
 
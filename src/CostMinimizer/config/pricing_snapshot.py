@@ -0,0 +1,152 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# pricing and conversion tables compiled into the snapshot
+SNAPSHOT_TABLES = [
+    'cow_awspricingec2',
+    'cow_awspricingdb',
+    'cow_awspricinglambda',
+    'cow_gravitonconversion']
+
+MANIFEST_FILE = 'manifest.json'
+SNAPSHOT_VERSION = 1
+
+class InvalidPricingSnapshot(Exception):
+    pass
+
+class PricingSnapshot:
+    '''
+    columnar, memory-mapped copy of the pricing and graviton conversion tables
+
+    Each column is stored as a NumPy .npy file: numeric columns as float64 arrays,
+    text columns as int32 category codes plus a sorted array of categories. Loading
+    memory-maps the arrays, so queries need no parsing and no SQL import. The import time of
+    each source table is kept in the manifest to detect tables re-imported after the build.
+    '''
+
+    def __init__(self, directory, manifest, arrays) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.directory = Path(directory)
+        self.manifest = manifest
+        self.arrays = arrays
+
+    @staticmethod
+    def exists(directory) -> bool:
+        '''return True if a snapshot manifest is present in directory'''
+        return (Path(directory) / MANIFEST_FILE).is_file()
+
+    @classmethod
+    def build(cls, con, directory, import_times=None) -> dict:
+        '''
+        compile the snapshot tables of the sqlite connection con into directory; return the manifest
+        import_times = dict of table name -> time the table was imported into the database
+        '''
+        import_times = import_times or {}
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        manifest = {'version': SNAPSHOT_VERSION, 'tables': {}}
+
+        for table in SNAPSHOT_TABLES:
+            df = pd.read_sql_query(f'select * from {table}', con)
+            if df.empty:
+                continue
+
+            columns = {}
+            for column in df.columns:
+                if pd.api.types.is_numeric_dtype(df[column]):
+                    np.save(directory / f'{table}.{column}.npy', df[column].to_numpy(dtype=np.float64))
+                    columns[column] = 'numeric'
+                else:
+                    categorical = pd.Categorical(df[column].fillna('').astype(str))
+                    np.save(directory / f'{table}.{column}.codes.npy', categorical.codes.astype(np.int32))
+                    np.save(directory / f'{table}.{column}.categories.npy', np.asarray(categorical.categories, dtype=str))
+                    columns[column] = 'categorical'
+
+            manifest['tables'][table] = {'rows': len(df), 'columns': columns, 'import_time': import_times.get(table)}
+
+        with open(directory / MANIFEST_FILE, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        return manifest
+
+    @classmethod
+    def load(cls, directory) -> 'PricingSnapshot':
+        '''memory-map a snapshot previously written by build()'''
+        directory = Path(directory)
+
+        with open(directory / MANIFEST_FILE) as f:
+            manifest = json.load(f)
+
+        if manifest.get('version') != SNAPSHOT_VERSION:
+            raise InvalidPricingSnapshot(f'Unsupported pricing snapshot version in {directory}')
+
+        arrays = {}
+        for table, definition in manifest['tables'].items():
+            for column, kind in definition['columns'].items():
+                if kind == 'numeric':
+                    arrays[(table, column)] = np.load(directory / f'{table}.{column}.npy', mmap_mode='r')
+                else:
+                    arrays[(table, column)] = (
+                        np.load(directory / f'{table}.{column}.codes.npy', mmap_mode='r'),
+                        np.load(directory / f'{table}.{column}.categories.npy', mmap_mode='r'))
+
+        return cls(directory, manifest, arrays)
+
+    def get_stale_tables(self, import_times) -> list:
+        '''return the snapshot tables imported into the database after the snapshot was built'''
+        return [table for table, definition in self.manifest['tables'].items()
+            if import_times.get(table) is not None and import_times[table] != definition.get('import_time')]
+
+    def has_table(self, table) -> bool:
+        return table in self.manifest['tables']
+
+    def _column_mask(self, table, column, values) -> np.ndarray:
+        '''boolean mask of rows where column equals one of values'''
+        codes, categories = self.arrays[(table, column)]
+        mask = np.zeros(len(codes), dtype=bool)
+
+        for value in values:
+            # categories are sorted, a binary search gives the code of value
+            position = int(np.searchsorted(categories, value))
+            if position < len(categories) and categories[position] == value:
+                mask |= (codes == position)
+
+        return mask
+
+    def find_first(self, table, conditions, columns) -> tuple:
+        '''
+        return the values of columns for the first row matching all conditions, None if no row matches
+        conditions = dict of text column -> value, or tuple of accepted values
+        '''
+        mask = np.ones(self.manifest['tables'][table]['rows'], dtype=bool)
+
+        for column, value in conditions.items():
+            values = value if isinstance(value, tuple) else (value,)
+            mask &= self._column_mask(table, column, values)
+
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0:
+            return None
+
+        return tuple(self.get_value(table, column, rows[0]) for column in columns)
+
+    def get_value(self, table, column, row):
+        '''decode the value of column at row'''
+        if self.manifest['tables'][table]['columns'][column] == 'numeric':
+            return float(self.arrays[(table, column)][row])
+
+        codes, categories = self.arrays[(table, column)]
+        return str(categories[codes[row]])
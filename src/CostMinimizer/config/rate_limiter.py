@@ -0,0 +1,144 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import logging
+import threading
+import time
+
+# error codes returned by AWS APIs when a request is throttled
+THROTTLE_ERROR_CODES = {
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'TooManyRequestsException',
+    'RequestLimitExceeded',
+    'LimitExceededException',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'SlowDown'}
+
+class TokenBucket:
+    '''
+    thread safe token bucket, rate tokens per second up to burst tokens
+
+    acquire() reserves a token and sleeps until it is available, so concurrent callers are
+    served in the order they asked and the bucket never goes over rate on average.
+    '''
+
+    def __init__(self, rate, burst=None) -> None:
+        self.rate = float(rate)
+        self.burst = float(burst if burst else max(1.0, self.rate))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        '''take one token, return the seconds spent waiting for it'''
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+class RateLimiter:
+    '''
+    process-wide rate limiter with one token bucket per (service, operation, region)
+
+    limits = {service: {'rate': r, 'burst': b, 'operations': {operation: {'rate': r, 'burst': b}}}}
+    Services missing from limits are not limited. The limiter is attached to the pooled clients
+    through botocore events: a token is taken before each call, and throttling errors are counted.
+    '''
+
+    def __init__(self, limits=None) -> None:
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.limits = {}
+        self.stats = {'rate_limit_waits': 0, 'rate_limit_wait_seconds': 0.0, 'throttled_requests': 0}
+        self.configure(limits)
+
+    def configure(self, limits) -> None:
+        '''set the limits, the buckets are rebuilt on next use'''
+        with self._lock:
+            self.limits = limits or {}
+            self._buckets.clear()
+
+    def get_limit(self, service_name, operation_name):
+        '''return (rate, burst) of an operation, None when the service is not limited'''
+        service = self.limits.get(service_name)
+        if not service:
+            return None
+
+        limit = (service.get('operations') or {}).get(operation_name) or service
+        if not limit.get('rate'):
+            return None
+
+        return float(limit['rate']), limit.get('burst')
+
+    def get_bucket(self, service_name, operation_name, region_name):
+        key = (service_name, operation_name, region_name)
+
+        with self._lock:
+            if key not in self._buckets:
+                limit = self.get_limit(service_name, operation_name)
+                self._buckets[key] = TokenBucket(*limit) if limit else None
+
+            return self._buckets[key]
+
+    def acquire(self, service_name, operation_name, region_name) -> float:
+        '''wait for a token of (service, operation, region), return the seconds waited'''
+        bucket = self.get_bucket(service_name, operation_name, region_name)
+        if bucket is None:
+            return 0.0
+
+        wait = bucket.acquire()
+        if wait > 0:
+            with self._lock:
+                self.stats['rate_limit_waits'] += 1
+                self.stats['rate_limit_wait_seconds'] += wait
+
+        return wait
+
+    def record_response(self, service_name, operation_name, response) -> None:
+        '''count the throttled responses of a call'''
+        if response is None:
+            return
+
+        _, parsed = response
+        code = (parsed or {}).get('Error', {}).get('Code')
+        if code in THROTTLE_ERROR_CODES:
+            with self._lock:
+                self.stats['throttled_requests'] += 1
+            self.logger.info(f'{service_name}.{operation_name} throttled: {code}')
+
+    def attach(self, client, service_name, region_name) -> None:
+        '''limit the calls of a boto3 client'''
+
+        def before_call(model, **kwargs):
+            self.acquire(service_name, model.name, region_name)
+
+        def needs_retry(response, operation, **kwargs):
+            # only observes the response, the retry decision stays with botocore
+            self.record_response(service_name, operation.name, response)
+
+        client.meta.events.register('before-call.*.*', before_call)
+        client.meta.events.register('needs-retry.*.*', needs_retry)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+
+        stats['rate_limit_wait_seconds'] = round(stats['rate_limit_wait_seconds'], 3)
+        return stats
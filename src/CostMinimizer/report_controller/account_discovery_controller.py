@@ -6,20 +6,26 @@ __license__ = "Apache-2.0"
 
 from ..constants import __tooling_name__
 
-import boto3
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ..constants import __tooling_name__
-from ..error.error import UnableToDiscoverCustomerLinkedAccounts
 from rich.progress import track
 
 class AccountDiscoveryController:
     '''retrive metadata from requested accounts'''
     def __init__(self):
         from ..config.config import Config
+        from ..service_helpers.organizations import OrganizationSnapshot
         self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+        self.discovery_config = self.appConfig.internals['internals'].get('account_discovery', {})
         self.payer_account_id = None
         self.number_of_linked_accounts = None
         self.accounts_metadata = None
+        self.org_snapshot = OrganizationSnapshot()
+        self.organization = {}
         self.is_payer = self.determine_is_payer_account()
 
     def account_discovery_controller_setup(self):
@@ -33,24 +39,7 @@ class AccountDiscoveryController:
 
             if self.number_of_linked_accounts > 0:
                 self.accounts_metadata = self.get_linked_accounts()
-
-                # show progress bar based on evolution of self.accounts_metadate
-                display_msg = f'[green]Running accounts discovery in regions[/green]'
-                for a in track(self.accounts_metadata, description=display_msg):
-                    account = a['Id']
-
-                    try:
-                        if account == self.payer_account_id:
-                            session = self.appConfig.auth_manager.aws_cow_account_boto_session
-                        else:
-                            session = self.assume_role(self.get_organizations_role_arn(account), session_name=f'{account}-session')
-                    except Exception as e:
-                        self.appConfig.logger.error(f'Unable to assume role for {account} - {e}')
-                        a['support_status'] = 'unknown'
-                        continue
-
-                    support_status = self.get_support_status_of_account(session=session)
-                    a['support_status'] = support_status
+                self.discover_support_status(self.accounts_metadata)
         else:
             #standalone account
             self.accounts_metadata = []
@@ -59,72 +48,92 @@ class AccountDiscoveryController:
 
             self.accounts_metadata.append(account_record)
     
-    def determine_is_payer_account(self) -> bool:
-        try:
-            org_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('organizations')
-            # Check if the account is a master/management account
-            account_details = org_client.describe_organization()
+    def discover_support_status(self, accounts_metadata) -> None:
+        '''
+        set the support_status of every account, probing the accounts in parallel
+
+        Probes younger than support_probe_ttl seconds are read from the database instead,
+        new probes are written back so the next run skips them.
+        '''
+        ttl = float(self.discovery_config.get('support_probe_ttl', 86400))
+        known_status = self.appConfig.database.get_account_support_status(time.time() - ttl) if ttl > 0 else {}
+
+        to_probe = []
+        for a in accounts_metadata:
+            if a['Id'] in known_status:
+                a['support_status'] = known_status[a['Id']]
+            else:
+                to_probe.append(a)
 
-            # A payer account is typically the management account in AWS Organizations
-            is_payer = account_details['Organization']['MasterAccountId'] == self.appConfig.auth_manager.aws_cow_account_boto_session.client('sts').get_caller_identity()['Account']
+        self.logger.info(f'Account discovery: {len(accounts_metadata) - len(to_probe)} support status cached, {len(to_probe)} to probe')
+        if not to_probe:
+            return
 
-            return is_payer
-        except Exception as e:
-            if 'AWSOrganizationsNotInUseException' in str(e) or 'AccessDeniedException' in str(e):
-                # If the account is not part of an organization, treat it as a standalone account
-                self.appConfig.logger.info("Account is not part of an AWS Organization - treating as standalone account")
-                return False
+        probed = {}
+        max_workers = max(1, int(self.discovery_config.get('max_workers', 16)))
+        display_msg = f'[green]Running accounts discovery in regions[/green]'
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='account-discovery') as executor:
+            futures = {executor.submit(self.probe_account, a['Id']): a for a in to_probe}
+            for future in track(as_completed(futures), total=len(futures), description=display_msg):
+                a = futures[future]
+                a['support_status'] = future.result()
+                if a['support_status'] != 'unknown':
+                    probed[a['Id']] = a['support_status']
+
+        self.appConfig.database.upsert_account_support_status(probed, time.time())
+
+    def probe_account(self, account) -> str:
+        '''return the support plan of account, 'unknown' when the account cannot be probed'''
+        try:
+            if account == self.payer_account_id:
+                session = self.appConfig.auth_manager.aws_cow_account_boto_session
             else:
-                # Re-raise any other exceptions
-                raise
+                session = self.assume_role(self.get_organizations_role_arn(account), session_name=f'{account}-session')
+        except Exception as e:
+            self.appConfig.logger.error(f'Unable to assume role for {account} - {e}')
+            return 'unknown'
+
+        try:
+            return self.get_support_status_of_account(session=session)
+        except Exception as e:
+            self.appConfig.logger.error(f'Unable to probe support status of {account} - {e}')
+            return 'unknown'
+
+    def determine_is_payer_account(self) -> bool:
+        '''the organization is read from the snapshot in the database, describe_organization is only called when it expired'''
+        self.organization = self.org_snapshot.describe(self.appConfig.get_caller_identity()['Account'])
+
+        # A payer account is typically the management account in AWS Organizations
+        return self.organization['is_payer']
     
     def get_account_id(self, session=None) -> str:
         '''get account id'''
         if not session:
             session = self.appConfig.auth_manager.aws_cow_account_boto_session
 
-        sts_client = session.client('sts')
-        account_id = sts_client.get_caller_identity()['Account']
+        account_id = self.appConfig.client_pool.get_caller_identity(session)['Account']
 
         return account_id
     
     def get_number_linked_accounts(self) -> int:
-        try:
-            org_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('organizations')
-            # List accounts in the organization
-            response = org_client.list_accounts()
-
-            try:
-                return len(response['Accounts'])
-            except:
-                return 0
-        except Exception as e:
-            if 'AWSOrganizationsNotInUseException' in str(e):
-                # If the account is not part of an organization, there are no linked accounts
-                return 0
-            else:
-                # Re-raise any other exceptions
-                raise
+        return len(self.get_linked_accounts())
         
     def get_linked_accounts(self) -> list:
-        '''get linked accounts from organizations'''
-        try:
-            org_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('organizations')
-            # List accounts in the organization
-            response = org_client.list_accounts()
+        '''get linked accounts from the organization snapshot, crawled with list_accounts pagination once expired'''
+        if not self.organization.get('organization_id'):
+            # If the account is not part of an organization, return an empty list
+            return []
 
-            try:
-                return response['Accounts']
-            except:
-                raise UnableToDiscoverCustomerLinkedAccounts(Exception, self.appConfig, 'Unable to discover linked accounts')
+        try:
+            return self.org_snapshot.list_accounts(self.organization['organization_id'])
         except Exception as e:
             if 'AWSOrganizationsNotInUseException' in str(e):
-                # If the account is not part of an organization, return an empty list
                 return []
             else:
                 # Re-raise any other exceptions
                 raise
-         
+
     def get_support_status_of_account(self, session=None) -> list:
         '''get support status of linked accounts'''
         
@@ -133,8 +142,8 @@ class AccountDiscoveryController:
             if not session:
                 session = self.appConfig.auth_manager.aws_cow_account_boto_session
 
-            # Get the support status of the account
-            support_client = session.client('support')
+            # Get the support status of the account, the Support API is served from us-east-1
+            support_client = self.appConfig.client_pool.get_client(session, 'support', 'us-east-1')
 
             # Get severity levels
             try:
@@ -167,37 +176,15 @@ class AccountDiscoveryController:
                 else:
                     raise e
         
-        if self.is_payer:
-            for account in self.get_linked_accounts():
-                return get_status(session)
-        else:
-            return get_status(session)
+        return get_status(session)
 
     def get_organizations_role_arn(self, linked_account):
         organizations_role_arn = f'arn:aws:iam::{linked_account}:role/OrganizationAccountAccessRole'
         return organizations_role_arn
     
     def assume_role(self, role_arn, session_name=None, external_id=None):
-        
-        sts_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('sts')
-
+        '''return a session for role_arn from the credential vault, shared by all providers until its credentials are about to expire'''
         if not session_name:
             session_name = f'{__tooling_name__}-session'
 
-        assume_role_kwargs = {
-            'RoleArn': role_arn,
-            'RoleSessionName': session_name
-        }
-    
-        if external_id:
-            assume_role_kwargs['ExternalId'] = external_id
-
-        response = sts_client.assume_role(**assume_role_kwargs)
-
-        credentials = response['Credentials']
-
-        return boto3.Session(
-            aws_access_key_id=credentials['AccessKeyId'],
-            aws_secret_access_key=credentials['SecretAccessKey'],
-            aws_session_token=credentials['SessionToken']
-        )
+        return self.appConfig.credential_vault.get_session(self.appConfig.get_client('sts'), role_arn, session_name, external_id)
@@ -10,9 +10,11 @@ import logging
 import json
 import traceback
 import os
+import time
 import importlib
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from .account_discovery_controller import AccountDiscoveryController
 from ..utils.term_menu import launch_terminal_menu
@@ -235,7 +237,14 @@ class CowReportController(CowReportControllerBase):
                 if self.appConfig.cow_execution_type == 'sync':
                     s = datetime.now()
 
-                    provider.fetch_data(provider.reports_in_progress, type='base')
+                    provider.fetch_data(self.get_executed_reports(provider), type='base')
+
+                #async execution
+                elif self.appConfig.cow_execution_type == 'async':
+                    s = datetime.now()
+
+                    completed_reports = self.collect_async_reports(provider)
+                    provider.fetch_data(completed_reports, type='base')
 
                 else:
                     raise InvalidCowExecutionType(f'Invalid CostMinimizer execution type: {self.appConfig.cow_execution_type}')
@@ -244,9 +253,79 @@ class CowReportController(CowReportControllerBase):
                 self.logger.error(f"Invalid execution type: {str(e)}")
                 continue
 
+            except Exception as exc:
+                # a provider failing to fetch fails its pending reports, the other providers and the output still complete
+                self.logger.exception(exc)
+                self.appConfig.console.print(f'[red]Unable to fetch report results of provider {provider.name()} >>> {exc}')
+                for report_object in self.get_executed_reports(provider):
+                    if report_object not in provider.completed_reports:
+                        provider.record_report_failure(report_object, 'fetch', (datetime.now() - s).total_seconds(), exc)
+
             e = datetime.now()
             self.logger.info('Running fetch() for provider %s: finished in %s', provider.name(), e - s)
 
+    def get_async_report_timeout(self, report_object) -> float:
+        '''return the seconds allowed to an async report, the report override first then the internals default'''
+        timeout = report_object.async_timeout()
+        if timeout is None:
+            concurrency = self.appConfig.internals['internals'].get('concurrency', {})
+            timeout = concurrency.get('async_report_timeout', 900)
+
+        return float(timeout)
+
+    def get_executed_reports(self, provider) -> list:
+        '''return the reports in progress of a provider that did not fail to execute'''
+        return [r for r in provider.reports_in_progress if r not in provider.failed_reports]
+
+    def collect_async_reports(self, provider) -> list:
+        '''
+        wait for the async reports of a provider and return the ones that completed
+
+        Reports are collected as they complete. A report still running past its timeout is
+        cancelled and a report raising an exception is failed; both go to the provider failed reports.
+        '''
+        completed_reports = []
+        running = {}
+        for report_object in provider.reports_in_progress:
+            future = getattr(report_object, 'async_future', None)
+            if future is None:
+                # served from cache or executed in sync mode, nothing to wait for
+                completed_reports.append(report_object)
+            else:
+                deadline = report_object.async_submit_time + self.get_async_report_timeout(report_object)
+                running[future] = (report_object, deadline)
+
+        while running:
+            next_deadline = min(deadline for _, deadline in running.values())
+            done, _ = wait(running, timeout=max(0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                report_object, _ = running.pop(future)
+                try:
+                    executed = future.result()
+                except Exception as e:
+                    provider.record_report_failure(report_object, 'execute', time.monotonic() - report_object.async_submit_time, e)
+                    continue
+
+                # False: the failure was already recorded by the isolation boundary of the provider
+                if executed is not False:
+                    report_object.execution_state = True
+                    completed_reports.append(report_object)
+
+            now = time.monotonic()
+            for future, (report_object, deadline) in list(running.items()):
+                if now >= deadline:
+                    running.pop(future)
+                    # cancel() only stops a report still waiting for a slot, a running report
+                    # cannot be interrupted: it is abandoned and its late result is not checkpointed
+                    future.cancel()
+                    report_object.async_abandoned = True
+                    provider.cancel_report(report_object)
+                    provider.record_report_failure(report_object, 'execute', now - report_object.async_submit_time,
+                        TimeoutError(f'async execution exceeded {self.get_async_report_timeout(report_object):.0f} seconds'))
+
+        return completed_reports
+
     def calculate_savings(self):
         """
         Calculate savings for the reports.
@@ -320,6 +399,7 @@ class CowReportController(CowReportControllerBase):
         enabled_report_request = { 'enabled_reports': self.enabled_reports }
         self.appConfig.console.status(json.dumps(enabled_report_request))
 
+        providers = []
         for provider in self.report_providers:
             self.appConfig.console.print(f"\n[yellow]{provider.long_name(self).ljust(120, '-')}")
             self.logger.info('Running report provider: %s', provider.name())
@@ -328,41 +408,91 @@ class CowReportController(CowReportControllerBase):
                 self.logger.info('Skipping report provider: %s, no reports selected from provider.', provider.long_name(self))
                 continue
 
-            #create each provider
-            p = provider(self.appConfig)
+            providers.append(provider)
+
+        concurrency = self.appConfig.internals['internals'].get('concurrency', {})
+        max_workers = int(concurrency.get('max_provider_workers', 4))
 
+        from ..report_providers.report_providers import ReportProviderBase
+        ReportProviderBase.reset_run_state()
+
+        s = datetime.now()
+        if str(concurrency.get('concurrent_providers', False)).lower() in ('true', 'yes', '1', 't', 'y') and len(providers) > 1 and max_workers > 1:
+            results = self.run_providers_concurrently(providers, max_workers)
+        else:
+            results = [self.run_provider(provider) for provider in providers]
+        e = datetime.now()
+
+        # join the results in provider order before output generation
+        for p, running_time in results:
             self.running_report_providers.append(p)
 
-            #run each providers authentication logic
-            s = datetime.now()
-            p.auth()
-            e = datetime.now()
-            self.logger.info('Running auth() for provider %s: finished in %s', p.name(), e - s)
+        providers_time = sum((running_time for _, running_time in results), timedelta())
+        self.logger.info('Running %s providers: finished in %s (sum of provider times %s)', len(results), e - s, providers_time)
 
-            #run each providers setup logic
-            s = datetime.now()
-            p.setup(run_validation=True)
-            e = datetime.now()
-            self.logger.info('Running setup() for provider %s: finished in %s', p.name(), e - s)
+    def run_providers_concurrently(self, providers, max_workers) -> list:
+        """
+        Run the pipeline of each provider on a bounded thread pool.
 
-            if not p.enrollment_status:
-                self.logger.info('Skipping report provider: %s, not enrolled.', p.name())
-                continue
+        :param providers: provider classes to run
+        :param max_workers: maximum number of providers running at the same time
+        :return: list of (provider object, running time), in the order of providers
+        """
+        if self.appConfig.mode == 'cli':
+            self.appConfig.console.print(f'[green]Running [yellow]{len(providers)} [green]providers concurrently ([yellow]{max_workers} [green]workers)...')
 
-            #run mandatory reports required for pptx generation. (PowerPoint reports)
-            self.appConfig.console.print(f'\n[green]Running [yellow]PowerPoint reports [green]for [yellow]{p.name()} [green]provider...')
-            p.mandatory_reports(type='base')
-            
-            #run each providers query logic
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='provider') as executor:
+            futures = [executor.submit(self.run_provider, provider, True) for provider in providers]
 
-            if self.appConfig.mode == 'cli':
-                self.appConfig.console.print(f'[green]Running reports syncronously for [yellow]{p.name()} [green]provider...\n')
+            return [future.result() for future in futures]
 
-            s = datetime.now()
-            # execute run() function defined in 
-            self.reports_in_progress[p.name()] = p.run(type='base', cow_execution_type=self.appConfig.cow_execution_type)
+    def run_provider(self, provider, concurrent=False) -> tuple:
+        """
+        Run the auth(), setup(), mandatory reports and run() pipeline of a provider.
 
+        :param provider: provider class
+        :param concurrent: True when the provider runs alongside the other providers
+        :return: tuple of (provider object, running time)
+        """
+        provider_start = datetime.now()
+
+        #create each provider
+        p = provider(self.appConfig)
+
+        #run each providers authentication logic
+        s = datetime.now()
+        p.auth()
+        e = datetime.now()
+        self.logger.info('Running auth() for provider %s: finished in %s', p.name(), e - s)
+
+        #run each providers setup logic
+        s = datetime.now()
+        p.setup(run_validation=True)
+        e = datetime.now()
+        self.logger.info('Running setup() for provider %s: finished in %s', p.name(), e - s)
+
+        if not p.enrollment_status:
+            self.logger.info('Skipping report provider: %s, not enrolled.', p.name())
+            return p, datetime.now() - provider_start
+
+        #run mandatory reports required for pptx generation. (PowerPoint reports)
+        self.appConfig.console.print(f'\n[green]Running [yellow]PowerPoint reports [green]for [yellow]{p.name()} [green]provider...')
+        p.mandatory_reports(type='base')
+        
+        #run each providers query logic
 
-            e = datetime.now()
-            self.logger.info('Running run() for provider %s: finished in %s', p.name(), e - s)
+        if self.appConfig.mode == 'cli':
+            execution_mode = 'asynchronously' if self.appConfig.cow_execution_type == 'async' else 'synchronously'
+            if concurrent:
+                execution_mode += ', concurrently with the other providers,'
+            self.appConfig.console.print(f'[green]Running reports {execution_mode} for [yellow]{p.name()} [green]provider...\n')
+
+        s = datetime.now()
+        # execute run() function defined in 
+        self.reports_in_progress[p.name()] = p.run(type='base', cow_execution_type=self.appConfig.cow_execution_type)
+
+
+        e = datetime.now()
+        self.logger.info('Running run() for provider %s: finished in %s', p.name(), e - s)
 
+        return p, datetime.now() - provider_start
@@ -19,7 +19,9 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "./vendored"))
 import boto3
 import datetime
+import json
 import logging
+import threading
 #For date
 from dateutil.relativedelta import relativedelta
 from ...report_providers.report_providers import ReportProviderBase
@@ -58,6 +60,10 @@ class CeReports(ReportProviderBase):
         self.sixmonth = (datetime.today() - relativedelta(months=+6)).replace(day=1) #1st day of month 6 months ago, so RI util has savings values
         self.accounts = {}
 
+        # get_cost_and_usage requests shared between reports, see prepare_reports()
+        self.planned_requests = {}
+        self.report_request_keys = {}
+
         self.logger = logging.getLogger(__name__)
         self.report_path = self.appConfig.internals['internals']['reports']['reports_directory']
         self.report_directory = Path()
@@ -151,32 +157,22 @@ class CeReports(ReportProviderBase):
         def run_query(report_object):
             try:
 
-                CeQuery = report_object.sql()
-
-                Name=CeQuery.get("Name", 'Default')
-                GroupBy=CeQuery.get("GroupBy", [])
-                Style=CeQuery.get("Style", 'Total')
-                NoCredits=CeQuery.get("NoCredits", True)
-                CreditsOnly=CeQuery.get("CreditsOnly", False)
-                RefundOnly=CeQuery.get("RefundOnly", False)
-                UpfrontOnly=CeQuery.get("UpfrontOnly", False)
-                IncSupport=CeQuery.get("IncSupport", False)
-                IncTax=CeQuery.get("IncTax", True)
-                RIreport=CeQuery.get("RIreport", False)
+                q = self.get_report_query(report_object)
                 Savings=False
                 PaymentOption='PARTIAL_UPFRONT'
 
                 if report_object.domain_name() == "RI":
-                    report_object.addRiReport( Name, Savings, PaymentOption)
+                    report_object.addRiReport( q['Name'], Savings, PaymentOption)
                 else:
-                    report_object.addReport( Name, GroupBy, Style, NoCredits, CreditsOnly, RefundOnly, UpfrontOnly, IncSupport, IncTax)
+                    report_object.addReport( q['Name'], q['GroupBy'], q['Style'], q['NoCredits'], q['CreditsOnly'], q['RefundOnly'], q['UpfrontOnly'], q['IncSupport'], q['IncTax'],
+                        results=self.get_planned_results(report_object))
 
                 self.logger.info(f'Running CostExplorer query: {report_name} ')
             except Exception as e:
                 self.logger.error('Exception occured when during execution of CE query')
                 self.logger.exception(e)
                 self.appConfig.console.print(f'[red]Exception occured when during execution of CE query >>> {e}')
-                sys.exit()
+                raise
 
         report_name = report_object.name()
         
@@ -189,6 +185,66 @@ class CeReports(ReportProviderBase):
         else:
             run_query(report_object)
 
+    def get_report_query(self, report_object) -> dict:
+        '''options of a CE report from its sql() definition'''
+        CeQuery = report_object.sql()
+
+        return {
+            'Name': CeQuery.get("Name", 'Default'),
+            'GroupBy': CeQuery.get("GroupBy", []),
+            'Style': CeQuery.get("Style", 'Total'),
+            'NoCredits': CeQuery.get("NoCredits", True),
+            'CreditsOnly': CeQuery.get("CreditsOnly", False),
+            'RefundOnly': CeQuery.get("RefundOnly", False),
+            'UpfrontOnly': CeQuery.get("UpfrontOnly", False),
+            'IncSupport': CeQuery.get("IncSupport", False),
+            'IncTax': CeQuery.get("IncTax", True)}
+
+    def prepare_reports(self, report_objects) -> None:
+        '''
+        plan the get_cost_and_usage requests of the run
+
+        Reports such as Accounts and AccountsChange only differ in post-processing: their
+        requests are identical, so each unique request is sent once and its results are
+        shared by all the reports that need it.
+        '''
+        self.planned_requests = {}
+        self.report_request_keys = {}
+
+        for report_object in report_objects:
+            if report_object.domain_name() == "RI":
+                continue
+
+            try:
+                q = self.get_report_query(report_object)
+                request = report_object.get_cost_and_usage_request(q['GroupBy'], q['NoCredits'], q['CreditsOnly'], q['RefundOnly'], q['UpfrontOnly'], q['IncSupport'], q['IncTax'])
+            except Exception as e:
+                self.logger.warning(f'CostExplorer planner: {report_object.name()} requests its own data - {e}')
+                continue
+
+            key = json.dumps(request, sort_keys=True)
+            planned = self.planned_requests.setdefault(key, {'request': request, 'consumers': [], 'results': None, 'lock': threading.Lock()})
+            planned['consumers'].append(report_object.name())
+            self.report_request_keys[report_object.name()] = key
+
+        saved = len(self.report_request_keys) - len(self.planned_requests)
+        self.logger.info(f'CostExplorer planner: {len(self.report_request_keys)} reports, {len(self.planned_requests)} unique get_cost_and_usage requests, {saved} requests saved')
+
+    def get_planned_results(self, report_object):
+        '''results of the planned request of report_object, fetched by its first consumer; None when not planned'''
+        key = self.report_request_keys.get(report_object.name())
+        if key is None:
+            return None
+
+        planned = self.planned_requests[key]
+        with planned['lock']:
+            if planned['results'] is None:
+                planned['results'] = report_object.get_cost_and_usage_results(planned['request'])
+            else:
+                self.logger.info(f'CostExplorer planner: {report_object.name()} reuses the results of {planned["consumers"][0]}')
+
+        return planned['results']
+
     def fetch_data(self, 
         reports_in_progress:list, 
         additional_input_data=None, 
@@ -213,7 +269,7 @@ class CeReports(ReportProviderBase):
 
             report_name = q.name()
 
-            if self.appConfig.cow_execution_type == 'sync':
+            if self.appConfig.cow_execution_type in ('sync', 'async'):
 
                 self.logger.info(f'Getting status of report {report_name}')
 
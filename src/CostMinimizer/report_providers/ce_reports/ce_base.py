@@ -20,6 +20,7 @@ from dateutil.relativedelta import relativedelta
 from abc import ABC
 from pyathena.pandas.result_set import AthenaPandasResultSet
 from ...report_providers.report_providers import ReportBase
+from ...service_helpers.cost_explorer import ClosedMonthCache, CostAllocationTagCatalog
 from rich.progress import track
 
 class CeBase(ReportBase, ABC):
@@ -34,7 +35,7 @@ class CeBase(ReportBase, ABC):
 
         #Array of reports ready to be output to Excel.
         try:
-            self.client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('ce', region_name=self.appConfig.default_selected_region)
+            self.client = self.appConfig.get_client('ce', region_name=self.appConfig.default_selected_region)
         except Exception as e:
             self.appConfig.console.print(f'\n[red]ERROR: Unable to establish boto session for CostExplorer. \n{e}[/red]')
             sys.exit()
@@ -272,24 +273,9 @@ class CeBase(ReportBase, ABC):
     def addLinkedReports(self, Name='RI_{}',PaymentOption='PARTIAL_UPFRONT'):
         pass
             
-    def addReport(self, Name="Default",GroupBy=[{"Type": "DIMENSION","Key": "SERVICE"},], 
-    Style='Total', NoCredits=True, CreditsOnly=False, RefundOnly=False, UpfrontOnly=False, IncSupport=False, IncTax=True):
-        
-        #GLOBALS
-        SES_REGION = self.appConfig.config['ses_region']
-        if not SES_REGION:
-            SES_REGION="us-east-1"
-        ACCOUNT_LABEL = os.environ.get('ACCOUNT_LABEL')
-        if not ACCOUNT_LABEL:
-            ACCOUNT_LABEL = 'Email'
-            
-        CURRENT_MONTH = self.appConfig.config['current_month']
-        if CURRENT_MONTH == "True":
-            CURRENT_MONTH = True
-        else:
-            CURRENT_MONTH = False
-
-        LAST_MONTH_ONLY = self.appConfig.config['last_month_only']
+    def get_cost_and_usage_request(self, GroupBy=[{"Type": "DIMENSION","Key": "SERVICE"},], 
+    NoCredits=True, CreditsOnly=False, RefundOnly=False, UpfrontOnly=False, IncSupport=False, IncTax=True) -> dict:
+        '''return the get_cost_and_usage arguments of a report, reports with the same arguments share one response'''
 
         #Default exclude support, as for Enterprise Support
         #as support billing is finalised later in month so skews trends    
@@ -309,22 +295,19 @@ class CeBase(ReportBase, ABC):
         TAG_VALUE_FILTER = self.appConfig.config['costexplorer_tags_value_filter'] or '*'
         TAG_KEY = self.appConfig.config['costexplorer_tags']  
 
-        self.chart_type_of_excel = 'chart' #other option table
-        
-        results = []
-        if not NoCredits:
-            response = self.client.get_cost_and_usage(
-                TimePeriod={
-                    'Start': self.start.isoformat(),
-                    'End': self.end.isoformat()
-                },
-                Granularity='MONTHLY',
-                Metrics=[
-                    'UnblendedCost',
-                ],
-                GroupBy=GroupBy
-            )
-        else:
+        request = {
+            'TimePeriod': {
+                'Start': self.start.isoformat(),
+                'End': self.end.isoformat()
+            },
+            'Granularity': 'MONTHLY',
+            'Metrics': [
+                'UnblendedCost',
+            ],
+            'GroupBy': GroupBy
+        }
+
+        if NoCredits:
             Filter = {"And": []}
 
             Dimensions={"Not": {"Dimensions": {"Key": "RECORD_TYPE","Values": ["Credit", "Refund", "Upfront", "Support"]}}}
@@ -341,59 +324,52 @@ class CeBase(ReportBase, ABC):
 
             tagValues = None
             if TAG_KEY:
-                tagValues = self.client.get_tags(
-                    SearchString=TAG_VALUE_FILTER,
-                    TimePeriod = {
-                        'Start': self.start.isoformat(),
-                        'End': datetime.date.today().isoformat()
-                    },
-                    TagKey=TAG_KEY
-                )
+                tagValues = CostAllocationTagCatalog(self.client).get_tag_values(TAG_KEY, TAG_VALUE_FILTER, self.start.isoformat(), datetime.date.today().isoformat())
 
-            if tagValues:
+            if tagValues is not None:
                 Filter["And"].append(Dimensions)
-                if len(tagValues["Tags"]) > 0:
-                    Tags = {"Tags": {"Key": TAG_KEY, "Values": tagValues["Tags"]}}
+                if len(tagValues) > 0:
+                    Tags = {"Tags": {"Key": TAG_KEY, "Values": tagValues}}
                     Filter["And"].append(Tags)
             else:
                 Filter = Dimensions.copy()
 
-            response = self.client.get_cost_and_usage(
-                TimePeriod={
-                    'Start': self.start.isoformat(),
-                    'End': self.end.isoformat()
-                },
-                Granularity='MONTHLY',
-                Metrics=[
-                    'UnblendedCost',
-                ],
-                GroupBy=GroupBy,
-                Filter=Filter
-            )
+            request['Filter'] = Filter
+
+        return request
+
+    def get_cost_and_usage_results(self, request) -> list:
+        '''return the ResultsByTime of all pages of a get_cost_and_usage request'''
+        ce_config = self.appConfig.internals['internals'].get('ce_reports', {})
+        if str(ce_config.get('closed_month_cache', True)).lower() in ('true', 'yes', '1', 't', 'y'):
+            return ClosedMonthCache().get_results(self.client, request)
+
+        results = []
+        kwargs = dict(request)
 
-        if response:
+        while True:
+            response = self.client.get_cost_and_usage(**kwargs)
             results.extend(response['ResultsByTime'])
-     
-            while 'nextToken' in response:
-                nextToken = response['nextToken']
-                response = self.client.get_cost_and_usage(
-                    TimePeriod={
-                        'Start': self.start.isoformat(),
-                        'End': self.end.isoformat()
-                    },
-                    Granularity='MONTHLY',
-                    Metrics=[
-                        'UnblendedCost',
-                    ],
-                    GroupBy=GroupBy,
-                    NextPageToken=nextToken
-                )
-     
-                results.extend(response['ResultsByTime'])
-                if 'nextToken' in response:
-                    nextToken = response['nextToken']
-                else:
-                    nextToken = False
+
+            if not response.get('NextPageToken'):
+                break
+            kwargs['NextPageToken'] = response['NextPageToken']
+
+        return results
+
+    def addReport(self, Name="Default",GroupBy=[{"Type": "DIMENSION","Key": "SERVICE"},], 
+    Style='Total', NoCredits=True, CreditsOnly=False, RefundOnly=False, UpfrontOnly=False, IncSupport=False, IncTax=True, results=None):
+        '''results = ResultsByTime already fetched for this report by the provider, requested here when None'''
+        
+        ACCOUNT_LABEL = os.environ.get('ACCOUNT_LABEL')
+        if not ACCOUNT_LABEL:
+            ACCOUNT_LABEL = 'Email'
+
+        self.chart_type_of_excel = 'chart' #other option table
+        
+        if results is None:
+            results = self.get_cost_and_usage_results(self.get_cost_and_usage_request(GroupBy, NoCredits, CreditsOnly, RefundOnly, UpfrontOnly, IncSupport, IncTax))
+
         rows = []
         sort = ''
         display_msg = f'[green]Running CostExplorer Report: {Name} / {self.appConfig.selected_region}[/green]'
@@ -95,7 +95,11 @@ class CoReports(ReportProviderBase):
     def setup(self, run_validation=False):
         '''setup instrcutions for cur report type'''
         try:
-            self.client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('compute-optimizer', region_name=self.appConfig.selected_regions)
+            # the pooled client is keyed on its region, a region list selected in the menu uses its first region
+            region = self.appConfig.selected_regions
+            if isinstance(region, list):
+                region = region[0] if region else None
+            self.client = self.appConfig.get_client('compute-optimizer', region_name=region)
         except Exception as e:
             self.appConfig.console.print(f'\n[red]Unable to establish boto session for Compute-Optimizer. \n{e}[/red]')
             self.logger.error('Unable to establish boto session for Compute-Optimizer.')
@@ -173,7 +177,7 @@ class CoReports(ReportProviderBase):
                 self.logger.error('Exception occured when during execution of CO query')
                 self.logger.exception(e)
                 self.appConfig.console.print(f'\n[red]Exception occured when during execution of CO query >>> {e}')
-                sys.exit()
+                raise
 
 
         report_name = report_object.name()
@@ -215,7 +219,7 @@ class CoReports(ReportProviderBase):
 
             report_name = q.name()
 
-            if self.appConfig.cow_execution_type == 'sync':
+            if self.appConfig.cow_execution_type in ('sync', 'async'):
 
                 self.logger.info(f'Getting status of report {report_name}')
 
@@ -7,6 +7,7 @@ __license__ = "Apache-2.0"
 from ....constants import __tooling_name__
 
 from ..co_base import CoBase
+from ....service_helpers.compute_optimizer import ComputeOptimizerQuery
 
 import pandas as pd
 
@@ -158,13 +159,13 @@ class CoGraviton(CoBase):
             }
 
         try:
-            response = client.get_ec2_instance_recommendations(recommendationPreferences=recommendationPreferences)
+            recommendations = ComputeOptimizerQuery(client).get_ec2_instance_recommendations(recommendationPreferences)
         except:
             raise
         
         results_list = []
-        if response and 'instanceRecommendations' in response:
-            for recommendation in response['instanceRecommendations']:
+        if recommendations is not None:
+            for recommendation in recommendations:
                 account = recommendation['accountId']
                 instance_arn = recommendation['instanceArn']
                 instance_name = recommendation['instanceName']
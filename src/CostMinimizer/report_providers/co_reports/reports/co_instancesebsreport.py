@@ -7,6 +7,7 @@ __license__ = "Apache-2.0"
 from ....constants import __tooling_name__
 
 from ....report_providers.co_reports.co_base import CoBase
+from ....service_helpers.compute_optimizer import ComputeOptimizerQuery
 
 import pandas as pd
 
@@ -144,13 +145,13 @@ class CoInstancesebsreport(CoBase):
         ttype = 'chart' #other option table
 
         try:
-            response = client.get_ebs_volume_recommendations()
+            recommendations = ComputeOptimizerQuery(client).get_ebs_volume_recommendations()
         except:
             raise
         
         results_list = []
-        if response and 'volumeRecommendations' in response:
-            for recommendation in response['volumeRecommendations']:
+        if recommendations is not None:
+            for recommendation in recommendations:
                 account = recommendation['accountId']
                 volume_arn = recommendation['volumeArn']
                 current_volume_type = recommendation['currentConfiguration']['volumeType']
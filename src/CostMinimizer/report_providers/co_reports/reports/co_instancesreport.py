@@ -7,6 +7,7 @@ __license__ = "Apache-2.0"
 from ....constants import __tooling_name__
 
 from ..co_base import CoBase
+from ....service_helpers.compute_optimizer import ComputeOptimizerQuery
 
 import boto3
 import pandas as pd
@@ -145,10 +146,7 @@ class CoInstancesreport(CoBase):
         type = 'chart' #other option table
         results = []
 
-        response = client.get_ec2_instance_recommendations()
-
-        #print(response)
-        recommendation_list = response['instanceRecommendations']
+        recommendation_list = ComputeOptimizerQuery(client).get_ec2_instance_recommendations()
         data_list = []
         
         # Create EC2 client to get instance details
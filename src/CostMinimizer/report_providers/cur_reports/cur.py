@@ -8,6 +8,7 @@ from ...constants import __tooling_name__
 
 import sys, os
 import logging
+import threading
 import datetime as time
 from rich.progress import track
 import pandas as pd
@@ -64,9 +65,10 @@ class CurReports(ReportProviderBase):
         self.list_ta_checks = []
         self.minDate = ''
         self.maxDate = ''
+        self._date_range_lock = threading.Lock()
 
         try:
-            self.client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('athena', region_name=self.cur_region)
+            self.client = self.appConfig.get_client('athena', region_name=self.cur_region)
         except Exception as e:
             self.appConfig.console.print(f'\n[red]Unable to establish boto session for Support. \n{e}[/red]')
             sys.exit()
@@ -170,18 +172,8 @@ class CurReports(ReportProviderBase):
                 account_str = "line_item_usage_account_id LIKE '%' AND " #+self.appConfig.config['aws_cow_account']
                 region_str = "product_region='"+self.appConfig.selected_regions[0]+"' AND "
 
-                if self.minDate == '' or self.maxDate == '':
-                    # Get the months_back parameter if provided
-                    months_back = 0
-                    if hasattr(self.appConfig.arguments_parsed, 'cur_month_date_minus_x'):
-                        months_back = self.appConfig.arguments_parsed.cur_month_date_minus_x
-                    self.minDate, self.maxDate = report_object.GetMinAndMaxDateFromCurTable(self.client, self.fqdb_name, months_back=months_back)
-                # check if self.minDate or self.maxDate are empty or not a valid Date
-                if self.maxDate == 'N/A':
-                    self.maxDate = "NOW()"
-                if self.minDate == 'N/A':
-                    self.minDate = "DATE_ADD(CURRENT_DATE, INTERVAL -1 MONTH)"
-                CurQuery = report_object.sql( self.fqdb_name, payer_str, account_str, region_str, self.maxDate, l_cur_version, l_cur_resource_id_exists)
+                minDate, maxDate = self.get_cur_date_range(report_object)
+                CurQuery = report_object.sql( self.fqdb_name, payer_str, account_str, region_str, maxDate, l_cur_version, l_cur_resource_id_exists)
 
                 v_SQL=CurQuery.get("query", "")
 
@@ -197,7 +189,7 @@ class CurReports(ReportProviderBase):
                 self.logger.error('Exception occured when during execution of CUR query')
                 self.logger.exception(e)
                 self.appConfig.console.print(f'\n[red underline]ERROR: Exception occured when during execution of CUR query >>> {e}')
-                sys.exit()
+                raise
 
         report_name = report_object.name()
         
@@ -210,6 +202,24 @@ class CurReports(ReportProviderBase):
         else:
             run_query( report_object, display, report_name)
 
+    def get_cur_date_range(self, report_object) -> tuple:
+        '''return (minDate, maxDate) of the CUR table, read once per provider run and shared by its concurrent reports'''
+        with self._date_range_lock:
+            if self.minDate == '' or self.maxDate == '':
+                # Get the months_back parameter if provided
+                months_back = 0
+                if hasattr(self.appConfig.arguments_parsed, 'cur_month_date_minus_x'):
+                    months_back = self.appConfig.arguments_parsed.cur_month_date_minus_x
+                minDate, maxDate = report_object.GetMinAndMaxDateFromCurTable(self.client, self.fqdb_name, months_back=months_back)
+                # check if minDate or maxDate are empty or not a valid Date
+                if maxDate == 'N/A':
+                    maxDate = "NOW()"
+                if minDate == 'N/A':
+                    minDate = "DATE_ADD(CURRENT_DATE, INTERVAL -1 MONTH)"
+                self.minDate, self.maxDate = minDate, maxDate
+
+            return self.minDate, self.maxDate
+
     def fetch_data(self, 
         reports_in_progress:list, 
         additional_input_data=None, 
@@ -233,7 +243,7 @@ class CurReports(ReportProviderBase):
 
             report_name = q.name()
 
-            if self.appConfig.cow_execution_type == 'sync':
+            if self.appConfig.cow_execution_type in ('sync', 'async'):
 
                 self.logger.info(f'Getting status of report {report_name}')
 
@@ -304,6 +314,15 @@ class CurReports(ReportProviderBase):
                         self.succeeded_queries.append(q)
                         self.completed_reports.append(q)
 
+    def cancel_report(self, report_object) -> None:
+        """Stop the Athena query of a timed out async report"""
+        if report_object.query_id:
+            try:
+                self.client.stop_query_execution(QueryExecutionId=report_object.query_id)
+                self.logger.info(f'{report_object.name()}: Athena query {report_object.query_id} stopped')
+            except Exception as e:
+                self.logger.warning(f'{report_object.name()}: Unable to stop Athena query {report_object.query_id}: {e}')
+
     def _make_cursor(self):
         """Create an Athena cursor"""
         return self.client
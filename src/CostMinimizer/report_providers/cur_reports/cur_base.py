@@ -7,6 +7,7 @@ __license__ = "Apache-2.0"
 from ...constants import __tooling_name__, __estimated_savings_caption__
 
 import os
+import re
 import sys
 import logging
 import pandas as pd
@@ -14,6 +15,7 @@ import json
 from typing import Optional, Dict, Any
 import sqlparse
 import datetime as time
+from time import sleep
 
 # Required to load modules from vendored su6bfolder (for clean development env)
 sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "./vendored"))
@@ -22,7 +24,8 @@ from abc import ABC
 from CostMinimizer.report_providers.report_providers import ReportBase
 from pyathena.pandas.result_set import AthenaPandasResultSet
 
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, BotoCoreError
+from concurrent.futures import ThreadPoolExecutor
 
 from ...config.config import Config
 
@@ -145,15 +148,30 @@ class RegionConversion():
 
 #####################################################################################################################################""
 class AWSSnapshots(RegionConversion):
+    '''
+    snapshot metadata engine: snapshot ids are grouped by region, described in batches of
+    DESCRIBE_BATCH_SIZE and their blocks are counted concurrently. Completed snapshots are
+    immutable, so their metadata is kept in the cow_snapshotinfo table for the next runs.
+
+    A batch that keeps failing (throttling, endpoint errors) is retried DESCRIBE_ATTEMPTS times
+    and then skipped, the other batches and regions are still described.
+    '''
+
+    DESCRIBE_BATCH_SIZE = 1000
+    DESCRIBE_ATTEMPTS = 3
+    RETRY_DELAY = 1.0
+    BLOCK_SIZE_BYTES = 512 * 1024
+
     def __init__(self, app):
         self.appConfig = Config()
         # Price List API is only available in us-east-1 or ap-south-1
-        self.ebs_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('ebs', region_name=self.appConfig.default_selected_region)
-        self.ec2_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('ec2', region_name=self.appConfig.default_selected_region)
+        self.ebs_client = self.appConfig.get_client('ebs', region_name=self.appConfig.default_selected_region)
+        self.ec2_client = self.appConfig.get_client('ec2', region_name=self.appConfig.default_selected_region)
 
         # Cache for pricing data to avoid repeated API calls
         self._price_cache = {}
         self.database = app.database
+        self.max_workers = max(1, int(self.appConfig.internals['internals'].get('ebs_snapshots', {}).get('max_workers', 8)))
 
         self.logger = logging.getLogger(__name__)
 
@@ -166,73 +184,132 @@ class AWSSnapshots(RegionConversion):
         Returns:
             dict: Dictionary containing size information
         """
-        try:
+        return self.get_snapshots_info([(snapshot_id, p_region)]).get(snapshot_id)
 
-            # define region to p_region for ec2_client
-            self.ec2_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('ec2', region_name=self.get_region_code(p_region))
-            self.ebs_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('ebs', region_name=self.get_region_code(p_region))
+    def get_snapshots_info(self, snapshots) -> dict:
+        """
+        Get the size information of many EBS snapshots
 
-            # Get basic snapshot information
-            response = self.ec2_client.describe_snapshots( SnapshotIds=[snapshot_id])
-            
-            if not response['Snapshots']:
-                return None
-                
-            snapshot = response['Snapshots'][0]
-            volume_size = snapshot['VolumeSize']  # Size in GiB
-            
-            # Initialize size information dictionary
-            size_info = {
-                'snapshot_id': snapshot_id,
-                'volume_size_gib': volume_size,
-                'volume_size_bytes': volume_size * 1024 * 1024 * 1024,  # Convert GiB to bytes
-                'start_time': snapshot['StartTime'],
-                'description': snapshot.get('Description', ''),
-                'state': snapshot['State']
-            }
-            
-            # Get block information using EBS direct APIs
-            try:
-                # List all blocks in the snapshot
-                block_count = 0
-                next_token = None
-                
-                while True:
-                    if next_token:
-                        blocks_response = self.ebs_client.list_snapshot_blocks(
-                            SnapshotId=snapshot_id,
-                            MaxResults=1000,
-                            NextToken=next_token
-                        )
-                    else:
-                        blocks_response = self.ebs_client.list_snapshot_blocks(
-                            SnapshotId=snapshot_id,
-                            MaxResults=1000
-                        )
-                    
-                    # Each block is 512 KiB
-                    block_count += len(blocks_response.get('Blocks', []))
-                    
-                    next_token = blocks_response.get('NextToken')
-                    if not next_token:
+        Args:
+            snapshots (list): (snapshot id, region long name) tuples
+        Returns:
+            dict: snapshot id -> size information dictionary, unknown snapshots are missing
+        """
+        regions = {}
+        for snapshot_id, p_region in snapshots:
+            if snapshot_id:
+                regions.setdefault(self.get_region_code(p_region), set()).add(snapshot_id)
+
+        all_ids = set().union(*regions.values()) if regions else set()
+        result = {snapshot_id: self._size_info(row) for snapshot_id, row in self.database.get_snapshot_info(all_ids).items()}
+        self.logger.info(f'Snapshot metadata: {len(result)} cached, {len(all_ids) - len(result)} to describe')
+
+        rows = []
+        for region, snapshot_ids in regions.items():
+            missing = sorted(snapshot_ids - result.keys())
+            if not missing:
+                continue
+
+            described = self.describe_snapshots(region, missing)
+            if not described:
+                continue
+
+            ebs_client = self.appConfig.get_client('ebs', region_name=region)
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='snapshot-blocks') as executor:
+                block_counts = executor.map(lambda snapshot: self.count_snapshot_blocks(ebs_client, snapshot['SnapshotId']), described)
+
+                for snapshot, block_count in zip(described, block_counts):
+                    row = {
+                        'snapshot_id': snapshot['SnapshotId'],
+                        'region': region,
+                        'volume_size_gib': snapshot['VolumeSize'],
+                        'start_time': snapshot['StartTime'].isoformat(),
+                        'description': snapshot.get('Description', ''),
+                        'state': snapshot['State'],
+                        'block_count': block_count}
+                    result[row['snapshot_id']] = self._size_info(row)
+
+                    if row['state'] == 'completed' and block_count is not None:
+                        rows.append(row)
+
+        self.database.upsert_snapshot_info(rows)
+
+        return result
+
+    def describe_snapshots(self, region, snapshot_ids) -> list:
+        '''
+        describe snapshot ids in batches, ids that no longer exist are dropped from the batch and logged.
+        Other errors are retried with a backoff, a batch still failing after DESCRIBE_ATTEMPTS is skipped.
+        '''
+        ec2_client = self.appConfig.get_client('ec2', region_name=region)
+        snapshots = []
+
+        for i in range(0, len(snapshot_ids), self.DESCRIBE_BATCH_SIZE):
+            batch = snapshot_ids[i:i + self.DESCRIBE_BATCH_SIZE]
+            attempt = 1
+
+            while batch:
+                try:
+                    snapshots.extend(ec2_client.describe_snapshots(SnapshotIds=batch)['Snapshots'])
+                    break
+                except (ClientError, BotoCoreError) as e:
+                    # one deleted snapshot fails the whole batch: retry without the ids reported as not found
+                    not_found = set(re.findall(r'snap-[0-9a-f]+', str(e))) if isinstance(e, ClientError) and e.response['Error']['Code'] == 'InvalidSnapshot.NotFound' else set()
+                    if not_found & set(batch):
+                        self.logger.warning(f"Snapshots not found in {region}: {sorted(not_found)}")
+                        batch = [snapshot_id for snapshot_id in batch if snapshot_id not in not_found]
+                        continue
+
+                    if attempt >= self.DESCRIBE_ATTEMPTS:
+                        self.logger.warning(f"Error getting snapshot information in {region}, skipping {len(batch)} snapshots: {str(e)}")
                         break
-                
-                # Calculate actual data size (each block is 512 KiB)
-                actual_size_bytes = block_count * 512 * 1024  # Convert blocks to bytes
-                size_info['actual_data_size_bytes'] = actual_size_bytes
-                size_info['actual_data_size_gib'] = actual_size_bytes / (1024 * 1024 * 1024)
-                size_info['block_count'] = block_count
-                
-            except ClientError as e:
-                # Handle case where EBS direct APIs might not be available
-                self.logger.warning(f"Could not get detailed block information: {str(e)}")
-                
-            return size_info
-            
-        except ClientError as e:
-            self.logger.warning(f"Error getting snapshot information: {str(e)}")
+                    self.logger.warning(f"Error getting snapshot information in {region}, attempt {attempt}: {str(e)}")
+                    sleep(self.RETRY_DELAY * 2 ** (attempt - 1))
+                    attempt += 1
+
+        return snapshots
+
+    def count_snapshot_blocks(self, ebs_client, snapshot_id):
+        '''number of written blocks of a snapshot from the EBS direct APIs, None when they are not available'''
+        block_count = 0
+        kwargs = {'SnapshotId': snapshot_id, 'MaxResults': 10000}
+
+        try:
+            while True:
+                blocks_response = ebs_client.list_snapshot_blocks(**kwargs)
+                block_count += len(blocks_response.get('Blocks', []))
+
+                next_token = blocks_response.get('NextToken')
+                if not next_token:
+                    break
+                kwargs['NextToken'] = next_token
+        except (ClientError, BotoCoreError) as e:
+            # Handle case where EBS direct APIs might not be available or reachable
+            self.logger.warning(f"Could not get detailed block information: {str(e)}")
             return None
 
+        return block_count
+
+    def _size_info(self, row) -> dict:
+        '''size information dictionary of a cow_snapshotinfo row'''
+        size_info = {
+            'snapshot_id': row['snapshot_id'],
+            'volume_size_gib': row['volume_size_gib'],
+            'volume_size_bytes': row['volume_size_gib'] * 1024 * 1024 * 1024,  # Convert GiB to bytes
+            'start_time': time.datetime.fromisoformat(row['start_time']),
+            'description': row['description'],
+            'state': row['state']
+        }
+
+        if row['block_count'] is not None:
+            # Calculate actual data size (each block is 512 KiB)
+            actual_size_bytes = row['block_count'] * self.BLOCK_SIZE_BYTES
+            size_info['actual_data_size_bytes'] = actual_size_bytes
+            size_info['actual_data_size_gib'] = actual_size_bytes / (1024 * 1024 * 1024)
+            size_info['block_count'] = row['block_count']
+
+        return size_info
+
     def print_snapshot_size_info(self, size_info):
         """
         Print formatted snapshot size information
@@ -261,8 +338,8 @@ class AWSPricing():
     def __init__(self, app):
         self.appConfig = Config()
         # Price List API is only available in us-east-1 or ap-south-1
-        self.pricing_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('pricing', region_name=self.appConfig.default_selected_region)
-        self.ec2_client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('ec2', region_name=self.appConfig.default_selected_region)
+        self.pricing_client = self.appConfig.get_client('pricing', region_name=self.appConfig.default_selected_region)
+        self.ec2_client = self.appConfig.get_client('ec2', region_name=self.appConfig.default_selected_region)
         
         # Cache for pricing data to avoid repeated API calls
         self._price_cache = {}
@@ -300,6 +377,10 @@ class AWSPricing():
         else:
             return None
 
+    # get savings plan rates loaded by SavingsPlansRatesLoader into table cow_savingsplanrates, as a dataframe
+    def get_savings_plan_rates_from_db(self, instance_types, region, plan_type='Compute', payment_option=None):
+        return self.database.get_savings_plan_rates_from_db( region=region, product_type='EC2', plan_type=plan_type, payment_option=payment_option, instance_types=instance_types)
+
     # get instance price using API AWS where the parameter are instance_type, region, operating_system, tenancy
     def get_instance_price(self, 
                           instance_type: str,
@@ -783,7 +864,7 @@ class InstanceConversionToGraviton(RegionConversion):
 
     def get_instance_details(self, instance_type):
         """Get instance type specifications using describe_instance_types"""
-        ec2 = self.appConfig.auth_manager.aws_cow_account_boto_session.client('ec2', region_name=self.appConfig.default_selected_region)
+        ec2 = self.appConfig.get_client('ec2', region_name=self.appConfig.default_selected_region)
         
         try:
             response = ec2.describe_instance_types(InstanceTypes=[instance_type])
@@ -846,8 +927,8 @@ class InstanceConversionToGraviton(RegionConversion):
 
     def get_graviton_equivalents(self, instance_id, region, account_id):
         # Create clients
-        compute_optimizer = self.appConfig.auth_manager.aws_cow_account_boto_session.client('compute-optimizer', region_name=self.appConfig.default_selected_region)
-        ec2 = self.appConfig.auth_manager.aws_cow_account_boto_session.client('ec2', region_name=self.appConfig.default_selected_region)
+        compute_optimizer = self.appConfig.get_client('compute-optimizer', region_name=self.appConfig.default_selected_region)
+        ec2 = self.appConfig.get_client('ec2', region_name=self.appConfig.default_selected_region)
 
         try:
             # Get instance recommendations with Graviton preference
@@ -883,8 +964,8 @@ class InstanceConversionToGraviton(RegionConversion):
 
     def get_graviton_equivalents_from_db(self, instance_id, region, account_id):
         # Create clients
-        compute_optimizer = self.appConfig.auth_manager.aws_cow_account_boto_session.client('compute-optimizer', region_name=self.appConfig.default_selected_region)
-        ec2 = self.appConfig.auth_manager.aws_cow_account_boto_session.client('ec2', region_name=self.appConfig.default_selected_region)
+        compute_optimizer = self.appConfig.get_client('compute-optimizer', region_name=self.appConfig.default_selected_region)
+        ec2 = self.appConfig.get_client('ec2', region_name=self.appConfig.default_selected_region)
 
         try:
             # Get instance recommendations with Graviton preference
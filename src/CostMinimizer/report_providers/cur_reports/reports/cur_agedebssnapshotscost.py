@@ -152,6 +152,7 @@ class CurAgedebssnapshotscost(CurBase):
             l_msg = f"Athena Query failed with state: {e} - Verify tooling CUR configuration via --configure"
             self.appConfig.console.print("\n[red]"+l_msg)
             self.logger.error(l_msg)
+            self.set_fail_query(reason=l_msg)
             return
 
         data_list = []
@@ -163,13 +164,24 @@ class CurAgedebssnapshotscost(CurBase):
                 display_msg = f'[green]Running Cost & Usage Report: {report_name} / {self.appConfig.selected_regions}[/green]'
             else:
                 display_msg = ''
+
+            # describe all snapshots of the query at once, batched per region
+            snapshots = []
+            for resource in response[1:]:
+                try:
+                    snapshot_id = resource['Data'][0]['VarCharValue'].split('snapshot/')[1] if 'snapshot/' in resource['Data'][0]['VarCharValue'] else ''
+                    snapshots.append((snapshot_id, resource['Data'][1]['VarCharValue'] if 'VarCharValue' in resource['Data'][1] else ''))
+                except Exception:
+                    continue
+            snapshots_info = self.snapshots.get_snapshots_info(snapshots)
+
             for resource in track(response[1:], description=display_msg):
                 # try catch block to get the snapshot info using self.snapshot
                 try:
                     snapshot_id = resource['Data'][0]['VarCharValue'].split('snapshot/')[1] if 'snapshot/' in resource['Data'][0]['VarCharValue'] else ''
                     l_region = resource['Data'][1]['VarCharValue'] if 'VarCharValue' in resource['Data'][1] else ''
 
-                    snapshot_size_info = self.snapshots.get_snapshot_info(snapshot_id, l_region)
+                    snapshot_size_info = snapshots_info.get(snapshot_id)
                     if snapshot_size_info is None:
                         self.appConfig.logger.warning(f"Could not get detailed block information for snapshot {snapshot_id} in region {l_region}")
                         continue
@@ -9,6 +9,7 @@ import pandas as pd
 import time
 import sqlparse
 from rich.progress import track
+from ....service_helpers.cloudtrail import TrailInventory
 
 class CurCloudtrailduplicatemanagement(CurBase):
     """
@@ -142,6 +143,7 @@ class CurCloudtrailduplicatemanagement(CurBase):
             l_msg = f"Athena Query failed with state: {e} - Verify tooling CUR configuration via --configure"
             self.appConfig.console.print("\n[red]"+l_msg)
             self.logger.error(l_msg)
+            self.set_fail_query(reason=l_msg)
             return
 
         data_list = []
@@ -163,7 +165,18 @@ class CurCloudtrailduplicatemanagement(CurBase):
                 }
                 data_list.append(data_dict)
 
-            df = pd.DataFrame(data_list)
+            df = pd.DataFrame(data_list, columns=self.get_required_columns()[:5])
+            if not df.empty:
+                try:
+                    df = self.process_check_data(df)
+                except Exception as e:
+                    self.logger.error(f"Error retrieving CloudTrail trails: {e}")
+
+            # the trail columns are expected even when the trails could not be joined
+            if 'cloudtrail_name' not in df.columns:
+                df['cloudtrail_name'] = 'Unknown'
+            if 'is_multi_region_trail' not in df.columns:
+                df['is_multi_region_trail'] = False
             self.report_result.append({'Name': self.name(), 'Data': df, 'Type': self.chart_type_of_excel, 'DisplayPotentialSavings':True})
             self.report_definition = {'LINE_VALUE': 6, 'LINE_CATEGORY': 3}
 
@@ -173,29 +186,24 @@ class CurCloudtrailduplicatemanagement(CurBase):
                     'product_region_code',
                     'trail_name',
                     'cost',
-                    self.ESTIMATED_SAVINGS_CAPTION
+                    self.ESTIMATED_SAVINGS_CAPTION,
+                    'cloudtrail_name',
+                    'is_multi_region_trail'
             ]
 
     def get_expected_column_headers(self) -> list:
         return self.get_required_columns()
 
-    def get_cloudtrail_names(self, account_id, region):
-        """Get CloudTrail trail names for a specific account and region"""
-        try:
-            # Create a session with the specified account and region
-            session = self.appConfig.auth_manager.aws_cow_account_boto_session.client.Session()
-            cloudtrail_client = session.client('cloudtrail', region_name=region)
-            
-            # List trails in the account
-            response = cloudtrail_client.list_trails()
-            trails = response.get('Trails', [])
-            
-            # Extract trail names and return as a list
-            trail_names = [trail.get('Name', 'Unknown') for trail in trails]
-            return trail_names
-        except Exception as e:
-            self.logger.error(f"Error retrieving CloudTrail names: {str(e)}")
-            return ["Unknown"]
+    def process_check_data(self, df) -> pd.DataFrame:
+        """Join the name and multi-region flag of each trail onto the CUR rows, trail_name holds the trail ARN"""
+        regions = [region for region in df['product_region_code'].unique() if region]
+        trails_df = TrailInventory().get_trails(regions)
+
+        df = df.merge(trails_df[['trail_arn', 'cloudtrail_name', 'is_multi_region_trail']], left_on='trail_name', right_on='trail_arn', how='left')
+        df['cloudtrail_name'] = df['cloudtrail_name'].fillna('Unknown')
+        df['is_multi_region_trail'] = df['is_multi_region_trail'].fillna(False).astype(bool)
+
+        return df.drop(columns=['trail_arn'])
     
     def sql(self, fqdb_name: str, payer_id: str, account_id: str, region: str, max_date: str, current_cur_version: str, resource_id_column_exists: str):
 
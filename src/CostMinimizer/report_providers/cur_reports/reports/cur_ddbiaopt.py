@@ -145,6 +145,7 @@ class CurDdbiaopt(CurBase):
             l_msg = f"Athena Query failed with state: {e} - Verify tooling CUR configuration via --configure"
             self.appConfig.console.print("\n[red]"+l_msg)
             self.logger.error(l_msg)
+            self.set_fail_query(reason=l_msg)
             return
 
         data_list = []
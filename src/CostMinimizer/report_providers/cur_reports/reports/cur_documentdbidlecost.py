@@ -8,41 +8,12 @@ from ..cur_base import CurBase
 import pandas as pd
 import time
 import sqlparse
-import uuid
-import boto3
 import datetime
 from datetime import timezone
 from rich.progress import track
 
-# CloudWatch client class
-class Cloudwatch:
-    def __init__(self, account=None, region=None):
-        """Initialize CloudWatch client with account and region"""
-        # Ensure region is not empty or None before creating client
-        if region and region.strip():
-            self.client = boto3.client('cloudwatch', region_name=region)
-        else:
-            # Default to a valid region if none provided
-            self.client = boto3.client('cloudwatch', region_name='us-east-1')
-        self.account = account
-        self.region = region
-    
-    def get_metric_data(self, end_time, start_time, metric_data_queries):
-        """Get metric data from CloudWatch"""
-        try:
-            response = self.client.get_metric_data(
-                MetricDataQueries=metric_data_queries,
-                StartTime=datetime.datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%SZ"),
-                EndTime=datetime.datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%SZ")
-            )
-            return response
-        except Exception as e:
-            self.logger.info(f"Error getting metric data: {e}")
-            return {"metricDataResults": []}
-
+from ....service_helpers.cloudwatch import MetricDataFetcher, metric_spec
 
-####### TURNING THIS CHECK OFF - IT NEEDS TO BE REWRITTEN.  CLOUDWATCH CLASS SHOULD BE CENTRALIZED
-####### ERRORS WITH THIS CHECK ON line 206 and link 330
 
 class CurDocumentdbidlecost(CurBase):
     """
@@ -86,6 +57,7 @@ class CurDocumentdbidlecost(CurBase):
     def report_type(self):
         return "processed"
 
+    # disabled until dBClusterMembers are read from the DocumentDB API, the CUR rows only give the cluster id
     def disable_report(self):
         return True
 
@@ -131,106 +103,58 @@ class CurDocumentdbidlecost(CurBase):
             self.appConfig.logger.warning(f"Error in {self.name()}: {str(e)}")
             return 0
             
-    def get_cloudwatch_dicts(self, db_list) -> list:
-        '''pass in a list of identifiers 
-        send to CW 50 at a time
-        '''
-        query_metric_list = []
-        for db in db_list:
-            db_name = db['dBClusterIdentifier']
-        
-            db_uuid= 'a'+str(uuid.uuid4().hex)
-
-            temp_dict = {
-                    'Id': 'docdb',
-                    'MetricStat': {
-                            'Metric': {
-                            "Namespace": "AWS/DocDB",
-                            "MetricName": "DatabaseConnectionsMax",
-                            "Dimensions": [
-                                
-                            ]
-                            },
-                        'Period': 300,
-                        'Stat': 'Sum',
-                        }                    
-            }
-            
-            temp_dict['Id'] = db_uuid
-            db_key={}
-            db_key['Name'] = 'DBClusterIdentifier'
-            db_key['Value'] = db_name
-            temp_dict['MetricStat']['Metric']['Dimensions'].append(db_key)
-            
-            query_metric_list.append(temp_dict)
-        self.logger.info(f'created CW dict')
-        return query_metric_list
-    
-    def make_lists(self, items, n):
-        """Split a list into chunks of size n"""
-        return [items[i:i + n] for i in range(0, len(items), n)]
-    
+    def get_metric_specs(self, db_list) -> list:
+        '''one DatabaseConnectionsMax metric per cluster identifier'''
+        return [metric_spec('AWS/DocDB', 'DatabaseConnectionsMax', {'DBClusterIdentifier': db['dBClusterIdentifier']}, stat='Sum', period=300) for db in db_list]
+
     #funtion outputs curated data needed for this check   
-    def process_check_data(self, account, region, client, result) -> list:
+    def process_check_data(self, clusters_by_region) -> list:
+        '''
+        clusters_by_region = dict of (account, region) -> list of clusters
+        return the clusters without any connection during the last 7 full days
+        '''
         data_list = []
-        data_dict = {}
- 
-        self.error = {}
         self.logger.info(f'processing check data')
-        
-        #make sure Internal response was successful
-        if result['danteCallStatus'] == 'SUCCESSFUL':  
-            self.logger.info(f'Internal call successful')
-            metric_data_query_list=[]
-            
-            cluster_lists = self.make_lists(result['dBClusters'], 50)
-            
-            for cluster_list in cluster_lists:
-                
-                metric_data_query_list = self.get_cloudwatch_dicts(cluster_list)
-                # Ensure region is valid before creating CloudWatch client
-                if not region or region == '':
-                    self.logger.warning(f"Empty region provided for account {account}, skipping CloudWatch metrics")
-                    continue
-                    
-                try:
-                    cw_client = Cloudwatch(account=account, region=region)
-                    date_format = "%Y-%m-%dT%H:%M:%SZ"
-                    end_time = datetime.datetime.now(timezone.utc).strftime(date_format)
-                    end_date = datetime.datetime.now(timezone.utc)
-                    start_time = (end_date-datetime.timedelta(7)).strftime(date_format)
-                    cw_resp = cw_client.get_metric_data(end_time=end_time, start_time=start_time, metric_data_queries=metric_data_query_list)
-                    if cw_resp == []:
-                        self.logger.info(f'No CloudWatch metrics found for account {account}, region {region}')
-                        continue
-                except Exception as e:
-                    self.logger.error(f"Error getting CloudWatch metrics for account {account}, region {region}: {e}")
-                    continue
-                
-                for cw_result in cw_resp['metricDataResults']:
-                    data_dict = {}
-                    seven_day_total = 0
-                    
-                    for stamp, value in zip(cw_result['timestamps'], cw_result['values']):
-                        seven_day_total += value
-                    data_dict['account'] = account
-                    data_dict['region'] = region
-                    data_dict['docdb_name'] = cw_result['label']
-                    data_dict['connection_count'] = seven_day_total
-                    for db in cluster_list:
-                        if data_dict['docdb_name'] == db['dBClusterIdentifier']:
-                            data_dict['dBClusterMembers'] = db['dBClusterMembers']
-                            data_dict['dbClusterResourceId'] = db['dbClusterResourceId']
-                            
-                            if seven_day_total == 0:
-                                data_list.append(data_dict)
-        else:
-            msg = f'ERROR: Internal call not successful for account: {account} region: {region}'
-            self.logger.info(msg)
-            self.error[account] = msg
 
-        del(result)
-        del(data_dict)
+        requests = {}
+        for (account, region), clusters in clusters_by_region.items():
+            # Ensure region is valid before requesting CloudWatch metrics
+            if not region:
+                self.logger.warning(f"Empty region provided for account {account}, skipping CloudWatch metrics")
+                continue
+            requests[(account, region)] = self.get_metric_specs(clusters)
+
+        # whole days, so the window is closed and cached after the first run of the day
+        end_date = datetime.datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        start_date = end_date - datetime.timedelta(7)
+
+        fetcher = MetricDataFetcher()
+        try:
+            metrics = fetcher.fetch(requests, start_date, end_date)
+        except Exception as e:
+            self.logger.error(f"Error getting CloudWatch metrics: {e}")
+            return data_list
+
+        totals = metrics.groupby(['account', 'region', 'label'])['value'].sum().to_dict()
+
+        for (account, region) in requests:
+            # no metrics could be read, e.g. no role in the linked account: the clusters are not reported idle
+            if (account, region) in fetcher.failed_batches:
+                self.logger.warning(f"DocumentDB clusters of account {account} in {region} not inspected")
+                continue
+
+            for db in clusters_by_region[(account, region)]:
+                # a cluster without datapoints had no connection
+                seven_day_total = totals.get((account, region, db['dBClusterIdentifier']), 0.0)
+
+                if seven_day_total == 0:
+                    data_list.append({
+                        'account': account,
+                        'region': region,
+                        'docdb_name': db['dBClusterIdentifier'],
+                        'connection_count': seven_day_total,
+                        'dBClusterMembers': db['dBClusterMembers'],
+                        'dbClusterResourceId': db['dbClusterResourceId']})
 
         return data_list
 
@@ -281,6 +205,7 @@ class CurDocumentdbidlecost(CurBase):
             l_msg = f"Athena Query failed with state: {e} - Verify tooling CUR configuration via --configure"
             self.appConfig.console.print("\n[red]"+l_msg)
             self.logger.error(l_msg)
+            self.set_fail_query(reason=l_msg)
             return
 
         data_list = []
@@ -304,35 +229,21 @@ class CurDocumentdbidlecost(CurBase):
 
             df = pd.DataFrame(data_list)
             
-            # Get DocumentDB clusters from CUR results
-            docdb_clusters = []
+            # Get DocumentDB clusters from CUR results, grouped by account and region
+            clusters_by_region = {}
             for _, row in df.iterrows():
-                docdb_clusters.append({
+                clusters_by_region.setdefault((row['usage_account_id'], row['region']), []).append({
                     'dBClusterIdentifier': row['resource_id'],
                     'dBClusterMembers': [],  # This would be populated from actual API call
                     'dbClusterResourceId': row['resource_id']
                 })
             
-            # Process the clusters to check for idle ones
-            idle_clusters = []
-
             # test if df is empty, if yes skip the rest of the function
             if not df.empty:
 
                 try:
-                    # Get unique account-region combinations
-                    for account in df['usage_account_id'].unique():
-                        for region in df[df['usage_account_id'] == account]['region'].unique():
-
-                            # Mock result structure similar to what would come from a DocumentDB API call
-                            mock_result = {
-                                'danteCallStatus': 'SUCCESSFUL',
-                                'dBClusters': docdb_clusters
-                            }
-
-                            # Process the data to find idle clusters
-                            idle_data = self.process_check_data(account, region, None, mock_result)
-                            idle_clusters.extend(idle_data)
+                    # Process the clusters of all account-region combinations to find idle ones
+                    idle_clusters = self.process_check_data(clusters_by_region)
 
                     # Create a new DataFrame with idle clusters
                     if idle_clusters:
@@ -9,34 +9,7 @@ import pandas as pd
 import time
 import sqlparse
 from rich.progress import track
-import boto3
-import logging
-
-# Add DynamoDB client class
-class Dynamodb:
-    def __init__(self, region, account=None):
-        """Initialize DynamoDB client with region and account"""
-        self.client = boto3.client('dynamodb', region_name=region)
-        self.account = account
-        self.region = region
-    
-    def describe_table(self, table_name):
-        """Describe a DynamoDB table"""
-        try:
-            response = self.client.describe_table(TableName=table_name)
-            return response
-        except Exception as e:
-            logging.error(f"Error describing table {table_name}: {e}")
-            raise e
-    
-    def list_global_tables(self):
-        """List global tables in the region"""
-        try:
-            response = self.client.list_global_tables()
-            return response
-        except Exception as e:
-            logging.error(f"Error listing global tables: {e}")
-            return {"globalTables": []}
+from ....service_helpers.dynamodb import GlobalTableInspector, GLOBAL_TABLE_COLUMNS, VERSION_NOT_INSPECTED
 
 class CurDynamodblegacyglobaltablescost(CurBase):
     """
@@ -159,30 +132,33 @@ class CurDynamodblegacyglobaltablescost(CurBase):
             l_msg = f"Query failed with state: {response['QueryExecution']['Status']['StateChangeReason']}"
             raise Exception(l_msg)
 
-    def process_check_data(self, account, region, client, result) -> list:
-        """Process global tables data to identify legacy tables"""
-        self.logger.info(f'Processing global tables data for account: {account} region: {region}')
-        dynamodb_client = Dynamodb(region, account)
-        data_list = []
-        
-        for global_table in result.get('globalTables', []):
-            data_dict = {
-                'line_item_usage_account_id': account,
-                'region': region,
-                'global_table_name': global_table.get('globalTableName', '')
-            }
-            
-            try:
-                # Try to get table details to determine version
-                table = dynamodb_client.describe_table(global_table.get('globalTableName', ''))
-                data_dict['global_table_version'] = table.get('table', {}).get('globalTableVersion', '')
-            except Exception as e:
-                self.logger.info(f'Base global table not found in account: {account} region: {region}')
-                data_dict['global_table_version'] = ''
-            
-            data_list.append(data_dict)
-        
-        return data_list
+    def process_check_data(self, cur_df) -> pd.DataFrame:
+        """Join the global table version of every CUR row, the tables of each account are inspected with a session of that account"""
+        frames = [pd.DataFrame(columns=GLOBAL_TABLE_COLUMNS)]
+        not_inspected = set()
+
+        for account, account_df in cur_df.groupby('line_item_usage_account_id'):
+            regions = [region for region in account_df['region'].unique() if region]
+            if not account or not regions:
+                continue
+            self.logger.info(f'Processing global tables data of account {account} for regions: {regions}')
+
+            inspector = GlobalTableInspector(account=account)
+            frames.append(inspector.get_global_tables(regions))
+            not_inspected.update((account, region) for region in inspector.failed_regions)
+
+        global_tables_df = pd.concat(frames, ignore_index=True)
+
+        # single join on (account, region, table), rows without a known table have an undetermined version
+        df = cur_df.merge(global_tables_df, on=['line_item_usage_account_id', 'region', 'global_table_name'], how='left')
+        df['global_table_version'] = df['global_table_version'].fillna('')
+
+        # the tables of a region that could not be listed are not reported as legacy tables
+        if not_inspected:
+            rows = [(account, region) in not_inspected for account, region in zip(df['line_item_usage_account_id'], df['region'])]
+            df.loc[rows, 'global_table_version'] = VERSION_NOT_INSPECTED
+
+        return df
 
     def addCurReport(self, client, p_SQL, range_categories, range_values, list_cols_currency, group_by, display = False, report_name = ''):
         self.graph_range_values_x1, self.graph_range_values_y1, self.graph_range_values_x2,  self.graph_range_values_y2 = range_values
@@ -197,6 +173,7 @@ class CurDynamodblegacyglobaltablescost(CurBase):
             l_msg = f"Athena Query failed with state: {e} - Verify tooling CUR configuration via --configure"
             self.appConfig.console.print("\n[red]"+l_msg)
             self.logger.error(l_msg)
+            self.set_fail_query(reason=l_msg)
             return
 
         cur_data_list = []
@@ -223,45 +200,21 @@ class CurDynamodblegacyglobaltablescost(CurBase):
 
             # test if df is empty, if yes skip the rest of the function
             if not cur_df.empty:
-                # Get global tables data for each region
-                global_tables_data = []
-                region = self.appConfig.selected_region
                 try:
-                    dynamodb_client = Dynamodb(region)
-                    result = dynamodb_client.list_global_tables()
-                    for account in cur_df['line_item_usage_account_id'].unique():
-                        processed_data = self.process_check_data(account, region, None, result)
-                        global_tables_data.extend(processed_data)
-                except Exception as e:
-                    self.logger.error(f"Error getting global tables for region {region}: {e}")
-                
-                # Create DataFrame from global tables data
-                if global_tables_data:
-                    global_tables_df = pd.DataFrame(global_tables_data)
-                    
-                    # Merge CUR data with global tables data
-                    if not global_tables_df.empty and not cur_df.empty:
-                        merged_df = pd.merge(
-                            cur_df,
-                            global_tables_df,
-                            left_on='global_table_name',
-                            right_on='global_table_name',
-                            how='left'
-                        )
-                        
-                        # Filter for legacy global tables (version 2017.11.29)
-                        legacy_tables_df = merged_df[
-                            (merged_df['global_table_version'] == '2017.11.29') | 
-                            (merged_df['global_table_version'] == '')  # Include tables where version couldn't be determined
-                        ]
-                        
-                        if not legacy_tables_df.empty:
-                            df = legacy_tables_df
-                        else:
-                            df = cur_df
+                    merged_df = self.process_check_data(cur_df)
+
+                    # Filter for legacy global tables (version 2017.11.29)
+                    legacy_tables_df = merged_df[
+                        (merged_df['global_table_version'] == '2017.11.29') | 
+                        (merged_df['global_table_version'] == '')  # Include tables where version couldn't be determined
+                    ]
+
+                    if not legacy_tables_df.empty:
+                        df = legacy_tables_df
                     else:
                         df = cur_df
-                else:
+                except Exception as e:
+                    self.logger.error(f"Error getting DynamoDB global tables: {e}")
                     df = cur_df
             else:
                 df = []
@@ -9,6 +9,11 @@ import pandas as pd
 import time
 import sqlparse
 from rich.progress import track
+from ....service_helpers.savings_plans import SavingsPlansRatesLoader
+
+# hourly rate shown for the graviton instance: 1 year, no upfront Compute Savings Plan, Linux shared tenancy
+SAVINGS_PLAN_DURATION_SECONDS = 31536000
+SAVINGS_PLAN_PAYMENT_OPTION = 'No Upfront'
 
 class CurGravitoneccsavings(CurBase):
     """Cost and Usage Report based Graviton migration savings calculator."""
@@ -82,7 +87,8 @@ class CurGravitoneccsavings(CurBase):
                 'current_cost',
                 'amortized_cost',
                 self.ESTIMATED_SAVINGS_CAPTION,
-                'savings_%'
+                'savings_%',
+                'graviton_compute_sp_unit_cost'
             ]
         else:
             return [
@@ -98,7 +104,8 @@ class CurGravitoneccsavings(CurBase):
                 'current_cost',
                 'amortized_cost',
                 self.ESTIMATED_SAVINGS_CAPTION,
-                'savings_%'
+                'savings_%',
+                'graviton_compute_sp_unit_cost'
             ]
 
     def get_expected_column_headers(self) -> list:
@@ -117,7 +124,8 @@ class CurGravitoneccsavings(CurBase):
                 'Current Cost',
                 'Amortized Cost',
                 'Potential Savings',
-                'Savings %'
+                'Savings %',
+                'Graviton Compute SP Unit Cost'
             ]
         else:
             return [
@@ -133,7 +141,8 @@ class CurGravitoneccsavings(CurBase):
                 'Current Cost',
                 'Amortized Cost',
                 'Potential Savings',
-                'Savings %'
+                'Savings %',
+                'Graviton Compute SP Unit Cost'
             ]
     
     def disable_report(self) -> bool:
@@ -258,6 +267,7 @@ class CurGravitoneccsavings(CurBase):
             l_msg = f"Athena Query failed with state (verify Athena configuration): {e}"
             self.appConfig.console.print("\n[red]"+l_msg)
             self.logger.error(l_msg)
+            self.set_fail_query(reason=l_msg)
             return
 
         data_list = []
@@ -382,10 +392,31 @@ class CurGravitoneccsavings(CurBase):
                     }
                 data_list.append(data_dict)
 
-            df = pd.DataFrame(data_list)
+            df = self.add_savings_plan_rates(pd.DataFrame(data_list))
             self.report_result.append({'Name': self.name(), 'Data': df, 'Type': self.chart_type_of_excel, 'DisplayPotentialSavings':True})
             self.report_definition = {'LINE_VALUE': 6, 'LINE_CATEGORY': 3}
 
+    def add_savings_plan_rates(self, df) -> pd.DataFrame:
+        '''add the Compute Savings Plan hourly rate of each graviton instance, from the rates loaded into cow_savingsplanrates'''
+        df['graviton_compute_sp_unit_cost'] = 0.0
+        if df.empty:
+            return df
+
+        graviton_types = df['graviton_instance_type'].fillna('') + '.' + df['product_instance_type'].str.split('.').str[1].fillna('')
+        try:
+            # only the EC2 rates are used here, the other product types are left to their own reports
+            SavingsPlansRatesLoader(products=['EC2']).refresh(df['product_region'].unique())
+            rates = self.pricing.get_savings_plan_rates_from_db(list(graviton_types.unique()), None, 'Compute', SAVINGS_PLAN_PAYMENT_OPTION)
+        except Exception as e:
+            self.logger.warning(f'Unable to get Savings Plans rates: {e}')
+            return df
+
+        rates = rates[(rates['duration_seconds'] == SAVINGS_PLAN_DURATION_SECONDS) & (rates['product_description'] == 'Linux/UNIX') & (rates['tenancy'] == 'shared')]
+        rate_index = rates.groupby(['instance_type', 'region'])['rate'].min()
+
+        df['graviton_compute_sp_unit_cost'] = rate_index.reindex(pd.MultiIndex.from_arrays([graviton_types, df['product_region']])).fillna(0.0).to_numpy()
+        return df
+
     def sql(self,fqdb_name: str, payer_id: str, account_id: str, region: str, max_date: str, current_cur_version: str, resource_id_column_exists: str):
         """Generate SQL query for Graviton migration analysis.
         Add this WHERE condition to exclude Windows OS:   AND product_operating_system NOT LIKE '%Windows%'
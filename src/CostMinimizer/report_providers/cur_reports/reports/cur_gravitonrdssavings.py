@@ -210,6 +210,7 @@ class CurGravitonrdssavings(CurBase):
             l_msg = f"Athena Query failed with state (verify Athena configuration): {e}"
             self.appConfig.console.print("\n[red]"+l_msg)
             self.logger.error(l_msg)
+            self.set_fail_query(reason=l_msg)
             return
 
         data_list = []
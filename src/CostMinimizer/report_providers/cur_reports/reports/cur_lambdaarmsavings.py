@@ -127,6 +127,7 @@ class CurLambdaarmsavings(CurBase):
         except Exception as e:
             l_msg = f"\n[red]Athena Query failed with state: {e}"
             self.appConfig.console.print(l_msg)
+            self.set_fail_query(reason=l_msg)
             return
 
         data_list = []
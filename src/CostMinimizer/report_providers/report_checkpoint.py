@@ -0,0 +1,122 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import os
+import json
+import time
+import pickle
+import shutil
+import logging
+from datetime import datetime
+from pathlib import Path
+
+# report attributes holding the fetched results, restored on resume instead of running the report again
+CHECKPOINT_ATTRIBUTES = ['report_result', 'dataframe', 'output', 'execution_ids']
+
+class ReportCheckpointStore:
+    '''
+    checkpoints of the completed reports of a run, stored under the run execution id
+
+    Each report is saved as a pickle of its result attributes (DataFrames included) plus a
+    json metadata file. A run restarted with --resume restores the checkpointed reports and
+    only executes the missing or failed ones. The checkpoints of a run are deleted once it
+    completed without failed reports, the others are purged after the retention period.
+    '''
+
+    def __init__(self, directory, execution_id) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.execution_id = execution_id
+        self.directory = Path(directory) / execution_id
+
+    def get_checkpoint_file(self, provider_name, report_name) -> Path:
+        return self.directory / f'{provider_name}.{report_name}.pkl'
+
+    def get_metadata_file(self, provider_name, report_name) -> Path:
+        return self.directory / f'{provider_name}.{report_name}.json'
+
+    def save(self, provider_name, report_object) -> dict:
+        '''checkpoint the result attributes of report_object, return the metadata written'''
+        self.directory.mkdir(parents=True, exist_ok=True)
+        report_name = report_object.name()
+
+        state = {a: getattr(report_object, a) for a in CHECKPOINT_ATTRIBUTES if hasattr(report_object, a)}
+
+        # write to a temporary file first so a run killed while writing never leaves a truncated checkpoint
+        checkpoint_file = self.get_checkpoint_file(provider_name, report_name)
+        tmp_file = checkpoint_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, checkpoint_file)
+
+        metadata = {
+            'execution_id': self.execution_id,
+            'report_name': report_name,
+            'report_provider': provider_name,
+            'status': 'COMPLETED',
+            'checkpoint_time': datetime.now().isoformat(),
+            'attributes': list(state.keys())
+        }
+        with open(self.get_metadata_file(provider_name, report_name), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+
+        return metadata
+
+    def exists(self, provider_name, report_name) -> bool:
+        return self.get_metadata_file(provider_name, report_name).is_file() and self.get_checkpoint_file(provider_name, report_name).is_file()
+
+    def restore(self, provider_name, report_object) -> bool:
+        '''set the checkpointed attributes on report_object, return False if there is no usable checkpoint'''
+        report_name = report_object.name()
+        if not self.exists(provider_name, report_name):
+            return False
+
+        try:
+            with open(self.get_checkpoint_file(provider_name, report_name), 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            self.logger.warning(f'{report_name}: unable to read checkpoint, the report will run again: {e}')
+            return False
+
+        for attribute, value in state.items():
+            setattr(report_object, attribute, value)
+
+        return True
+
+    def completed_reports(self) -> list:
+        '''return the metadata of every checkpointed report of the run'''
+        if not self.directory.is_dir():
+            return []
+
+        completed = []
+        for metadata_file in sorted(self.directory.glob('*.json')):
+            with open(metadata_file, encoding='utf-8') as f:
+                metadata = json.load(f)
+            if self.exists(metadata['report_provider'], metadata['report_name']):
+                completed.append(metadata)
+
+        return completed
+
+    def delete(self) -> None:
+        '''delete every checkpoint of the run'''
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    @staticmethod
+    def purge_expired(directory, retention_days) -> list:
+        '''delete the checkpoints of the runs last written more than retention_days ago, return their execution ids'''
+        directory = Path(directory)
+        if not directory.is_dir():
+            return []
+
+        expiration = time.time() - float(retention_days) * 86400
+        purged = []
+        for run_directory in directory.iterdir():
+            if run_directory.is_dir() and run_directory.stat().st_mtime < expiration:
+                shutil.rmtree(run_directory, ignore_errors=True)
+                purged.append(run_directory.name)
+
+        return purged
@@ -18,8 +18,15 @@ import datetime
 import logging
 from abc import ABC, abstractmethod
 import sys
+import functools
+import copy
+import threading
+import time
+from concurrent.futures import Future
 
 from ..config.config import Config
+from .report_scheduler import ReportScheduler
+from .report_checkpoint import ReportCheckpointStore, CHECKPOINT_ATTRIBUTES
 
 
 class InvalidReportInputException(Exception):
@@ -49,6 +56,16 @@ class ReportProviderBase(ABC):
     setup() - method to run any necessary setup before the exectution of reports by provider
     run() - execute reports under this report provider
     '''
+
+    # dependency report results of the run, shared by all providers: (provider, report name, report time) -> Future
+    _dependency_results = {}
+    # report executions of the run, selected or dependency: (provider, report name, report time) -> Future of the executed report
+    _report_executions = {}
+    _dependency_lock = threading.Lock()
+
+    # bounds the async reports of all providers running at the same time
+    _async_slots = None
+
     def __init__(self, appConfig) -> None:
         
         self.logger = logging.getLogger(__name__)
@@ -106,6 +123,10 @@ class ReportProviderBase(ABC):
         '''return report object'''
         pass
 
+    def prepare_reports(self, report_objects) -> None:
+        '''called once before report_objects are scheduled, lets a provider batch the API calls shared by its reports'''
+        pass
+
     @abstractmethod
     def run_additional_logic_for_provider(self, report_object, additional_input_data=None):
         """
@@ -139,7 +160,17 @@ class ReportProviderBase(ABC):
         :param display: Display flag
         """
         '''execute provider run'''
-        # run reports
+        # report history records, written in one batch once all reports are launched
+        execution_history = []
+        try:
+            self._provider_run_reports(additional_input_data, display, execution_history)
+        finally:
+            if execution_history:
+                self.appConfig.database.insert_records(execution_history, 'cow_cowreporthistory')
+
+    def _provider_run_reports(self, additional_input_data, display, execution_history) -> None:
+        '''run the reports of the provider as a DAG of their dependencies, collecting the report history records into execution_history'''
+        scheduled_reports = [] # (report object, additional input data) in report order
         for report in self.reports:
             
             # instantiate report/query object
@@ -173,40 +204,374 @@ class ReportProviderBase(ABC):
                 self.get_approved_reports().remove(report_object.name())
                 continue
 
-            self.execute_dependent_reports(report_object, self.appConfig.cow_execution_type)
+            scheduled_reports.append((report_object, additional_input_data))
 
-            self.logger.info(f'Running report {report_name}')
+        pending_reports = [(report_object, report_input_data) for report_object, report_input_data in scheduled_reports if not self.restore_report(report_object)]
+        self.prepare_reports([report_object for report_object, _ in pending_reports])
 
-            self.run_additional_logic_for_provider(report_object, additional_input_data)
-            self.accounts, self.regions, self.customer = self.set_report_request_for_run()
+        pending_names = {report_object.name() for report_object, _ in pending_reports}
 
-            self.logger.info(f'{report_name}: Requested in {self.appConfig.cow_execution_type} mode.')
-            self.logger.info(f'{report_name}: Running against account #{self.accounts} and region {self.regions}.')
-            
-            if not self.check_cached_data(report_name, self.accounts, self.regions, self.customer, self.additional_input_data, self.expiration_days):
-                #if report is not cached, execute report
-                self.logger.info(f'{report_name}: Report not found in CACHE')
+        scheduler = ReportScheduler(self.get_report_workers())
+        for report_object, report_input_data in pending_reports:
+            dependency_keys = []
+            for dependency in report_object.report_dependency_list:
+                key = f"dependency:{dependency['dependency_report_provider']}.{dependency['dependency_report_name']}"
+                # a dependency also selected in this provider runs after the selected report node and shares its execution
+                selected = dependency['dependency_report_provider'] == self.name() and dependency['dependency_report_name'] in pending_names
+                scheduler.add(key, functools.partial(self._run_dependency_task, report_object, dependency, self.appConfig.cow_execution_type),
+                    [f"report:{dependency['dependency_report_name']}"] if selected else [])
+                dependency_keys.append(key)
 
-                self.execute_report(report_object, display)
+            scheduler.add(f'report:{report_object.name()}', functools.partial(self._run_report, report_object, report_input_data, display, scheduler, dependency_keys), dependency_keys)
 
-            else: 
-                #if report is cached, and we are running in sync mode, skip report
-                self.logger.info(f'{report_name}: Report found in CACHE')
+        scheduler.run()
 
-                report_object.execution_ids = {report_object.name(): 'CACHED'}
-                
-                self.execute_report(report_object, display, cached=False)
+        if scheduled_reports:
+            self.logger.info(f'{self.name()} provider run: {scheduler.summary()}')
 
+        for report_object, _ in scheduled_reports:
             self.list_reports_results.append(report_object.report_result)
 
-
             #track all reports in progress
             self.reports_in_progress.append(report_object)
 
             #write execution id to database
             #if not self.account_discovery and self.appConfig.k2_account_validation_complete:
+            if getattr(report_object, 'execution_recorded', False):
+                continue
+            if not self.account_discovery and report_object.write_to_db() == True:
+                execution_history.append(self.get_execution_history_record(report_object.name(), report_object.execution_ids))
+
+    def _run_dependency_task(self, report_object, dependency, cow_execution_type):
+        '''scheduler task of a dependency report, a failure is returned as its exception so that only the dependents fail'''
+        try:
+            return self.run_dependency_report(report_object, dependency, cow_execution_type)
+        except Exception as e:
+            self.logger.error(f"{report_object.name()}: dependency report {dependency['dependency_report_name']} failed: {e}")
+            return e
+
+    def _run_report(self, report_object, additional_input_data, display, scheduler, dependency_keys) -> None:
+        '''
+        execute one report once its dependencies completed
+
+        This is the isolation boundary of the report: a failed dependency or an exception in any step
+        is recorded on the report and moves it to the failed reports, the other reports still run.
+        '''
+        start = time.monotonic()
+        phase = 'dependency'
+        try:
+            for report, key in zip(report_object.report_dependency_list, dependency_keys):
+                if isinstance(scheduler.results[key], Exception):
+                    raise scheduler.results[key]
+                report_object.dependency_data[report['dependency_report_name']] = scheduler.results[key]
+
+            phase = 'setup'
+            execution, owner = self.claim_report_execution(report_object)
+            if not owner:
+                self.adopt_report_execution(report_object, execution.result())
+                return
+
+            try:
+                self._run_report_steps(report_object, additional_input_data, display)
+            except Exception as e:
+                execution.set_exception(e)
+                raise
+            self.publish_report_execution(report_object, execution)
+        except Exception as e:
+            self.record_report_failure(report_object, phase, time.monotonic() - start, e)
+
+    def claim_report_execution(self, report_object) -> tuple:
+        '''
+        return (Future of the execution of report_object in this run, True if the caller executes it)
+
+        A report selected by the user may also be the dependency of another report: the first of the
+        selected run and the dependency run executes it, the other adopts its results.
+        '''
+        key = (self.name(), report_object.name(), str(self.appConfig.report_time))
+
+        with ReportProviderBase._dependency_lock:
+            execution = ReportProviderBase._report_executions.get(key)
+            if execution is not None:
+                return execution, False
+
+            execution = Future()
+            ReportProviderBase._report_executions[key] = execution
+
+        return execution, True
+
+    def publish_report_execution(self, report_object, execution) -> None:
+        '''resolve the execution claimed by report_object once it executed, in async mode once the submitted report completed'''
+        def resolve(future=None):
+            executed = future is None or (not future.cancelled() and future.exception() is None and future.result() is not False)
+            if executed and report_object not in self.failed_reports:
+                execution.set_result(report_object)
+            else:
+                execution.set_exception(RuntimeError(f'report {report_object.name()} did not execute'))
+
+        future = getattr(report_object, 'async_future', None)
+        if future is None:
+            resolve()
+        else:
+            future.add_done_callback(resolve)
+
+    def adopt_report_execution(self, report_object, executed_report) -> None:
+        '''take the results of the report executed by the other run, the report history was recorded by that run'''
+        for attribute in CHECKPOINT_ATTRIBUTES:
+            if hasattr(executed_report, attribute):
+                setattr(report_object, attribute, getattr(executed_report, attribute))
+
+        report_object.execution_recorded = True
+        self.logger.info(f'{report_object.name()}: reusing the execution of the same report in this run')
+
+    def _run_report_steps(self, report_object, additional_input_data, display) -> None:
+        '''check the cache of the report, then execute it or submit it in async mode'''
+        report_name = report_object.name()
+
+        self.logger.info(f'Running report {report_name}')
+
+        self.run_additional_logic_for_provider(report_object, additional_input_data)
+
+        # reports of a provider may run concurrently: the request of this report is kept local, not on the provider
+        accounts, regions, customer = self.set_report_request_for_run()
+
+        self.logger.info(f'{report_name}: Requested in {self.appConfig.cow_execution_type} mode.')
+        self.logger.info(f'{report_name}: Running against account #{accounts} and region {regions}.')
+        
+        if not self.check_cached_data(report_name, accounts, regions, customer, additional_input_data, self.expiration_days):
+            #if report is not cached, execute report
+            self.logger.info(f'{report_name}: Report not found in CACHE')
+
+            if self.appConfig.cow_execution_type == 'async':
+                self.submit_report(report_object, display)
+            else:
+                self.execute_and_checkpoint(report_object, display)
+
+        else: 
+            #if report is cached, and we are running in sync mode, skip report
+            self.logger.info(f'{report_name}: Report found in CACHE')
+
+            report_object.execution_ids = {report_object.name(): 'CACHED'}
+            
+            self.execute_and_checkpoint(report_object, display, cached=False)
+
+    @classmethod
+    def reset_run_state(cls) -> None:
+        '''forget the dependency report results and the service caches of the previous run, called once before the providers of a run start'''
+        from ..service_helpers.compute_optimizer import ComputeOptimizerQuery
+        from ..service_helpers.cost_explorer import CostAllocationTagCatalog
+        from ..service_helpers.dynamodb import GlobalTableInspector
+        from ..service_helpers.cloudtrail import TrailInventory
+
+        with cls._dependency_lock:
+            ReportProviderBase._dependency_results = {}
+            ReportProviderBase._report_executions = {}
+
+        for cache in (ComputeOptimizerQuery, CostAllocationTagCatalog, GlobalTableInspector, TrailInventory):
+            cache.reset()
+
+    def get_checkpoint_store(self) -> ReportCheckpointStore:
+        '''return the checkpoint store of the current execution id'''
+        checkpoint_dir = self.appConfig.app_path / self.appConfig.internals['internals']['reports'].get('checkpoint_directory', 'checkpoints')
+        return ReportCheckpointStore(checkpoint_dir, self.appConfig.get_execution_id())
+
+    def execute_and_checkpoint(self, report_object, display, cached=None) -> bool:
+        '''execute the report in its isolation boundary and checkpoint it when it succeeded'''
+        executed = self.execute_report_isolated(report_object, display, cached)
+        if executed:
+            self.checkpoint_report(report_object)
+
+        return executed
+
+    def checkpoint_report(self, report_object) -> None:
+        '''save the report results under the execution id and record the report as COMPLETED in the report history'''
+        report_name = report_object.name()
+
+        # a report may handle its own failure, e.g. an Athena query logged and returned: keep it out of
+        # the checkpoints and record it as FAILED so that --resume runs it again
+        if getattr(report_object, 'fail_query', False) is True:
+            self.logger.warning(f'{report_name}: not checkpointed, the report failed: {getattr(report_object, "fail_reason", "")}')
             if not self.account_discovery and report_object.write_to_db() == True:
-                self.write_execution_id_to_database(report_object.name(), report_object.execution_ids)
+                self.write_execution_id_to_database(report_name, report_object.execution_ids, status='FAILED')
+                report_object.execution_recorded = True
+            return
+
+        try:
+            self.get_checkpoint_store().save(self.name(), report_object)
+        except Exception as e:
+            # a report that cannot be checkpointed is still a good result for this run, it would only run again on resume
+            self.logger.warning(f'{report_name}: unable to write checkpoint: {e}')
+            return
+
+        if not self.account_discovery and report_object.write_to_db() == True:
+            self.write_execution_id_to_database(report_name, report_object.execution_ids, status='COMPLETED')
+            report_object.execution_recorded = True
+
+    def restore_report(self, report_object) -> bool:
+        '''--resume: load the checkpoint of the report from the resumed execution, return True if the report does not need to run'''
+        if not self.appConfig.resume_execution_id:
+            return False
+
+        if not self.get_checkpoint_store().restore(self.name(), report_object):
+            return False
+
+        report_object.restored_from_checkpoint = True
+        report_object.execution_recorded = True
+        self.logger.info(f'{report_object.name()}: restored from checkpoint of execution {self.appConfig.resume_execution_id}')
+        self.appConfig.console.print(f'[green]Report [yellow]{report_object.name()} [green]restored from checkpoint')
+
+        return True
+
+    def get_report_timeout(self) -> float:
+        '''return the wall-clock seconds allowed to execute_report, None when reports are not time limited'''
+        concurrency = self.appConfig.internals['internals'].get('concurrency', {})
+        timeout = concurrency.get('report_timeout', 3600)
+
+        return float(timeout) if timeout else None
+
+    def execute_report_isolated(self, report_object, display, cached=None) -> bool:
+        '''
+        run execute_report inside an isolation boundary
+
+        An exception or a run longer than the report timeout does not stop the other reports:
+        the failure is recorded on the report and the report is moved to the failed reports.
+        Return True if the report executed.
+        '''
+        kwargs = {} if cached is None else {'cached': cached}
+        timeout = self.get_report_timeout()
+        start = time.monotonic()
+
+        if timeout is None:
+            try:
+                self.execute_report(report_object, display, **kwargs)
+            except Exception as e:
+                self.record_report_failure(report_object, 'execute', time.monotonic() - start, e)
+                return False
+            return True
+
+        outcome = {}
+        # the worker executes its own copy of the report: an abandoned execution keeps writing to the
+        # copy only, its results are taken by the report when it completed within the timeout
+        worker_report = self.make_worker_report(report_object)
+
+        def run():
+            try:
+                self.execute_report(worker_report, display, **kwargs)
+            except Exception as e:
+                outcome['exception'] = e
+
+        # daemon thread: a timed out execution is abandoned and does not hold the interpreter at exit
+        thread = threading.Thread(target=run, name=f'report-{report_object.name()}', daemon=True)
+        thread.start()
+        thread.join(timeout)
+
+        if thread.is_alive():
+            # the worker copy holds the remote work of the running execution, e.g. its query id
+            self.cancel_report(worker_report)
+            self.record_report_failure(report_object, 'execute', time.monotonic() - start,
+                TimeoutError(f'execution exceeded {timeout:.0f} seconds'))
+            return False
+
+        vars(report_object).update(vars(worker_report))
+
+        if 'exception' in outcome:
+            self.record_report_failure(report_object, 'execute', time.monotonic() - start, outcome['exception'])
+            return False
+
+        return True
+
+    @staticmethod
+    def make_worker_report(report_object):
+        '''return a copy of report_object with its own containers, so that appends to the copy do not reach the report'''
+        worker_report = copy.copy(report_object)
+        for attribute, value in vars(report_object).items():
+            if isinstance(value, (list, dict, set)):
+                setattr(worker_report, attribute, copy.copy(value))
+
+        return worker_report
+
+    def record_report_failure(self, report_object, phase, elapsed, exception) -> dict:
+        '''record a structured failure of report_object and move it to the failed reports'''
+        report_name = report_object.name()
+        failure = {
+            'report': report_name,
+            'provider': self.name(),
+            'phase': phase,
+            'elapsed_seconds': round(elapsed, 3),
+            'exception': type(exception).__name__,
+            'message': str(exception)
+        }
+
+        report_object.status = 'TIMEOUT' if isinstance(exception, TimeoutError) else 'FAILED'
+        report_object.failed_report_logs.setdefault(report_name, []).append(failure)
+
+        with ReportProviderBase._dependency_lock:
+            if report_object not in self.failed_reports:
+                self.failed_reports.append(report_object)
+
+        self.logger.error(f'{report_name}: {report_object.status} during {phase} after {elapsed:.1f}s: {failure["exception"]} {failure["message"]}')
+        if report_object.status == 'TIMEOUT':
+            self.appConfig.console.print(f'[red]Report {report_name} timed out after {elapsed:.0f}s. [yellow]Skipping.')
+
+        return failure
+
+    def submit_report(self, report_object, display) -> None:
+        '''async mode: start the report execution and return, results and timeouts are handled by the report controller'''
+        future = Future()
+
+        def run():
+            with self.get_async_slots():
+                # a report cancelled by the controller while waiting for a slot never starts
+                if not future.set_running_or_notify_cancel():
+                    return
+                try:
+                    future.set_result(self.execute_async_report(report_object, display))
+                except Exception as e:
+                    future.set_exception(e)
+
+        report_object.async_submit_time = time.monotonic()
+        report_object.async_future = future
+        report_object.async_abandoned = False
+        report_object.execution_state = False
+
+        # daemon thread: a report abandoned after its timeout does not hold the interpreter at exit
+        threading.Thread(target=run, name=f'async-report-{report_object.name()}', daemon=True).start()
+        self.logger.info(f'{report_object.name()}: Submitted in async mode.')
+
+    def execute_async_report(self, report_object, display) -> bool:
+        '''
+        async mode: execute the report and checkpoint it
+
+        There is no isolation thread here, the async_report_timeout of the report controller is the
+        only time limit and the controller records the exceptions. Return False when the report
+        was abandoned by the controller while running.
+        '''
+        self.execute_report(report_object, display)
+
+        if report_object.async_abandoned:
+            return False
+
+        self.checkpoint_report(report_object)
+        return True
+
+    @classmethod
+    def get_async_slots(cls) -> threading.BoundedSemaphore:
+        '''return the semaphore bounding the async reports of all providers running at the same time'''
+        with cls._dependency_lock:
+            if ReportProviderBase._async_slots is None:
+                concurrency = Config().internals['internals'].get('concurrency', {})
+                max_workers = int(concurrency.get('max_async_workers', 8))
+                ReportProviderBase._async_slots = threading.BoundedSemaphore(max_workers)
+
+        return ReportProviderBase._async_slots
+
+    def cancel_report(self, report_object) -> None:
+        '''stop the remote work of a timed out async report, override in the provider when the service supports it'''
+        pass
+
+    def get_report_workers(self) -> int:
+        '''return the number of reports of a provider allowed to run at the same time'''
+        concurrency = self.appConfig.internals['internals'].get('concurrency', {})
+        return int(concurrency.get('max_report_workers', 1))
 
     def import_reports(self, provided_report_metadata=None) -> list:
         """
@@ -361,7 +726,7 @@ class ReportProviderBase(ABC):
 
         try:
             # retreive account number from boto3 sts current session
-            account = self.appConfig.auth_manager.aws_cow_account_boto_session.client('sts').get_caller_identity()['Account']
+            account = self.appConfig.get_caller_identity()['Account']
 
             # Set default region if selected_regions is None
             if hasattr(self.appConfig, 'selected_regions') and self.appConfig.selected_regions:
@@ -661,34 +1026,109 @@ class ReportProviderBase(ABC):
         '''
         
         for report in report_object.report_dependency_list:
+            report_object.dependency_data[report['dependency_report_name']] = self.run_dependency_report(report_object, report, cow_execution_type)
 
-            reports, send_report={},{}
-            
-            send_report[report['dependency_report_name']] = report['dependency_report_class']
-            provider = report['dependency_report_provider'] 
-            module_path = self.module_path + '.' + provider + '_reports' + '.' + provider
-            module = importlib.import_module(module_path)
+    def run_dependency_report(self, report_object, report, cow_execution_type):
+        """
+        Run a dependency report once per run and return its data.
 
-            provider_class = getattr(module, provider.title() + 'Reports')
+        A dependency shared by several reports, of any provider, is executed by the first
+        dependent; the others wait for and reuse its result.
 
-            dependency_report = provider_class(self.appConfig, reports, dependency_run=True, dependent_report=f'{report_object.name()}.{report_object.report_provider()}')
-            dependency_report.auth()
-            dependency_report.setup(run_validation=True, dependency_status = True)
-            
-            report_list = dependency_report.import_reports(send_report)
+        :param report_object: The report object depending on the dependency
+        :param report: The dependency definition from report_dependency_list
+        :param cow_execution_type: The execution type (sync/async)
+        """
+        key = (report['dependency_report_provider'], report['dependency_report_name'], str(self.appConfig.report_time))
 
-            dependency_report.run(report_list, display=False, cow_execution_type=cow_execution_type)
-            reports_in_progress = dependency_report.reports_in_progress
-            
-            if self.appConfig.cow_execution_type == 'sync':
-                dependency_report.fetch_data(dependency_report.reports_in_progress,
-                                            additional_input_data=None, 
-                                            expiration_days=None, 
-                                            type=None,
-                                            display=True,
-                                            cow_execution_type=cow_execution_type)
-                
-                report_object.dependency_data[report['dependency_report_name']] = dependency_report.get_data()
+        with ReportProviderBase._dependency_lock:
+            future = ReportProviderBase._dependency_results.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                ReportProviderBase._dependency_results[key] = future
+
+        if owner:
+            try:
+                future.set_result(self._execute_dependency_report(report_object, report, cow_execution_type))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            self.logger.info(f"{report_object.name()}: reusing dependency report {report['dependency_report_name']}")
+
+        return future.result()
+
+    def _execute_dependency_report(self, report_object, report, cow_execution_type):
+        '''instantiate the provider of a dependency report, run it and return its data'''
+        reports, send_report={},{}
+        
+        send_report[report['dependency_report_name']] = report['dependency_report_class']
+        provider = report['dependency_report_provider'] 
+        module_path = self.module_path + '.' + provider + '_reports' + '.' + provider
+        module = importlib.import_module(module_path)
+
+        provider_class = getattr(module, provider.title() + 'Reports')
+
+        dependency_report = provider_class(self.appConfig, reports, dependency_run=True, dependent_report=f'{report_object.name()}.{report_object.report_provider()}')
+        dependency_report.auth()
+        dependency_report.setup(run_validation=True, dependency_status = True)
+        
+        report_list = dependency_report.import_reports(send_report)
+
+        dependency_report.run(report_list, display=False, cow_execution_type=cow_execution_type)
+
+        # the dependents need the data now: in async mode wait for the submitted dependency reports
+        executed_reports = dependency_report.wait_for_async_reports(dependency_report.reports_in_progress)
+        if not executed_reports:
+            raise RuntimeError(f"dependency report {report['dependency_report_name']} did not execute")
+
+        dependency_report.fetch_data(executed_reports,
+                                    additional_input_data=None, 
+                                    expiration_days=None, 
+                                    type=None,
+                                    display=True,
+                                    cow_execution_type=cow_execution_type)
+        
+        return dependency_report.get_data()
+
+    def wait_for_async_reports(self, reports) -> list:
+        '''
+        wait for the async reports among reports and return the ones that executed
+
+        Reports executed in sync mode or served from cache are returned as they are. An async
+        report still running past its timeout is abandoned and failed.
+        '''
+        executed_reports = []
+        for report_object in reports:
+            if report_object in self.failed_reports:
+                continue
+
+            future = getattr(report_object, 'async_future', None)
+            if future is not None:
+                timeout = report_object.async_timeout()
+                if timeout is None:
+                    timeout = self.appConfig.internals['internals'].get('concurrency', {}).get('async_report_timeout', 900)
+                remaining = max(0, report_object.async_submit_time + float(timeout) - time.monotonic())
+
+                try:
+                    if future.result(timeout=remaining) is False:
+                        continue
+                except TimeoutError:
+                    future.cancel()
+                    report_object.async_abandoned = True
+                    self.cancel_report(report_object)
+                    self.record_report_failure(report_object, 'execute', time.monotonic() - report_object.async_submit_time,
+                        TimeoutError(f'async execution exceeded {float(timeout):.0f} seconds'))
+                    continue
+                except Exception as e:
+                    self.record_report_failure(report_object, 'execute', time.monotonic() - report_object.async_submit_time, e)
+                    continue
+
+                report_object.execution_state = True
+
+            executed_reports.append(report_object)
+
+        return executed_reports
     
     def get_enabled_reports(self) -> list:
         """
@@ -737,15 +1177,22 @@ class ReportProviderBase(ABC):
         self.logger.info(f'{self.name()} report - approved reports: {self.approved_reports}')
     
 
-    def write_execution_id_to_database(self, report_name, execution_id):
+    def write_execution_id_to_database(self, report_name, execution_id, status=''):
         """
         Write the execution ID to the database for the given report.
 
         :param report_name: Name of the report
         :param execution_id: Execution ID to be written
+        :param status: Status of the report, COMPLETED once its results are checkpointed
         """
         '''write execution id to database'''
-        hash = hashlib.md5(self.appConfig.report_time.encode('utf-8')).hexdigest()
+        request = self.get_execution_history_record(report_name, execution_id, status)
+
+        self.appConfig.database.insert_record(request, 'cow_cowreporthistory')
+
+    def get_execution_history_record(self, report_name, execution_id, status='') -> dict:
+        '''return the cow_cowreporthistory record of a report execution'''
+        hash = self.appConfig.get_execution_id()
         #customer_id = self.appConfig.customers.get_customer_data(self.appConfig.customers.selected_customer)['id']
         try:
             comment = self.appConfig.tag
@@ -756,9 +1203,9 @@ class ReportProviderBase(ABC):
             comment = ''
 
         dependent_report = self.dependent_report if self.dependent_report else ''
-        request = { 'report_id': hash, 'report_name': report_name,  'report_provider': self.name(), 'report_exec_id': report_name, 'parent_report': dependent_report, 'start_time': self.appConfig.report_time, 'status': '', 'comment': comment, 'cx_id_id': 'default_customer_id','using_tags': self.appConfig.using_tags}
-      
-        self.appConfig.database.insert_record(request, 'cow_cowreporthistory')
+        request = { 'report_id': hash, 'report_name': report_name,  'report_provider': self.name(), 'report_exec_id': report_name, 'parent_report': dependent_report, 'start_time': self.appConfig.report_time, 'status': status, 'comment': comment, 'cx_id_id': 'default_customer_id','using_tags': self.appConfig.using_tags}
+
+        return request
 
 
 class ReportBase(ABC):
@@ -782,6 +1229,8 @@ class ReportBase(ABC):
         self.joined_report =False
         self.report_output_phase= False
         self.execution_ids = {} #holds execution ids for each report
+        self.restored_from_checkpoint = False #results loaded from the checkpoint of a resumed execution
+        self.execution_recorded = False #report history record already written
 
         ''' 
         execution status: False if not finished; True if finished
@@ -998,6 +1447,10 @@ class ReportBase(ABC):
     def write_to_db(self) -> bool:
         '''Write exections to DB. Override to false in the report definition to skip this'''
         return True
+
+    def async_timeout(self):
+        '''Seconds allowed to the report in async mode. Override in the report definition, None uses the internals default'''
+        return None
     
     def set_tag_dependencies(self) -> None:
         '''Override to set a dependency report in a Internal script when tags are being used. 
@@ -0,0 +1,102 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class ReportDependencyCycleException(Exception):
+    pass
+
+class ReportScheduler:
+    '''
+    run a DAG of report tasks on a bounded thread pool
+
+    A task is submitted as soon as all of its dependencies have completed, so independent
+    reports run concurrently up to max_workers. Start and end times of each task are kept
+    to compute the critical path of the run.
+    '''
+
+    def __init__(self, max_workers=1) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max(1, int(max_workers))
+        self.tasks = {}      # key -> (callable, list of dependency keys)
+        self.results = {}    # key -> value returned by the callable
+        self.timings = {}    # key -> (start, end) in perf_counter seconds
+
+    def add(self, key, task, dependencies=None) -> None:
+        '''add a task, a key already added is kept so a shared dependency runs only once'''
+        if key not in self.tasks:
+            self.tasks[key] = (task, list(dependencies or []))
+
+    def _timed(self, key, task):
+        start = time.perf_counter()
+        try:
+            return task()
+        finally:
+            self.timings[key] = (start, time.perf_counter())
+
+    def run(self) -> dict:
+        '''run all tasks, return a dict of key -> result; the first task exception is raised'''
+        for key, (_, dependencies) in self.tasks.items():
+            for dependency in dependencies:
+                if dependency not in self.tasks:
+                    raise ReportDependencyCycleException(f'{key} depends on unknown task {dependency}')
+
+        pending = dict(self.tasks)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='report') as executor:
+            while pending or running:
+                ready = [key for key, (_, dependencies) in pending.items() if all(d in self.results for d in dependencies)]
+
+                for key in ready:
+                    task, _ = pending.pop(key)
+                    running[executor.submit(self._timed, key, task)] = key
+
+                if not running:
+                    raise ReportDependencyCycleException(f'Dependency cycle between reports: {list(pending.keys())}')
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    try:
+                        self.results[key] = future.result()
+                    except BaseException:
+                        for other in running:
+                            other.cancel()
+                        raise
+
+        return self.results
+
+    def critical_path(self) -> list:
+        '''return the chain of (key, duration) ending with the last task to finish'''
+        if not self.timings:
+            return []
+
+        path = []
+        key = max(self.timings, key=lambda k: self.timings[k][1])
+        while key is not None:
+            start, end = self.timings[key]
+            path.append((key, end - start))
+
+            dependencies = [d for d in self.tasks[key][1] if d in self.timings]
+            key = max(dependencies, key=lambda k: self.timings[k][1]) if dependencies else None
+
+        return list(reversed(path))
+
+    def summary(self) -> str:
+        '''one line summary of the run: wall time, total task time and critical path'''
+        if not self.timings:
+            return 'no report executed'
+
+        wall = max(end for _, end in self.timings.values()) - min(start for start, _ in self.timings.values())
+        work = sum(end - start for start, end in self.timings.values())
+        path = ' -> '.join(f'{key} ({duration:.2f}s)' for key, duration in self.critical_path())
+
+        return f'{len(self.timings)} tasks, {self.max_workers} workers, wall time {wall:.2f}s, task time {work:.2f}s, critical path: {path}'
@@ -21,6 +21,7 @@ from ...report_providers.report_providers import ReportProviderBase
 from rich.progress import track
 from pathlib import Path
 from ...config.config import Config
+from ...service_helpers.trusted_advisor import TrustedAdvisorChecks
 
 
 # Required to load modules from vendored subfolder (for clean development env)
@@ -86,11 +87,22 @@ class TaReports(ReportProviderBase):
         '''setup instrcutions for ta report type'''
                 #Array of reports ready to be output to Excel.
         try:
-            self.client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('support',  self.appConfig.default_selected_region)
+            self.client = self.appConfig.get_client('support', region_name=self.appConfig.default_selected_region)
         except Exception as e:
             self.appConfig.console.print(f'\n[red]Unable to establish boto session for TrustedAdvisor. \n{e}[/red]')
             sys.exit()
 
+        self.ta_checks = TrustedAdvisorChecks(self.client)
+
+    def prepare_reports(self, report_objects) -> None:
+        '''fetch the check results of all TA reports of the run at once, checks without flagged resources are not requested'''
+        try:
+            catalog = self.ta_checks.get_catalog()
+            self.ta_checks.prefetch([catalog[r.common_name()]['id'] for r in report_objects if r.common_name() in catalog])
+        except Exception as e:
+            # each report requests its own check result
+            self.logger.warning(f'Unable to prefetch Trusted Advisor check results: {e}')
+
     def run_additional_logic_for_provider(self, report_object, additional_input_data=None) -> None:
         self.additional_input_data = additional_input_data
 
@@ -143,29 +155,29 @@ class TaReports(ReportProviderBase):
         def run_query( report_object, display = True):
             try:
 
-                TaQuery = report_object.sql(self.list_ta_checks)
+                TaQuery = report_object.sql(list_ta_checks)
 
                 if (TaQuery):
                     Name=TaQuery.get("Name", self.long_name())
                     Id=TaQuery.get("ID", '???')
 
                     if report_object.service_name() == self.long_name():
-                        report_object.addTaReport( self.client , Name, Id, display)
+                        report_object.addTaReport( self.ta_checks , Name, Id, display)
 
                     self.logger.info(f'Running Trusted Advisor query: {report_name} ')
             except Exception as e:
                 self.logger.error('Exception occured when during execution of TA query')
                 self.logger.exception(e)
                 self.appConfig.console.print(f'\n[red underline]Exception occured when during execution of TA query >>> {e}')
-                sys.exit()
+                raise
 
         try:
-            self.list_ta_checks = self.client.describe_trusted_advisor_checks(language='en')
+            list_ta_checks = {'checks': list(self.ta_checks.get_catalog().values())}
         except Exception as e:
             self.logger.error('Exception occured when during execution of TA query')
             self.logger.exception(e)
             self.appConfig.console.print(f'\n[red underline]Exception occured when during execution of TA query {e}')
-            sys.exit()
+            raise
 
         report_name = report_object.name()
         
@@ -205,7 +217,7 @@ class TaReports(ReportProviderBase):
 
             report_name = q.name()
 
-            if self.appConfig.cow_execution_type == 'sync':
+            if self.appConfig.cow_execution_type in ('sync', 'async'):
 
                 self.logger.info(f'Getting status of report {report_name}')
 
@@ -29,7 +29,7 @@ class TaBase(ReportBase, ABC):
         self.ESTIMATED_SAVINGS_CAPTION = "Estimated_Monthly_Savings"
 
         try:
-            self.client = self.appConfig.auth_manager.aws_cow_account_boto_session.client('trustedadvisor', region_name=self.appConfig.default_selected_region)
+            self.client = self.appConfig.get_client('trustedadvisor', region_name=self.appConfig.default_selected_region)
         except Exception as e:
             self.appConfig.console.print(f'\n[red]Unable to establish boto session for TrustedAdvisor. \nPlease verify credentials in ~/.aws/ or Environment Variables like account ID, region and role ![/red]')
             sys.exit()
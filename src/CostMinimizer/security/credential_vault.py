@@ -0,0 +1,72 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import logging
+import threading
+from datetime import datetime, timezone, timedelta
+
+import boto3
+
+DEFAULT_REFRESH_MARGIN = 300
+
+class CredentialVault:
+    '''
+    process-wide cache of assumed-role sessions
+
+    A session is reused until refresh_margin seconds before its credentials expire, so every
+    provider and report working on a linked account shares one assume_role call. Roles are
+    locked individually: concurrent requests for the same role wait for a single assume_role.
+    '''
+
+    def __init__(self, refresh_margin=DEFAULT_REFRESH_MARGIN) -> None:
+        self.logger = logging.getLogger(__name__)
+        self.refresh_margin = refresh_margin
+
+        self._lock = threading.Lock()
+        self._role_locks = {}
+        self._sessions = {}  # (role arn, external id) -> (session, expiration)
+
+        self.stats = {'assume_role_requests': 0, 'assume_role_calls': 0}
+
+    def _role_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._role_locks.setdefault(key, threading.Lock())
+
+    def get_session(self, sts_client, role_arn, session_name, external_id=None) -> boto3.Session:
+        '''return a session for role_arn, assuming the role only when no valid cached credentials exist'''
+        key = (role_arn, external_id)
+
+        with self._role_lock(key):
+            with self._lock:
+                self.stats['assume_role_requests'] += 1
+                cached = self._sessions.get(key)
+
+            now = datetime.now(timezone.utc)
+            if cached is not None and cached[1] - timedelta(seconds=self.refresh_margin) > now:
+                return cached[0]
+
+            assume_role_kwargs = {'RoleArn': role_arn, 'RoleSessionName': session_name}
+            if external_id:
+                assume_role_kwargs['ExternalId'] = external_id
+
+            credentials = sts_client.assume_role(**assume_role_kwargs)['Credentials']
+            session = boto3.Session(
+                aws_access_key_id=credentials['AccessKeyId'],
+                aws_secret_access_key=credentials['SecretAccessKey'],
+                aws_session_token=credentials['SessionToken'])
+
+            with self._lock:
+                self.stats['assume_role_calls'] += 1
+                self._sessions[key] = (session, credentials['Expiration'])
+
+            self.logger.info(f'Assumed role {role_arn}, credentials valid until {credentials["Expiration"]}')
+            return session
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
@@ -0,0 +1,90 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ..config.config import Config
+
+DESCRIBE_TRAILS_BATCH_SIZE = 20
+
+TRAIL_COLUMNS = ['trail_arn', 'cloudtrail_name', 'home_region', 'is_multi_region_trail', 'is_organization_trail']
+
+class TrailInventory:
+    '''
+    CloudTrail trails of the regions present in a CUR result
+
+    Each region pages list_trails and describes its trails by ARN, regions run concurrently.
+    The trails of each (account, region) are memoized for the run.
+    '''
+
+    # (account, region) -> list of trail dicts with TRAIL_COLUMNS, shared by all instances
+    _trails = {}
+    _trails_lock = threading.Lock()
+
+    def __init__(self, account=None, max_workers=None) -> None:
+        self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+
+        ct_config = self.appConfig.internals['internals'].get('cloudtrail', {})
+        self.max_workers = max(1, int(max_workers or ct_config.get('max_workers', 8)))
+        self.account = account or self.appConfig.get_caller_identity()['Account']
+
+    @classmethod
+    def reset(cls) -> None:
+        '''forget the trails described by the previous run'''
+        with cls._trails_lock:
+            TrailInventory._trails = {}
+
+    def get_region_trails(self, region) -> list:
+        '''list and describe the trails visible from region, [] when CloudTrail cannot be read'''
+        try:
+            client = self.appConfig.get_client('cloudtrail', region_name=region)
+
+            arns = []
+            for page in client.get_paginator('list_trails').paginate():
+                arns.extend(trail['TrailARN'] for trail in page.get('Trails', []))
+
+            trails = []
+            for i in range(0, len(arns), DESCRIBE_TRAILS_BATCH_SIZE):
+                response = client.describe_trails(trailNameList=arns[i:i + DESCRIBE_TRAILS_BATCH_SIZE], includeShadowTrails=True)
+                trails.extend(response.get('trailList', []))
+        except Exception as e:
+            self.logger.error(f'Error retrieving CloudTrail trails in {region}: {e}')
+            return []
+
+        return [{
+            'trail_arn': trail['TrailARN'],
+            'cloudtrail_name': trail.get('Name', ''),
+            'home_region': trail.get('HomeRegion', ''),
+            'is_multi_region_trail': trail.get('IsMultiRegionTrail', False),
+            'is_organization_trail': trail.get('IsOrganizationTrail', False)} for trail in trails]
+
+    def get_trails(self, regions) -> pd.DataFrame:
+        '''return one row per trail visible from regions with TRAIL_COLUMNS'''
+        regions = sorted(set(regions))
+
+        with TrailInventory._trails_lock:
+            missing = [region for region in regions if (self.account, region) not in TrailInventory._trails]
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='cloudtrail') as executor:
+                results = list(executor.map(self.get_region_trails, missing))
+
+            with TrailInventory._trails_lock:
+                TrailInventory._trails.update({(self.account, region): trails for region, trails in zip(missing, results)})
+
+        rows = [trail for region in regions for trail in TrailInventory._trails[(self.account, region)]]
+        df = pd.DataFrame(rows, columns=TRAIL_COLUMNS).drop_duplicates(subset='trail_arn')
+
+        self.logger.info(f'CloudTrail inventory: {len(df)} trails in {len(regions)} regions, {len(missing)} regions requested')
+
+        return df
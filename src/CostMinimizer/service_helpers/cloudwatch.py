@@ -0,0 +1,172 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import os
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ..config.config import Config
+
+MAX_QUERIES_PER_REQUEST = 500
+
+# datapoints may still be published this long after the end of a window
+CLOSED_WINDOW_DELAY = timedelta(hours=1)
+
+METRIC_COLUMNS = ['account', 'region', 'label', 'namespace', 'metric_name', 'stat', 'period', 'timestamp', 'value']
+
+# part of the cache key, bumped when cached results must not be read back
+CACHE_VERSION = 2
+
+def metric_spec(namespace, metric_name, dimensions, stat='Average', period=300, label=None) -> dict:
+    '''declare a metric to fetch, dimensions = dict of dimension name -> value; label defaults to the first dimension value'''
+    return {
+        'namespace': namespace,
+        'metric_name': metric_name,
+        'dimensions': dict(dimensions),
+        'stat': stat,
+        'period': period,
+        'label': label if label is not None else str(next(iter(dimensions.values()), metric_name))}
+
+class MetricDataFetcher:
+    '''
+    fetch CloudWatch metrics of many resources with GetMetricData
+
+    Metric specs are packed MAX_QUERIES_PER_REQUEST per call and NextToken is followed.
+    Account/region batches run concurrently, each with a client of its own account. The
+    results of a closed time window do not change, so they are cached on disk and read back
+    by the next runs; cache files older than cache_retention_days are purged.
+    '''
+
+    def __init__(self, max_workers=None, cache_directory=None) -> None:
+        self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+
+        cw_config = self.appConfig.internals['internals'].get('cloudwatch', {})
+        self.max_workers = max(1, int(max_workers or cw_config.get('max_workers', 8)))
+        self.cache_directory = Path(cache_directory or self.appConfig.app_path / cw_config.get('cache_directory', 'metrics_cache'))
+        self.cache_retention_days = float(cw_config.get('cache_retention_days', 35))
+
+        # (account, region) batches of the last fetch that could not be read, e.g. the role of a linked account is missing
+        self.failed_batches = set()
+
+    def fetch(self, requests, start_time, end_time) -> pd.DataFrame:
+        '''
+        requests = dict of (account, region) -> list of metric_spec()
+        return one row per datapoint with METRIC_COLUMNS, series without datapoints have no row
+
+        A batch that fails has no row and its (account, region) is added to failed_batches,
+        so that its resources are not mistaken for resources without datapoints.
+        '''
+        self.failed_batches = set()
+        self.purge_expired_cache()
+
+        batches = {key: specs for key, specs in requests.items() if specs}
+        if not batches:
+            return pd.DataFrame(columns=METRIC_COLUMNS)
+
+        def fetch_batch(key):
+            try:
+                return self.fetch_batch(key[0], key[1], batches[key], start_time, end_time)
+            except Exception as e:
+                self.logger.warning(f'CloudWatch metrics of account {key[0]} in {key[1]} not fetched: {e}')
+                self.failed_batches.add(key)
+                return pd.DataFrame(columns=METRIC_COLUMNS)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='cloudwatch') as executor:
+            frames = list(executor.map(fetch_batch, batches))
+
+        return pd.concat(frames, ignore_index=True)
+
+    def fetch_batch(self, account, region, specs, start_time, end_time) -> pd.DataFrame:
+        '''metrics of one account/region, from the cache when the window is closed and already fetched'''
+        closed = end_time <= datetime.now(timezone.utc) - CLOSED_WINDOW_DELAY
+        cache_file = self.get_cache_file(account, region, specs, start_time, end_time)
+
+        if closed and cache_file.is_file():
+            return pd.read_pickle(cache_file)
+
+        # metrics are only visible to the account owning the resources
+        df = self.get_metric_data(self.appConfig.get_account_client(account, 'cloudwatch', region_name=region), specs, start_time, end_time)
+        df.insert(0, 'account', account)
+        df.insert(1, 'region', region)
+
+        if closed:
+            os.makedirs(cache_file.parent, exist_ok=True)
+            df.to_pickle(cache_file.with_suffix('.tmp'))
+            os.replace(cache_file.with_suffix('.tmp'), cache_file)
+
+        return df
+
+    def get_metric_data(self, client, specs, start_time, end_time) -> pd.DataFrame:
+        rows = []
+
+        for i in range(0, len(specs), MAX_QUERIES_PER_REQUEST):
+            batch = specs[i:i + MAX_QUERIES_PER_REQUEST]
+            queries = [self.to_query(f'm{j}', spec) for j, spec in enumerate(batch)]
+            kwargs = {'MetricDataQueries': queries, 'StartTime': start_time, 'EndTime': end_time}
+
+            while True:
+                response = client.get_metric_data(**kwargs)
+
+                for result in response.get('MetricDataResults', []):
+                    spec = batch[int(result['Id'][1:])]
+                    for timestamp, value in zip(result.get('Timestamps', []), result.get('Values', [])):
+                        rows.append((spec['label'], spec['namespace'], spec['metric_name'], spec['stat'], spec['period'], timestamp, value))
+
+                next_token = response.get('NextToken')
+                if not next_token:
+                    break
+                kwargs['NextToken'] = next_token
+
+        return pd.DataFrame(rows, columns=METRIC_COLUMNS[2:])
+
+    @staticmethod
+    def to_query(query_id, spec) -> dict:
+        return {
+            'Id': query_id,
+            'Label': spec['label'],
+            'MetricStat': {
+                'Metric': {
+                    'Namespace': spec['namespace'],
+                    'MetricName': spec['metric_name'],
+                    'Dimensions': [{'Name': name, 'Value': value} for name, value in spec['dimensions'].items()]},
+                'Period': spec['period'],
+                'Stat': spec['stat']},
+            'ReturnData': True}
+
+    def get_cache_file(self, account, region, specs, start_time, end_time):
+        key = json.dumps([CACHE_VERSION, account, region, specs, start_time.isoformat(), end_time.isoformat()], sort_keys=True, default=str)
+        return self.cache_directory / f'{hashlib.md5(key.encode()).hexdigest()}.pkl'
+
+    def purge_expired_cache(self) -> list:
+        '''delete the cache files written more than cache_retention_days ago, return their names'''
+        if not self.cache_directory.is_dir():
+            return []
+
+        expiration = time.time() - self.cache_retention_days * 86400
+        purged = []
+        for cache_file in self.cache_directory.glob('*.pkl'):
+            try:
+                if cache_file.stat().st_mtime < expiration:
+                    cache_file.unlink()
+                    purged.append(cache_file.name)
+            except FileNotFoundError:
+                # purged by a concurrent run
+                continue
+
+        if purged:
+            self.logger.info(f'CloudWatch metrics cache: {len(purged)} expired files purged')
+
+        return purged
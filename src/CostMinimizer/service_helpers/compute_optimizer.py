@@ -0,0 +1,268 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import time
+import logging
+import threading
+
+import pandas as pd
+
+from ..config.config import Config
+
+MAX_RESULTS = 1000
+MAX_RECOMMENDATION_OPTIONS = 3
+CSV_CHUNK_SIZE = 10000
+
+# fields requested from export_ec2_instance_recommendations, enough to rebuild the API records
+EC2_EXPORT_FIELDS = [
+    'AccountId',
+    'InstanceArn',
+    'InstanceName',
+    'CurrentInstanceType',
+    'Finding',
+    'RecommendationOptionsInstanceType',
+    'RecommendationOptionsEstimatedMonthlySavingsValue',
+    'RecommendationOptionsMigrationEffort']
+
+class ComputeOptimizerExportFailed(Exception):
+    pass
+
+# findings that never carry a savings opportunity
+OPTIMIZED_FINDINGS = ['Optimized']
+
+class ComputeOptimizerQuery:
+    '''
+    retrieve all Compute Optimizer recommendations of the account
+
+    EC2 recommendations are paged with nextToken. When an export bucket is configured and
+    get_recommendation_summaries reports more than bulk_export_threshold instances, they are
+    exported to S3 instead and the CSV is streamed back into the same records as the API.
+
+    With summary_first, the summaries are read first and detailed recommendations are only
+    requested for the accounts and findings with a savings opportunity, so Optimized resources
+    are left out of the reports. It is off by default and ignored when recommendation preferences
+    are passed, as the summaries are computed with the default preferences of the account.
+    '''
+
+    # client -> recommendation summaries, read once per run and shared by all CO reports
+    _summaries = {}
+    _summaries_lock = threading.Lock()
+
+    def __init__(self, client, s3_client=None) -> None:
+        self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.s3_client = s3_client
+
+        co_config = self.appConfig.internals['internals'].get('compute_optimizer', {})
+        self.export_bucket = co_config.get('export_bucket') or None
+        self.export_key_prefix = co_config.get('export_key_prefix', 'costminimizer/compute-optimizer')
+        self.bulk_export_threshold = int(co_config.get('bulk_export_threshold', 5000))
+        self.export_poll_interval = float(co_config.get('export_poll_interval', 10))
+        self.export_timeout = float(co_config.get('export_timeout', 900))
+        self.summary_first = str(co_config.get('summary_first', False)).lower() in ('true', 'yes', '1', 't', 'y')
+
+    @classmethod
+    def reset(cls) -> None:
+        '''forget the recommendation summaries read by the previous run'''
+        with cls._summaries_lock:
+            ComputeOptimizerQuery._summaries = {}
+
+    def paginate(self, method, result_key, **kwargs) -> list:
+        '''call a Compute Optimizer get_* method until nextToken is exhausted'''
+        results = []
+        kwargs['maxResults'] = MAX_RESULTS
+
+        while True:
+            response = getattr(self.client, method)(**kwargs)
+            results.extend(response.get(result_key, []))
+
+            next_token = response.get('nextToken')
+            if not next_token:
+                break
+            kwargs['nextToken'] = next_token
+
+        return results
+
+    def get_recommendation_summaries(self) -> list:
+        '''all recommendation summaries of the client, paged once and cached'''
+        with ComputeOptimizerQuery._summaries_lock:
+            if self.client not in ComputeOptimizerQuery._summaries:
+                summaries = []
+                kwargs = {}
+
+                while True:
+                    response = self.client.get_recommendation_summaries(**kwargs)
+                    summaries.extend(response.get('recommendationSummaries', []))
+
+                    next_token = response.get('nextToken')
+                    if not next_token:
+                        break
+                    kwargs['nextToken'] = next_token
+
+                ComputeOptimizerQuery._summaries[self.client] = summaries
+
+            return ComputeOptimizerQuery._summaries[self.client]
+
+    def count_ec2_instance_recommendations(self) -> int:
+        '''number of EC2 instances with a recommendation, from the recommendation summaries'''
+        count = 0
+        for summary in self.get_recommendation_summaries():
+            if summary.get('recommendationResourceType') == 'Ec2Instance':
+                count += int(sum(s.get('value', 0) for s in summary.get('summaries', [])))
+
+        return count
+
+    def plan_requests(self, resource_type) -> dict:
+        '''
+        return dict of account id -> {'findings': [...], 'count': n} worth a detailed request
+
+        Accounts whose summary reports no savings opportunity are skipped, as are the
+        findings without any resource. None when the summaries cannot be read.
+        '''
+        try:
+            summaries = self.get_recommendation_summaries()
+        except Exception as e:
+            self.logger.warning(f'Unable to read Compute Optimizer summaries, requesting all recommendations: {e}')
+            return None
+
+        plan = {}
+        for summary in summaries:
+            if summary.get('recommendationResourceType') != resource_type:
+                continue
+
+            # a missing savings opportunity is unknown, not zero
+            savings = summary.get('savingsOpportunity', {}).get('estimatedMonthlySavings', {}).get('value')
+            if savings is not None and savings <= 0:
+                continue
+
+            findings = {s['name']: int(s.get('value', 0)) for s in summary.get('summaries', [])
+                if s.get('name') not in OPTIMIZED_FINDINGS and s.get('value', 0) > 0}
+            if findings:
+                plan[summary['accountId']] = {'findings': sorted(findings), 'count': sum(findings.values())}
+
+        self.logger.info(f'Compute Optimizer {resource_type}: {sum(p["count"] for p in plan.values())} recommendations to fetch in {len(plan)} accounts')
+        return plan
+
+    def use_bulk_export(self, plan=None) -> bool:
+        if not self.export_bucket:
+            return False
+
+        try:
+            count = sum(p['count'] for p in plan.values()) if plan is not None else self.count_ec2_instance_recommendations()
+        except Exception as e:
+            self.logger.warning(f'Unable to count Compute Optimizer recommendations, using the API: {e}')
+            return False
+
+        self.logger.info(f'Compute Optimizer: {count} EC2 instance recommendations, bulk export threshold {self.bulk_export_threshold}')
+        return count >= self.bulk_export_threshold
+
+    def get_planned_recommendations(self, method, result_key, plan, **kwargs) -> list:
+        '''one paged request per planned account, filtered on its findings; the API accepts a single account id per request'''
+        results = []
+        for account_id, account_plan in plan.items():
+            results.extend(self.paginate(method, result_key,
+                accountIds=[account_id],
+                filters=[{'name': 'Finding', 'values': account_plan['findings']}],
+                **kwargs))
+
+        return results
+
+    def get_ec2_instance_recommendations(self, recommendation_preferences=None) -> list:
+        '''return every EC2 instance recommendation, as returned in instanceRecommendations by the API'''
+        kwargs = {'recommendationPreferences': recommendation_preferences} if recommendation_preferences else {}
+        plan = self.plan_requests('Ec2Instance') if self.summary_first and not recommendation_preferences else None
+
+        if self.use_bulk_export(plan):
+            if plan is not None:
+                kwargs['accountIds'] = sorted(plan)
+                kwargs['filters'] = [{'name': 'Finding', 'values': sorted({f for p in plan.values() for f in p['findings']})}]
+            try:
+                return self.export_ec2_instance_recommendations(**kwargs)
+            except Exception as e:
+                self.logger.warning(f'Compute Optimizer export failed, using the API: {e}')
+            kwargs.pop('accountIds', None)
+            kwargs.pop('filters', None)
+
+        if plan is not None:
+            return self.get_planned_recommendations('get_ec2_instance_recommendations', 'instanceRecommendations', plan, **kwargs)
+
+        return self.paginate('get_ec2_instance_recommendations', 'instanceRecommendations', **kwargs)
+
+    def get_ebs_volume_recommendations(self) -> list:
+        '''return every EBS volume recommendation, as returned in volumeRecommendations by the API'''
+        plan = self.plan_requests('EbsVolume') if self.summary_first else None
+
+        if plan is not None:
+            return self.get_planned_recommendations('get_ebs_volume_recommendations', 'volumeRecommendations', plan)
+
+        return self.paginate('get_ebs_volume_recommendations', 'volumeRecommendations')
+
+    def export_ec2_instance_recommendations(self, **kwargs) -> list:
+        '''export the recommendations to S3, wait for the export job and read the CSV back'''
+        response = self.client.export_ec2_instance_recommendations(
+            s3DestinationConfig={'bucket': self.export_bucket, 'keyPrefix': self.export_key_prefix},
+            fieldsToExport=EC2_EXPORT_FIELDS,
+            fileFormat='Csv',
+            **kwargs)
+
+        job_id = response['jobId']
+        destination = response['s3Destination']
+        self.wait_for_export_job(job_id)
+
+        s3_client = self.s3_client or self.appConfig.get_client('s3')
+        body = s3_client.get_object(Bucket=destination['bucket'], Key=destination['key'])['Body']
+
+        return self.read_export_csv(body)
+
+    def wait_for_export_job(self, job_id) -> None:
+        deadline = time.monotonic() + self.export_timeout
+
+        while True:
+            job = self.client.describe_recommendation_export_jobs(jobIds=[job_id])['recommendationExportJobs'][0]
+
+            if job['status'] == 'Complete':
+                return
+            if job['status'] == 'Failed':
+                raise ComputeOptimizerExportFailed(f'Export job {job_id} failed: {job.get("failureReason", "")}')
+            if time.monotonic() > deadline:
+                raise ComputeOptimizerExportFailed(f'Export job {job_id} not complete after {self.export_timeout} seconds')
+
+            time.sleep(self.export_poll_interval)
+
+    def read_export_csv(self, body) -> list:
+        '''stream the exported CSV in chunks and convert each row into an instanceRecommendations record'''
+        recommendations = []
+
+        for chunk in pd.read_csv(body, chunksize=CSV_CHUNK_SIZE, dtype=str, keep_default_na=False):
+            recommendations.extend(self.convert_export_row(row) for row in chunk.to_dict('records'))
+
+        return recommendations
+
+    def convert_export_row(self, row) -> dict:
+        '''the export flattens the ranked options into recommendationOptions_<rank>_<field> columns'''
+        options = []
+        for rank in range(1, MAX_RECOMMENDATION_OPTIONS + 1):
+            instance_type = row.get(f'recommendationOptions_{rank}_instanceType', '')
+            if not instance_type:
+                continue
+
+            savings = row.get(f'recommendationOptions_{rank}_estimatedMonthlySavings_value', '')
+            options.append({
+                'instanceType': instance_type,
+                'rank': rank,
+                'migrationEffort': row.get(f'recommendationOptions_{rank}_migrationEffort', ''),
+                'savingsOpportunity': {'estimatedMonthlySavings': {'value': float(savings) if savings else 0.0}}})
+
+        return {
+            'accountId': row['accountId'],
+            'instanceArn': row['instanceArn'],
+            'instanceName': row.get('instanceName', ''),
+            'currentInstanceType': row['currentInstanceType'],
+            'finding': row['finding'],
+            'recommendationOptions': options}
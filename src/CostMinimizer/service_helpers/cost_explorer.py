@@ -0,0 +1,232 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import date, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+from ..config.config import Config
+
+DEFAULT_TAG_CATALOG_TTL = 86400
+
+class ClosedMonthCache:
+    '''
+    serve the closed months of MONTHLY get_cost_and_usage requests from disk
+
+    Results are split per (request shape, month), the request shape being the request
+    without its TimePeriod, scoped to the caller account and the customer profile. Months that ended more than grace_days ago and are no longer
+    estimated do not change, so only the other months are requested from Cost Explorer,
+    in a single request spanning them.
+    '''
+
+    def __init__(self, cache_directory=None, grace_days=None, account=None, profile_name=None) -> None:
+        self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+
+        ce_config = self.appConfig.internals['internals'].get('ce_reports', {})
+        self.cache_directory = Path(cache_directory or self.appConfig.app_path / ce_config.get('cache_directory', 'ce_cache'))
+        self.grace_days = int(grace_days if grace_days is not None else ce_config.get('closed_month_grace_days', 3))
+
+        # the same request returns the costs of another payer for another account or customer profile
+        self.account = account or self.appConfig.get_caller_identity()['Account']
+        self.profile_name = profile_name if profile_name is not None else self.get_profile_name()
+
+    def get_profile_name(self) -> str:
+        '''AWS profile of the selected customer, '' when no customer is selected'''
+        try:
+            return self.appConfig.customers.get_customer_profile_name(self.appConfig.customers.selected_customer) or ''
+        except Exception:
+            return ''
+
+    @staticmethod
+    def split_months(time_period) -> list:
+        '''return the (start, end) iso dates of each calendar month of a TimePeriod, End is exclusive'''
+        start = date.fromisoformat(time_period['Start'])
+        end = date.fromisoformat(time_period['End'])
+
+        months = []
+        while start < end:
+            month_end = min(start.replace(day=1) + relativedelta(months=1), end)
+            months.append((start.isoformat(), month_end.isoformat()))
+            start = month_end
+
+        return months
+
+    def get_shape_key(self, request) -> str:
+        shape = {k: v for k, v in request.items() if k not in ('TimePeriod', 'NextPageToken')}
+        scope = {'account': self.account, 'profile_name': self.profile_name, 'request': shape}
+        return hashlib.md5(json.dumps(scope, sort_keys=True, default=str).encode()).hexdigest()
+
+    def is_closed(self, month_end) -> bool:
+        return date.fromisoformat(month_end) <= date.today() - timedelta(days=self.grace_days)
+
+    def get_cache_file(self, shape_key, start, end) -> Path:
+        return self.cache_directory / shape_key / f'{start}_{end}.json'
+
+    def read(self, shape_key, start, end):
+        '''return the cached result of a month, None when not cached or unreadable'''
+        try:
+            with open(self.get_cache_file(shape_key, start, end)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, shape_key, start, end, result) -> None:
+        cache_file = self.get_cache_file(shape_key, start, end)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            self.logger.warning(f'Unable to write Cost Explorer cache file {cache_file}: {e}')
+
+    @staticmethod
+    def fetch(client, request) -> list:
+        '''return the ResultsByTime of all pages, the groups of a month spread over several pages are merged'''
+        results = {}
+        kwargs = dict(request)
+
+        while True:
+            response = client.get_cost_and_usage(**kwargs)
+
+            for result in response['ResultsByTime']:
+                start = result['TimePeriod']['Start']
+                if start in results:
+                    results[start]['Groups'].extend(result.get('Groups', []))
+                else:
+                    results[start] = dict(result, Groups=list(result.get('Groups', [])))
+
+            if not response.get('NextPageToken'):
+                break
+            kwargs['NextPageToken'] = response['NextPageToken']
+
+        return list(results.values())
+
+    def get_results(self, client, request) -> list:
+        '''ResultsByTime of request, closed months read from the cache and the others requested'''
+        if request.get('Granularity') != 'MONTHLY':
+            return self.fetch(client, request)
+
+        shape_key = self.get_shape_key(request)
+        months = self.split_months(request['TimePeriod'])
+
+        results = {}
+        missing = []
+        for start, end in months:
+            cached = self.read(shape_key, start, end) if self.is_closed(end) else None
+            if cached is None:
+                missing.append((start, end))
+            else:
+                results[start] = cached
+
+        if missing:
+            # one request spanning all missing months, usually only the latest ones
+            span = dict(request, TimePeriod={'Start': missing[0][0], 'End': missing[-1][1]})
+            for result in self.fetch(client, span):
+                start, end = result['TimePeriod']['Start'], result['TimePeriod']['End']
+                results[start] = result
+
+                if self.is_closed(end) and not result.get('Estimated', False):
+                    self.write(shape_key, start, end, result)
+
+        self.logger.info(f'Cost Explorer cache: {len(months) - len(missing)} of {len(months)} months served from {self.cache_directory}')
+
+        return [results[start] for start, _ in months if start in results]
+
+class CostAllocationTagCatalog:
+    '''
+    values of the cost allocation tags used to filter CE reports, shared by all reports
+
+    get_tags is paged once per (account, tag key, search string, time window) and the values
+    are kept in the database for tag_catalog_ttl seconds, so reports only do dictionary lookups.
+    '''
+
+    # (account, tag key, search string, start, end) -> (list of tag values, fetch time), shared by all instances
+    _tag_values = {}
+    # (account, tag key, search string, start, end) -> lock held while its values are fetched
+    _key_locks = {}
+    _tag_values_lock = threading.Lock()
+
+    def __init__(self, client, account=None) -> None:
+        self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.account = account or self.appConfig.get_caller_identity()['Account']
+
+        ce_config = self.appConfig.internals['internals'].get('ce_reports', {})
+        self.tag_catalog_ttl = float(ce_config.get('tag_catalog_ttl', DEFAULT_TAG_CATALOG_TTL))
+
+    @classmethod
+    def reset(cls) -> None:
+        '''forget the tag values kept in memory by the previous run'''
+        with cls._tag_values_lock:
+            CostAllocationTagCatalog._tag_values = {}
+            CostAllocationTagCatalog._key_locks = {}
+
+    def get_cached_tag_values(self, key) -> list:
+        '''return the tag values of key kept in memory, None when missing or older than tag_catalog_ttl'''
+        with CostAllocationTagCatalog._tag_values_lock:
+            cached = CostAllocationTagCatalog._tag_values.get(key)
+
+        if cached is None or time.time() - cached[1] >= self.tag_catalog_ttl:
+            return None
+
+        return cached[0]
+
+    def fetch_tag_values(self, tag_key, search_string, start, end) -> list:
+        '''page through get_tags for the values of tag_key'''
+        values = []
+        kwargs = {'SearchString': search_string, 'TimePeriod': {'Start': start, 'End': end}, 'TagKey': tag_key}
+
+        while True:
+            response = self.client.get_tags(**kwargs)
+            values.extend(response.get('Tags', []))
+
+            if not response.get('NextPageToken'):
+                break
+            kwargs['NextPageToken'] = response['NextPageToken']
+
+        return values
+
+    def get_tag_values(self, tag_key, search_string, start, end) -> list:
+        '''return the values of tag_key matching search_string between start and end (iso dates)'''
+        key = (self.account, tag_key, search_string, start, end)
+
+        values = self.get_cached_tag_values(key)
+        if values is not None:
+            return values
+
+        with CostAllocationTagCatalog._tag_values_lock:
+            key_lock = CostAllocationTagCatalog._key_locks.setdefault(key, threading.Lock())
+
+        # get_tags is paged outside the catalog lock, one fetch per key at a time
+        with key_lock:
+            values = self.get_cached_tag_values(key)
+            if values is not None:
+                return values
+
+            values, fetch_time = self.appConfig.database.get_ce_tag_values(*key)
+
+            if values is None or time.time() - fetch_time >= self.tag_catalog_ttl:
+                values, fetch_time = self.fetch_tag_values(tag_key, search_string, start, end), time.time()
+                self.appConfig.database.upsert_ce_tag_values(*key, values, fetch_time)
+                self.logger.info(f'Cost Explorer tag catalog: {len(values)} values fetched for tag {tag_key} in {self.account}')
+
+            with CostAllocationTagCatalog._tag_values_lock:
+                CostAllocationTagCatalog._tag_values[key] = (values, fetch_time)
+
+        return values
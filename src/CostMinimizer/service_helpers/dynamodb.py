@@ -0,0 +1,103 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from ..config.config import Config
+
+LIST_GLOBAL_TABLES_LIMIT = 100
+
+GLOBAL_TABLE_COLUMNS = ['line_item_usage_account_id', 'region', 'global_table_name', 'global_table_version']
+
+# global table version of the tables of a region whose global tables could not be listed
+VERSION_NOT_INSPECTED = 'not inspected'
+
+class GlobalTableInspector:
+    '''
+    metadata of the DynamoDB global tables of a set of regions
+
+    list_global_tables is paged per region and the tables are described concurrently, with
+    a session of the inspected account. Table metadata is memoized per (account, region, table)
+    for the run, so every report and every account row of the CUR reuses the same describe_table answer.
+    '''
+
+    # (account, region, table name) -> global table version, shared by all instances
+    _versions = {}
+    _versions_lock = threading.Lock()
+
+    def __init__(self, account=None, max_workers=None) -> None:
+        self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+
+        ddb_config = self.appConfig.internals['internals'].get('dynamodb', {})
+        self.max_workers = max(1, int(max_workers or ddb_config.get('max_workers', 8)))
+        self.account = account or self.appConfig.get_caller_identity()['Account']
+
+        # regions of the last get_global_tables whose global tables could not be listed
+        self.failed_regions = set()
+
+    @classmethod
+    def reset(cls) -> None:
+        '''forget the global table versions described by the previous run'''
+        with cls._versions_lock:
+            GlobalTableInspector._versions = {}
+
+    def list_global_tables(self, region) -> list:
+        '''return the names of the global tables with a replica in region, all pages'''
+        client = self.appConfig.get_account_client(self.account, 'dynamodb', region_name=region)
+        names = []
+        kwargs = {'Limit': LIST_GLOBAL_TABLES_LIMIT}
+
+        while True:
+            response = client.list_global_tables(**kwargs)
+            names.extend(t['GlobalTableName'] for t in response.get('GlobalTables', []))
+
+            if not response.get('LastEvaluatedGlobalTableName'):
+                break
+            kwargs['ExclusiveStartGlobalTableName'] = response['LastEvaluatedGlobalTableName']
+
+        return names
+
+    def describe_table_version(self, region, table_name) -> str:
+        '''return the global table version of table_name, '' when the table cannot be described'''
+        try:
+            response = self.appConfig.get_account_client(self.account, 'dynamodb', region_name=region).describe_table(TableName=table_name)
+            return response['Table'].get('GlobalTableVersion', '')
+        except Exception as e:
+            self.logger.info(f'Unable to describe DynamoDB table {table_name} in {region}: {e}')
+            return ''
+
+    def get_global_tables(self, regions) -> pd.DataFrame:
+        '''return one row per global table of regions with GLOBAL_TABLE_COLUMNS, the regions that could not be listed are added to failed_regions'''
+        self.failed_regions = set()
+        tables = []
+        for region in sorted(set(regions)):
+            try:
+                tables.extend((self.account, region, name) for name in self.list_global_tables(region))
+            except Exception as e:
+                self.logger.error(f'Error listing DynamoDB global tables of account {self.account} in {region}: {e}')
+                self.failed_regions.add(region)
+
+        with GlobalTableInspector._versions_lock:
+            missing = [key for key in dict.fromkeys(tables) if key not in GlobalTableInspector._versions]
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='dynamodb') as executor:
+                versions = list(executor.map(lambda key: self.describe_table_version(key[1], key[2]), missing))
+
+            with GlobalTableInspector._versions_lock:
+                GlobalTableInspector._versions.update(zip(missing, versions))
+
+        self.logger.info(f'DynamoDB global tables: {len(tables)} tables in {len(set(regions))} regions, {len(missing)} described')
+
+        rows = [key + (GlobalTableInspector._versions[key],) for key in dict.fromkeys(tables)]
+        return pd.DataFrame(rows, columns=GLOBAL_TABLE_COLUMNS)
@@ -6,21 +6,47 @@ __license__ = "Apache-2.0"
 
 from ..constants import __tooling_name__
 
+import threading
+import pandas as pd
+
 from ..config.config import Config
 
 class Ec2Query:
 
+    # resource id -> unblended cost of the precondition CUR report, shared by all Ec2Query instances
+    _cost_index = None
+    _cost_index_source = None
+    _cost_index_lock = threading.Lock()
+
     def __init__(self):
         self.appConfig = Config()
-    
+
+    def get_precondition_cost_index(self) -> dict:
+        '''return the precondition report costs indexed by line_item_resource_id, built once per precondition report'''
+        report = self.appConfig.precondition_reports.precondition_reports_in_progress[0]
+
+        with Ec2Query._cost_index_lock:
+            if Ec2Query._cost_index is None or Ec2Query._cost_index_source is not report:
+                df = report.get_report_dataframe()
+
+                # keep the first row of each resource, unparsable costs count as 0.0
+                df = df.drop_duplicates(subset='line_item_resource_id', keep='first')
+                costs = pd.to_numeric(df['line_item_unblended_cost'], errors='coerce').fillna(0.0)
+
+                Ec2Query._cost_index = dict(zip(df['line_item_resource_id'], costs.astype(float)))
+                Ec2Query._cost_index_source = report
+
+            return Ec2Query._cost_index
+
     def get_instance_unblended_cost_from_cur(self, instance_id):
-        df = self.appConfig.precondition_reports.precondition_reports_in_progress[0].get_report_dataframe()
-        mask = df['line_item_resource_id'] == instance_id
+        cost = self.get_precondition_cost_index().get(instance_id, 0.0)
+        currency = 'usd'
+
+        return cost, currency
 
-        try:
-            cost = float(df[mask].line_item_unblended_cost.values[0])
-        except:
-            cost = 0.0
+    def get_instances_unblended_cost_from_cur(self, instance_ids) -> dict:
+        '''batch lookup, return a dict of instance id -> (cost, currency)'''
+        cost_index = self.get_precondition_cost_index()
         currency = 'usd'
 
-        return cost, currency
\ No newline at end of file
+        return {instance_id: (cost_index.get(instance_id, 0.0), currency) for instance_id in instance_ids}
@@ -0,0 +1,92 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import time
+import logging
+
+from ..config.config import Config
+
+DEFAULT_SNAPSHOT_TTL = 86400
+
+# list_accounts fields kept in the cow_orgaccounts snapshot
+ACCOUNT_FIELDS = ['Id', 'Arn', 'Email', 'Name', 'Status', 'JoinedMethod', 'JoinedTimestamp']
+
+class OrganizationSnapshot:
+    '''
+    local snapshot of the AWS Organization of the tooling account
+
+    describe_organization and the paginated list_accounts are only called when the snapshot
+    stored in the database is older than ttl seconds; the refresh upserts the current
+    accounts and removes the ones that left the organization.
+    '''
+
+    def __init__(self, client=None, ttl=None) -> None:
+        self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+
+        if ttl is None:
+            ttl = self.appConfig.internals['internals'].get('account_discovery', {}).get('org_snapshot_ttl', DEFAULT_SNAPSHOT_TTL)
+        self.ttl = float(ttl)
+        self.client = client or self.appConfig.get_client('organizations')
+
+    def is_fresh(self, fetch_time) -> bool:
+        return fetch_time is not None and time.time() - fetch_time < self.ttl
+
+    def describe(self, caller_account_id) -> dict:
+        '''
+        return the organization of caller_account_id: organization_id, master_account_id, is_payer, fetch_time
+        an account outside of any organization is recorded with is_payer False and no organization_id
+        '''
+        snapshot = self.appConfig.database.get_org_snapshot(caller_account_id)
+        if snapshot and self.is_fresh(snapshot['fetch_time']):
+            return snapshot
+
+        try:
+            organization = self.client.describe_organization()['Organization']
+            organization_id = organization['Id']
+            master_account_id = organization['MasterAccountId']
+        except Exception as e:
+            if 'AWSOrganizationsNotInUseException' in str(e) or 'AccessDeniedException' in str(e):
+                self.logger.info("Account is not part of an AWS Organization - treating as standalone account")
+                organization_id, master_account_id = None, None
+            else:
+                raise
+
+        snapshot = {
+            'caller_account_id': caller_account_id,
+            'organization_id': organization_id,
+            'master_account_id': master_account_id,
+            'is_payer': master_account_id == caller_account_id,
+            'fetch_time': time.time()}
+        self.appConfig.database.upsert_org_snapshot(snapshot)
+
+        return snapshot
+
+    def crawl_accounts(self) -> list:
+        '''return every account of the organization, following list_accounts pagination'''
+        accounts = []
+        for page in self.client.get_paginator('list_accounts').paginate():
+            for account in page.get('Accounts', []):
+                record = {field: account.get(field) for field in ACCOUNT_FIELDS}
+                if record['JoinedTimestamp'] is not None:
+                    record['JoinedTimestamp'] = record['JoinedTimestamp'].isoformat()
+                accounts.append(record)
+
+        return accounts
+
+    def list_accounts(self, organization_id) -> list:
+        '''return the accounts of organization_id from the snapshot, crawled again once the snapshot expired'''
+        accounts, fetch_time = self.appConfig.database.get_org_accounts(organization_id)
+        if accounts and self.is_fresh(fetch_time):
+            return accounts
+
+        accounts = self.crawl_accounts()
+        self.appConfig.database.replace_org_accounts(organization_id, accounts, time.time())
+        self.logger.info(f'Organization {organization_id}: {len(accounts)} accounts crawled')
+
+        return accounts
@@ -0,0 +1,121 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import logging
+from datetime import datetime
+
+from ..config.config import Config
+
+DEFAULT_PRODUCTS = ['EC2', 'Fargate', 'Lambda']
+DEFAULT_PLAN_TYPES = ['Compute', 'EC2Instance']
+DEFAULT_RATES_TTL = 604800
+MAX_RESULTS = 1000
+
+class SavingsPlansRatesLoader:
+    '''
+    bulk load savings plans offering rates into the cow_savingsplanrates table
+
+    Rates are paged from savingsplans.describe_savings_plans_offering_rates per region and
+    product type, so savings computations can compare on-demand and savings plan prices
+    from the database without any API call at report time.
+    '''
+
+    def __init__(self, client=None, products=None, plan_types=None) -> None:
+        self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+
+        sp_config = self.appConfig.internals['internals'].get('savings_plans', {})
+        self.products = products or sp_config.get('products', DEFAULT_PRODUCTS)
+        self.plan_types = plan_types or sp_config.get('plan_types', DEFAULT_PLAN_TYPES)
+        self.rates_ttl = float(sp_config.get('rates_ttl', DEFAULT_RATES_TTL))
+
+        # the Savings Plans API is global and only served from us-east-1
+        self.client = client or self.appConfig.get_client('savingsplans', region_name='us-east-1')
+
+    def fetch_rates(self, region, product) -> list:
+        '''page through all offering rates of a product in a region'''
+        rates = []
+        kwargs = {
+            'products': [product],
+            'savingsPlanTypes': self.plan_types,
+            'filters': [{'name': 'region', 'values': [region]}],
+            'maxResults': MAX_RESULTS
+        }
+
+        while True:
+            response = self.client.describe_savings_plans_offering_rates(**kwargs)
+            rates.extend(response.get('searchResults', []))
+
+            next_token = response.get('nextToken')
+            if not next_token:
+                break
+            kwargs['nextToken'] = next_token
+
+        return rates
+
+    def convert_rate(self, result, region, load_time) -> dict:
+        '''flatten one describe_savings_plans_offering_rates search result into a table row'''
+        offering = result.get('savingsPlanOffering', {})
+        properties = {p['name']: p['value'] for p in result.get('properties', [])}
+
+        rate_key = '|'.join([
+            offering.get('offeringId', ''),
+            result.get('productType', ''),
+            result.get('usageType', ''),
+            result.get('operation', '')])
+
+        return {
+            'rate_key': rate_key,
+            'offering_id': offering.get('offeringId'),
+            'plan_type': offering.get('planType'),
+            'payment_option': offering.get('paymentOption'),
+            'duration_seconds': offering.get('durationSeconds'),
+            'product_type': result.get('productType'),
+            'service_code': result.get('serviceCode'),
+            'usage_type': result.get('usageType'),
+            'operation': result.get('operation'),
+            'region': properties.get('region', region),
+            'instance_type': properties.get('instanceType'),
+            'instance_family': properties.get('instanceFamily'),
+            'product_description': properties.get('productDescription'),
+            'tenancy': properties.get('tenancy'),
+            'currency': offering.get('currency'),
+            'unit': result.get('unit'),
+            'rate': float(result.get('rate', 0)),
+            'load_time': load_time
+        }
+
+    def load(self, regions, products=None) -> int:
+        '''fetch rates for every region and product type, then bulk upsert them; return the number of rows written'''
+        load_time = datetime.now().isoformat()
+        total = 0
+
+        for region in regions:
+            for product in products or self.products:
+                try:
+                    results = self.fetch_rates(region, product)
+                except Exception as e:
+                    self.logger.warning(f'Unable to fetch Savings Plans rates for {product} in {region}: {e}')
+                    continue
+
+                rows = [self.convert_rate(r, region, load_time) for r in results]
+                total += self.appConfig.database.upsert_savings_plan_rates(rows)
+                self.logger.info(f'Loaded {len(rows)} Savings Plans rates for {product} in {region}')
+
+        return total
+
+    def refresh(self, regions) -> int:
+        '''load the region and product types whose stored rates are missing or older than rates_ttl seconds; return the number of rows written'''
+        stale = {}
+        for region in sorted(set(regions)):
+            for product in self.products:
+                load_time = self.appConfig.database.get_savings_plan_rates_load_time(region, product)
+                if load_time is None or (datetime.now() - datetime.fromisoformat(load_time)).total_seconds() >= self.rates_ttl:
+                    stale.setdefault(region, []).append(product)
+
+        return sum(self.load([region], products) for region, products in stale.items())
@@ -0,0 +1,96 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+__author__ = "Samuel Lepetre"
+__license__ = "Apache-2.0"
+
+from ..constants import __tooling_name__
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config.config import Config
+
+DEFAULT_CATALOG_TTL = 604800
+SUMMARIES_BATCH_SIZE = 100
+
+class TrustedAdvisorChecks:
+    '''
+    Trusted Advisor check catalog and check results shared by all TA reports of a run
+
+    The catalog of describe_trusted_advisor_checks is kept in the database for catalog_ttl
+    seconds. prefetch() reads the check summaries in batches and only requests the results
+    of checks with flagged resources, concurrently. describe_trusted_advisor_check_result
+    then serves the reports from the prefetched results.
+    '''
+
+    def __init__(self, client, language='en') -> None:
+        self.appConfig = Config()
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.language = language
+
+        ta_config = self.appConfig.internals['internals'].get('trusted_advisor', {})
+        self.catalog_ttl = float(ta_config.get('catalog_ttl', DEFAULT_CATALOG_TTL))
+        self.max_workers = max(1, int(ta_config.get('max_workers', 8)))
+
+        self._catalog = None
+        self._catalog_lock = threading.Lock()
+        self.results = {}   # check id -> describe_trusted_advisor_check_result response
+
+    def get_catalog(self) -> dict:
+        '''return dict of check name -> check description (id, name, description, category, metadata)'''
+        with self._catalog_lock:
+            if self._catalog is None:
+                checks, fetch_time = self.appConfig.database.get_ta_checks(self.language)
+
+                if not checks or time.time() - fetch_time >= self.catalog_ttl:
+                    checks = self.client.describe_trusted_advisor_checks(language=self.language)['checks']
+                    self.appConfig.database.replace_ta_checks(self.language, checks, time.time())
+                    self.logger.info(f'Trusted Advisor catalog: {len(checks)} checks fetched')
+
+                self._catalog = {check['name']: check for check in checks}
+
+            return self._catalog
+
+    def get_check_summaries(self, check_ids) -> dict:
+        '''return dict of check id -> check summary, requested in batches'''
+        summaries = {}
+        for i in range(0, len(check_ids), SUMMARIES_BATCH_SIZE):
+            response = self.client.describe_trusted_advisor_check_summaries(checkIds=check_ids[i:i + SUMMARIES_BATCH_SIZE])
+            summaries.update({summary['checkId']: summary for summary in response['summaries']})
+
+        return summaries
+
+    def prefetch(self, check_ids) -> None:
+        '''get the results of check_ids, skipping the checks whose summary has no flagged resource'''
+        check_ids = sorted(set(check_ids))
+        if not check_ids:
+            return
+
+        summaries = self.get_check_summaries(check_ids)
+
+        flagged = []
+        for check_id in check_ids:
+            summary = summaries.get(check_id)
+            if summary is None or summary.get('hasFlaggedResources') or summary['resourcesSummary']['resourcesFlagged'] > 0:
+                flagged.append(check_id)
+            else:
+                # same answer as describe_trusted_advisor_check_result for a check without flagged resource
+                result = {key: value for key, value in summary.items() if key != 'hasFlaggedResources'}
+                self.results[check_id] = {'result': dict(result, flaggedResources=[])}
+
+        self.logger.info(f'Trusted Advisor: {len(flagged)} of {len(check_ids)} checks with flagged resources')
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='trusted-advisor') as executor:
+            responses = executor.map(lambda check_id: self.client.describe_trusted_advisor_check_result(checkId=check_id, language=self.language), flagged)
+            self.results.update(zip(flagged, responses))
+
+    def describe_trusted_advisor_check_result(self, checkId, language=None) -> dict:
+        '''same call as the support client, answered from the prefetched results when available'''
+        if checkId in self.results:
+            return self.results[checkId]
+
+        return self.client.describe_trusted_advisor_check_result(checkId=checkId, language=language or self.language)
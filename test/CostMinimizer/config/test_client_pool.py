@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config as BotoConfig
+from botocore.stub import Stubber
+
+from CostMinimizer.config.client_pool import ClientPool, build_client_config
+
+
+class TestClientPool(unittest.TestCase):
+    """Test cases for the ClientPool class."""
+
+    def setUp(self):
+        self.session = boto3.Session(aws_access_key_id='testing', aws_secret_access_key='testing', region_name='us-east-1')
+
+    def test_clients_are_pooled(self):
+        """Concurrent requests for the same key share one client, other keys get their own."""
+        pool = ClientPool()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: pool.get_client(self.session, 'ec2', 'us-east-1'), range(16)))
+
+        self.assertTrue(all(c is clients[0] for c in clients))
+        self.assertIsNot(pool.get_client(self.session, 'ec2', 'eu-west-1'), clients[0])
+        self.assertIsNot(pool.get_client(self.session, 'ec2', 'us-east-1', BotoConfig(retries={'max_attempts': 10})), clients[0])
+
+        stats = pool.get_stats()
+        self.assertEqual(stats['boto_client_requests'], 18)
+        self.assertEqual(stats['boto_client_creations'], 3)
+
+    def test_caller_identity_is_cached(self):
+        """STS is called once per ttl, expired identities are fetched again."""
+        pool = ClientPool(caller_identity_ttl=60)
+        stubber = Stubber(pool.get_client(self.session, 'sts'))
+        identity = {'UserId': 'user', 'Account': '123456789012', 'Arn': 'arn:aws:iam::123456789012:user/test'}
+        stubber.add_response('get_caller_identity', identity)
+        stubber.add_response('get_caller_identity', identity)
+
+        with stubber, patch('CostMinimizer.config.client_pool.time.monotonic', side_effect=[0, 10, 20, 100, 100, 100]):
+            for _ in range(3):
+                self.assertEqual(pool.get_caller_identity(self.session)['Account'], '123456789012')
+            pool.get_caller_identity(self.session)
+
+        stats = pool.get_stats()
+        self.assertEqual(stats['sts_caller_identity_requests'], 4)
+        self.assertEqual(stats['sts_caller_identity_calls'], 2)
+        stubber.assert_no_pending_responses()
+
+    def test_caller_identity_call_does_not_hold_the_pool(self):
+        """Clients are served while an STS call is in flight, concurrent callers of a session share that call."""
+        pool = ClientPool()
+        in_flight = threading.Event()
+        release = threading.Event()
+
+        session = MagicMock(profile_name='default')
+        sts = MagicMock()
+        session.client.side_effect = lambda service_name, **kwargs: sts if service_name == 'sts' else MagicMock()
+
+        def get_caller_identity():
+            in_flight.set()
+            release.wait(5)
+            return {'Account': '123456789012'}
+        sts.get_caller_identity.side_effect = get_caller_identity
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            identities = [executor.submit(pool.get_caller_identity, session) for _ in range(2)]
+            self.assertTrue(in_flight.wait(5))
+
+            # the pool lock is free while STS answers
+            pool.get_client(session, 'ec2', 'us-east-1')
+            release.set()
+
+            self.assertEqual([f.result(timeout=5)['Account'] for f in identities], ['123456789012'] * 2)
+
+        self.assertEqual(sts.get_caller_identity.call_count, 1)
+
+    def test_client_config_profile(self):
+        """Service settings override the default ones and the pool scales with the worker count."""
+        profile = {
+            'default': {'max_pool_connections': 10, 'connect_timeout': 5, 'read_timeout': 60, 'retry_mode': 'adaptive', 'max_attempts': 10},
+            'services': {'athena': {'read_timeout': 120}}}
+
+        pool = ClientPool()
+        athena = pool.get_client(self.session, 'athena', 'us-east-1', build_client_config('athena', profile, worker_count=32))
+        ec2 = pool.get_client(self.session, 'ec2', 'us-east-1', build_client_config('ec2', profile, worker_count=4))
+
+        self.assertEqual(athena.meta.config.max_pool_connections, 32)
+        self.assertEqual(athena.meta.config.read_timeout, 120)
+        self.assertEqual(athena.meta.config.retries['mode'], 'adaptive')
+        self.assertEqual(ec2.meta.config.max_pool_connections, 10)
+        self.assertEqual(ec2.meta.config.connect_timeout, 5)
+
+        # the same profile gives the same pool key
+        self.assertIs(pool.get_client(self.session, 'athena', 'us-east-1', build_client_config('athena', profile, worker_count=32)), athena)
+
+if __name__ == '__main__':
+    unittest.main()
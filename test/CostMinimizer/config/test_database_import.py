@@ -0,0 +1,60 @@
+import unittest
+import tempfile
+import os
+
+import pytest
+
+from CostMinimizer.config.database import UnableToExecuteSqliteQuery
+
+
+@pytest.mark.usefixtures('tooling_database')
+class TestSqlDumpImport(unittest.TestCase):
+    """Test cases for the bulk import of the bundled sql dumps."""
+
+    database_tables = ['cowawspricinglambda', 'cowgravitonconversion', 'cowpricingimports']
+
+    def test_import_bundled_dumps(self):
+        """Bundled dumps are imported into their own table with every row."""
+        for table_name in ('cow_awspricinglambda', 'cow_gravitonconversion'):
+            file_path = self.database.get_bundled_sql_dump(f'{table_name}.sql')
+            count = self.database.import_sql_dump_with_validation(table_name, file_path)
+
+            self.assertGreater(count, 0)
+            self.assertEqual(self.database.con.execute(f'select count(*) from {table_name}').fetchone()[0], count)
+
+    def test_import_quoted_values_and_null(self):
+        """Escaped quotes and NULL literals are parsed."""
+        fd, file_path = tempfile.mkstemp(suffix='.sql')
+        with os.fdopen(fd, 'w') as f:
+            f.write("BEGIN TRANSACTION;\n")
+            f.write("INSERT INTO cow_awspricinglambda VALUES('Asia Pacific (Xi''an)','Request',2.0E-07,NULL);\n")
+            f.write("COMMIT;\n")
+        self.addCleanup(os.remove, file_path)
+
+        self.assertEqual(self.database.import_sql_dump_with_validation('cow_awspricinglambda', file_path), 1)
+        row = self.database.con.execute('select * from cow_awspricinglambda').fetchone()
+        self.assertEqual(row, ("Asia Pacific (Xi'an)", 'Request', 2.0e-07, None))
+
+    def test_import_multi_line_statement_keeps_types(self):
+        """Statements spanning lines and inserting several rows are parsed, integers stay integers."""
+        fd, file_path = tempfile.mkstemp(suffix='.sql')
+        with os.fdopen(fd, 'w') as f:
+            f.write("BEGIN TRANSACTION;\n")
+            f.write("INSERT INTO \"cow_awspricinglambda\" VALUES('US East; (N. Virginia)',\n  'Request\nline',\n  3,\n  -1.5E-2),\n  ('EU (Ireland)','Request',0.2,NULL);\n")
+            f.write("COMMIT;\n")
+        self.addCleanup(os.remove, file_path)
+
+        rows = self.database.parse_sql_dump(file_path, 'cow_awspricinglambda')
+        self.assertEqual(rows, [('US East; (N. Virginia)', 'Request\nline', 3, -0.015), ('EU (Ireland)', 'Request', 0.2, None)])
+        self.assertIsInstance(rows[0][2], int)
+
+    def test_import_into_wrong_table(self):
+        """A dump targeting another table is rejected and nothing is written."""
+        file_path = self.database.get_bundled_sql_dump('cow_awspricinglambda.sql')
+
+        with self.assertRaises(UnableToExecuteSqliteQuery):
+            self.database.import_sql_dump_with_validation('cow_gravitonconversion', file_path)
+        self.assertEqual(self.database.con.execute('select count(*) from cow_gravitonconversion').fetchone()[0], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sqlite3
+
+import pytest
+
+from CostMinimizer.config.database import ToolingDatabase
+
+
+@pytest.mark.usefixtures('tooling_database')
+class TestUnitOfWork(unittest.TestCase):
+    """Test cases for the batched writes of ToolingDatabase."""
+
+    database_tables = ['cowlogin']
+
+    def setUp(self):
+        self.commits = 0
+        self.database.con.set_trace_callback(self._trace)
+
+    def _trace(self, statement):
+        if statement == 'COMMIT':
+            self.commits += 1
+
+    def _count(self):
+        return self.database.con.execute('select count(*) from cow_login').fetchone()[0]
+
+    def test_insert_records_single_commit(self):
+        """insert_records writes every record with one commit."""
+        requests = [{'login_hash': f'hash-{i}'} for i in range(50)]
+
+        self.assertEqual(self.database.insert_records(requests, 'cow_login'), 50)
+        self.assertEqual(self._count(), 50)
+        self.assertEqual(self.commits, 1)
+
+    def test_unit_of_work_commits_once(self):
+        """Writes inside a unit of work are committed once on exit."""
+        with self.database.unit_of_work():
+            self.database.insert_record({'login_hash': 'a'}, 'cow_login')
+            with self.database.unit_of_work():
+                self.database.insert_record({'login_hash': 'b'}, 'cow_login')
+            self.database.clear_table('cow_login')
+            self.database.insert_records([{'login_hash': 'c'}], 'cow_login')
+            self.assertEqual(self.commits, 0)
+
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(self._count(), 1)
+
+    def test_unit_of_work_rollback(self):
+        """An exception inside a unit of work discards its writes."""
+        self.database.insert_record({'login_hash': 'kept'}, 'cow_login')
+
+        with self.assertRaises(ValueError):
+            with self.database.unit_of_work():
+                self.database.clear_table('cow_login')
+                raise ValueError('failure')
+
+        self.assertEqual(self._count(), 1)
+
+    def test_unit_of_work_is_per_instance(self):
+        """A unit of work on one database neither defers the commits nor holds the lock of another."""
+        other = ToolingDatabase.__new__(ToolingDatabase)
+        other.con = sqlite3.connect(':memory:')
+        other.con.executescript(other.cowlogin_table())
+
+        self.assertIsNot(self.database._lock, other._lock)
+
+        with other.unit_of_work():
+            self.database.insert_record({'login_hash': 'a'}, 'cow_login')
+            self.assertEqual(self.commits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
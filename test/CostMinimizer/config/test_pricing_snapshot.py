@@ -0,0 +1,82 @@
+import unittest
+import logging
+import sqlite3
+import tempfile
+
+from CostMinimizer.config.database import ToolingDatabase
+from CostMinimizer.config.pricing_snapshot import PricingSnapshot
+
+
+class TestPricingSnapshot(unittest.TestCase):
+    """Test cases for the PricingSnapshot class."""
+
+    def setUp(self):
+        self.con = sqlite3.connect(':memory:')
+        self.con.executescript('''
+            CREATE TABLE cow_awspricingec2 (awspricing_id INTEGER, ConcatField TEXT, Column1 TEXT, vcpu INTEGER,
+                Family TEXT, odpriceperunit FLOAT, ripriceperunit FLOAT, svpriceperunit FLOAT);
+            CREATE TABLE cow_awspricingdb (awspricing_id INTEGER, family TEXT, instancetype TEXT);
+            CREATE TABLE cow_awspricinglambda (location TEXT, usagetype TEXT, odpriceperunit FLOAT, svpriceperunit FLOAT);
+            CREATE TABLE cow_gravitonconversion (Family TEXT, Graviton2 TEXT, Graviton3 TEXT, Graviton4 TEXT,
+                Default_Graviton_Equivalent TEXT);
+            INSERT INTO cow_awspricingec2 VALUES (1, 'm5.largeus-east-1LinuxNA', 'x', 2, 'm5', 0.096, 0.06, 0.07);
+            INSERT INTO cow_awspricingec2 VALUES (2, 'm5.largeeu-west-1LinuxNA', 'x', 2, 'm5', 0.107, 0.07, 0.08);
+            INSERT INTO cow_awspricinglambda VALUES ('US East (N. Virginia)', 'Lambda-GB-Second', 0.0000166667, 0.000012);
+            INSERT INTO cow_gravitonconversion VALUES ('m5', 'm6g', 'm7g', NULL, 'm7g');
+        ''')
+        self.directory = tempfile.mkdtemp()
+
+    def test_build_and_load(self):
+        """Empty tables are skipped and loaded arrays are memory-mapped."""
+        manifest = PricingSnapshot.build(self.con, self.directory)
+        self.assertNotIn('cow_awspricingdb', manifest['tables'])
+        self.assertEqual(manifest['tables']['cow_awspricingec2']['rows'], 2)
+
+        self.assertTrue(PricingSnapshot.exists(self.directory))
+        snapshot = PricingSnapshot.load(self.directory)
+        self.assertFalse(snapshot.has_table('cow_awspricingdb'))
+        self.assertEqual(snapshot.arrays[('cow_awspricingec2', 'odpriceperunit')].__class__.__name__, 'memmap')
+
+    def test_find_first(self):
+        """Lookups match single values, tuples of values and decode null text as empty string."""
+        PricingSnapshot.build(self.con, self.directory)
+        snapshot = PricingSnapshot.load(self.directory)
+
+        row = snapshot.find_first('cow_awspricingec2', {'ConcatField': 'm5.largeeu-west-1LinuxNA'}, ['odpriceperunit', 'Family'])
+        self.assertAlmostEqual(row[0], 0.107)
+        self.assertEqual(row[1], 'm5')
+
+        row = snapshot.find_first('cow_awspricingec2', {'ConcatField': ('unknown', 'm5.largeus-east-1LinuxNA')}, ['odpriceperunit'])
+        self.assertAlmostEqual(row[0], 0.096)
+
+        self.assertIsNone(snapshot.find_first('cow_awspricingec2', {'ConcatField': 'c5.large'}, ['odpriceperunit']))
+
+        row = snapshot.find_first('cow_gravitonconversion', {'Family': 'm5'}, ['Graviton4', 'Default_Graviton_Equivalent'])
+        self.assertEqual(row, ('', 'm7g'))
+
+    def test_stale_tables(self):
+        """Tables re-imported after the build are reported stale, tables never imported are not."""
+        PricingSnapshot.build(self.con, self.directory, {'cow_awspricingec2': 100.0})
+        snapshot = PricingSnapshot.load(self.directory)
+
+        self.assertEqual(snapshot.get_stale_tables({}), [])
+        self.assertEqual(snapshot.get_stale_tables({'cow_awspricingec2': 100.0}), [])
+        self.assertEqual(snapshot.get_stale_tables({'cow_awspricingec2': 200.0, 'cow_awspricinglambda': 50.0}), ['cow_awspricingec2', 'cow_awspricinglambda'])
+
+    def test_empty_price_is_zero(self):
+        """An empty price cell gives 0.0 from the database tables and from the snapshot."""
+        self.con.execute("INSERT INTO cow_awspricinglambda VALUES ('EU (Ireland)', 'Lambda-GB-Second', '', NULL)")
+
+        database = ToolingDatabase.__new__(ToolingDatabase)
+        database.logger = logging.getLogger(__name__)
+        database.con = self.con
+        database.pricing_snapshot = None
+        self.assertEqual(database.get_lambda_price_from_db('EU (Ireland)', 'Lambda-GB-Second'), 0.0)
+
+        PricingSnapshot.build(self.con, self.directory)
+        database.pricing_snapshot = PricingSnapshot.load(self.directory)
+        self.assertEqual(database.get_lambda_price_from_db('EU (Ireland)', 'Lambda-GB-Second'), 0.0)
+        self.assertAlmostEqual(database.get_lambda_price_from_db('US East (N. Virginia)', 'Lambda-GB-Second'), 0.0000166667)
+
+if __name__ == '__main__':
+    unittest.main()
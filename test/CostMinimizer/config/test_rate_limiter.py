@@ -0,0 +1,66 @@
+import unittest
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.stub import Stubber
+
+from CostMinimizer.config.client_pool import ClientPool
+from CostMinimizer.config.rate_limiter import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the RateLimiter class."""
+
+    def test_bucket_limits_concurrent_calls(self):
+        """Concurrent callers of one operation are spread at the configured rate after the burst."""
+        limiter = RateLimiter({'ce': {'rate': 20, 'burst': 2}})
+
+        s = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: limiter.acquire('ce', 'GetCostAndUsage', 'us-east-1'), range(8)))
+        elapsed = time.perf_counter() - s
+
+        # 2 tokens of burst, then 6 tokens at 20 per second
+        self.assertGreaterEqual(elapsed, 0.25)
+        self.assertLess(elapsed, 0.6)
+        stats = limiter.get_stats()
+        self.assertEqual(stats['rate_limit_waits'], 6)
+        self.assertGreater(stats['rate_limit_wait_seconds'], 0)
+
+    def test_buckets_are_per_operation_and_region(self):
+        """Operations, regions and services without limits do not share or use buckets."""
+        limiter = RateLimiter({'ce': {'rate': 1, 'burst': 1, 'operations': {'GetTags': {'rate': 2, 'burst': 2}}}})
+
+        self.assertEqual(limiter.acquire('ce', 'GetCostAndUsage', 'us-east-1'), 0.0)
+        self.assertEqual(limiter.acquire('ce', 'GetCostAndUsage', 'eu-west-1'), 0.0)
+        self.assertEqual(limiter.acquire('ce', 'GetTags', 'us-east-1'), 0.0)
+        self.assertEqual(limiter.acquire('ce', 'GetTags', 'us-east-1'), 0.0)
+        self.assertEqual(limiter.acquire('ec2', 'DescribeInstances', 'us-east-1'), 0.0)
+        self.assertIsNone(limiter.get_bucket('ec2', 'DescribeInstances', 'us-east-1'))
+
+    def test_pooled_clients_are_limited(self):
+        """Calls of a pooled client take tokens, throttling errors are counted."""
+        limiter = RateLimiter({'ce': {'rate': 10, 'burst': 1}})
+        pool = ClientPool(rate_limiter=limiter)
+        session = boto3.Session(aws_access_key_id='testing', aws_secret_access_key='testing', region_name='us-east-1')
+        client = pool.get_client(session, 'ce', 'us-east-1')
+
+        stubber = Stubber(client)
+        for _ in range(3):
+            stubber.add_response('get_tags', {'Tags': [], 'ReturnSize': 0, 'TotalSize': 0},
+                {'TimePeriod': {'Start': '2026-09-01', 'End': '2026-10-01'}})
+
+        s = time.perf_counter()
+        with stubber:
+            for _ in range(3):
+                client.get_tags(TimePeriod={'Start': '2026-09-01', 'End': '2026-10-01'})
+
+        self.assertGreaterEqual(time.perf_counter() - s, 0.18)
+
+        limiter.record_response('ce', 'GetTags', (None, {'Error': {'Code': 'ThrottlingException'}}))
+        limiter.record_response('ce', 'GetTags', (None, {'Error': {'Code': 'ValidationException'}}))
+        self.assertEqual(pool.get_stats()['throttled_requests'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import copy
+import logging
+import sqlite3
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from CostMinimizer.config.database import ToolingDatabase
+
+
+@pytest.fixture
+def tooling_database(request):
+    """
+    ToolingDatabase bound to an in-memory sqlite connection, without the Config setup.
+
+    The test class lists the tables to create in database_tables, e.g. ['cowtachecks'] runs
+    cowtachecks_table(). The database is set on the test case as self.database.
+    """
+    database = ToolingDatabase.__new__(ToolingDatabase)
+    database.logger = logging.getLogger(__name__)
+    database.con = sqlite3.connect(':memory:', check_same_thread=False)
+    database.pricing_snapshot = None
+    database.con.executescript(''.join(getattr(database, f'{table}_table')() for table in getattr(request.cls, 'database_tables', [])))
+
+    if request.instance is not None:
+        request.instance.database = database
+
+    yield database
+
+    database.con.close()
+
+
+@pytest.fixture
+def mock_config(request):
+    """
+    Patch the Config class of the module under test.
+
+    The test class names the patch target in config_target, e.g.
+    'CostMinimizer.service_helpers.dynamodb.Config', and the internals returned by Config()
+    in config_internals. The Config() instance is set on the test case as self.mock_config_instance,
+    with the tooling_database fixture as its database when the test uses both.
+    """
+    with patch(request.cls.config_target) as config:
+        instance = MagicMock()
+        instance.internals = {'internals': copy.deepcopy(getattr(request.cls, 'config_internals', {}))}
+        if 'tooling_database' in request.fixturenames:
+            instance.database = request.getfixturevalue('tooling_database')
+        config.return_value = instance
+
+        if request.instance is not None:
+            request.instance.mock_config_instance = instance
+
+        yield instance
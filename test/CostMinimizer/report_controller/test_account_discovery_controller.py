@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import logging
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+import pytest
+
+from CostMinimizer.config.database import ToolingDatabase
+from CostMinimizer.security.credential_vault import CredentialVault
+from CostMinimizer.report_controller.account_discovery_controller import AccountDiscoveryController
+
+PROBE_LATENCY = 0.2
+
+
+@pytest.mark.usefixtures('tooling_database')
+class TestAccountDiscovery(unittest.TestCase):
+    """Test cases for the parallel support status discovery of AccountDiscoveryController."""
+
+    database_tables = ['cowaccountsupportstatus']
+
+    def setUp(self):
+        self.probes = []
+        self.lock = threading.Lock()
+
+        controller = AccountDiscoveryController.__new__(AccountDiscoveryController)
+        controller.logger = logging.getLogger(__name__)
+        controller.appConfig = MagicMock()
+        controller.appConfig.database = self.database
+        controller.discovery_config = {'max_workers': 8, 'support_probe_ttl': 3600}
+        controller.payer_account_id = '000000000000'
+        controller.probe_account = self.probe_account
+        self.controller = controller
+
+    def probe_account(self, account):
+        time.sleep(PROBE_LATENCY)
+        with self.lock:
+            self.probes.append(account)
+        return 'unknown' if account == '999999999999' else 'Business'
+
+    def test_discovery_is_parallel_and_cached(self):
+        """Accounts are probed concurrently, successful probes are reused by the next run."""
+        accounts = [{'Id': f'{i:012d}'} for i in range(8)] + [{'Id': '999999999999'}]
+
+        s = time.perf_counter()
+        self.controller.discover_support_status(accounts)
+        self.assertLess(time.perf_counter() - s, 3 * PROBE_LATENCY)
+        self.assertEqual(len(self.probes), 9)
+        self.assertEqual(accounts[0]['support_status'], 'Business')
+
+        rerun = [{'Id': f'{i:012d}'} for i in range(8)] + [{'Id': '999999999999'}]
+        self.probes.clear()
+        self.controller.discover_support_status(rerun)
+
+        # only the account that could not be probed is probed again
+        self.assertEqual(self.probes, ['999999999999'])
+        self.assertEqual(rerun[3]['support_status'], 'Business')
+
+
+class TestAccountDiscoveryDatabase(unittest.TestCase):
+    """Support statuses stored by discovery in a ToolingDatabase built by its own __init__."""
+
+    def setUp(self):
+        home = tempfile.TemporaryDirectory()
+        self.addCleanup(home.cleanup)
+
+        patcher = patch('CostMinimizer.config.config.Config')
+        mock_config = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_config.return_value.local_home = Path(home.name)
+        mock_config.return_value.installation_type = 'local_install'
+        mock_config.return_value.default_selected_region = 'us-east-1'
+        mock_config.return_value.internals = {'internals': {'database': {
+            'database_directory_for_local': 'cow', 'database_directory_for_container': '.cow', 'database_file': 'CostMinimizer.db'}}}
+
+    def make_controller(self):
+        database = ToolingDatabase()
+        self.addCleanup(database.con.close)
+
+        controller = AccountDiscoveryController.__new__(AccountDiscoveryController)
+        controller.logger = logging.getLogger(__name__)
+        controller.appConfig = MagicMock()
+        controller.appConfig.database = database
+        controller.discovery_config = {'max_workers': 4, 'support_probe_ttl': 3600}
+        controller.payer_account_id = '000000000000'
+        controller.probe_account = MagicMock(return_value='Business')
+        return controller
+
+    def test_support_status_survives_a_new_database_connection(self):
+        """A later run opening the database file again reuses the stored probes."""
+        self.make_controller().discover_support_status([{'Id': '111111111111'}, {'Id': '222222222222'}])
+
+        controller = self.make_controller()
+        accounts = [{'Id': '111111111111'}, {'Id': '222222222222'}]
+        controller.discover_support_status(accounts)
+
+        controller.probe_account.assert_not_called()
+        self.assertEqual([a['support_status'] for a in accounts], ['Business', 'Business'])
+
+
+class TestCredentialVault(unittest.TestCase):
+    """Test cases for the CredentialVault class."""
+
+    def credentials(self, minutes):
+        return {'Credentials': {'AccessKeyId': 'AKIA', 'SecretAccessKey': 'secret', 'SessionToken': 'token',
+            'Expiration': datetime.now(timezone.utc) + timedelta(minutes=minutes)}}
+
+    def test_sessions_are_reused_until_expiry(self):
+        """A role is assumed once while its credentials are valid, and again close to expiry."""
+        sts = MagicMock()
+        sts.assume_role.side_effect = [self.credentials(60), self.credentials(3), self.credentials(60)]
+        vault = CredentialVault(refresh_margin=300)
+        role = 'arn:aws:iam::111111111111:role/OrganizationAccountAccessRole'
+
+        first = vault.get_session(sts, role, 'test')
+        self.assertIs(vault.get_session(sts, role, 'test'), first)
+        self.assertEqual(sts.assume_role.call_count, 1)
+
+        other = vault.get_session(sts, role.replace('111111111111', '222222222222'), 'test')
+        self.assertIsNot(other, first)
+        # expires within the refresh margin: assumed again on next use
+        vault.get_session(sts, role.replace('111111111111', '222222222222'), 'test')
+        self.assertEqual(sts.assume_role.call_count, 3)
+        self.assertEqual(vault.get_stats(), {'assume_role_requests': 4, 'assume_role_calls': 3})
+
+if __name__ == '__main__':
+    unittest.main()
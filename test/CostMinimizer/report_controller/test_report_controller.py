@@ -0,0 +1,141 @@
+import unittest
+from unittest.mock import MagicMock
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.stub import Stubber
+
+from CostMinimizer.report_controller.report_controller import CowReportController
+
+LATENCY = 0.3
+
+
+def make_provider(provider_name):
+    '''provider class whose run() calls a Stubber-backed client answering after LATENCY seconds'''
+
+    # clients are created up front, client creation is not what the test measures
+    client = boto3.client('sts', region_name='us-east-1',
+        aws_access_key_id='testing', aws_secret_access_key='testing')
+    client.meta.events.register('before-call.*.*', lambda **kwargs: time.sleep(LATENCY))
+
+    class StubbedProvider:
+
+        def __init__(self, appConfig):
+            self.client = client
+            self.stubber = Stubber(self.client)
+            self.stubber.add_response('get_caller_identity',
+                {'UserId': 'user', 'Account': '123456789012', 'Arn': 'arn:aws:iam::123456789012:user/test'})
+            self.enrollment_status = None
+
+        @staticmethod
+        def name():
+            return provider_name
+
+        def long_name(self):
+            return provider_name.upper()
+
+        def auth(self):
+            pass
+
+        def setup(self, run_validation=False):
+            self.enrollment_status = True
+
+        def mandatory_reports(self, type=None):
+            pass
+
+        def run(self, type=None, cow_execution_type=None):
+            with self.stubber:
+                account = self.client.get_caller_identity()['Account']
+            return [f'{provider_name}:{account}']
+
+    return StubbedProvider
+
+
+class TestCowReportControllerRun(unittest.TestCase):
+    """Test cases for the provider execution of CowReportController.run."""
+
+    def make_controller(self, concurrent_providers):
+        controller = CowReportController.__new__(CowReportController)
+        controller.logger = logging.getLogger(__name__)
+        controller.appConfig = MagicMock()
+        controller.appConfig.mode = 'module'
+        controller.appConfig.cow_execution_type = 'sync'
+        controller.appConfig.internals = {'internals': {'concurrency': {
+            'concurrent_providers': concurrent_providers, 'max_provider_workers': 4}}}
+        controller.appConfig.reports.get_all_enabled_reports.return_value = {
+            'report_ce.ce': 'ce', 'report_co.co': 'co', 'report_ta.ta': 'ta'}
+        controller.reports_in_progress = {}
+        controller.running_report_providers = []
+
+        providers = [make_provider(name) for name in ('ce', 'co', 'ta', 'cur')]
+        controller.import_reports = lambda: providers
+        return controller
+
+    def test_concurrent_providers(self):
+        """Enabled providers run in parallel and results are joined in provider order."""
+        controller = self.make_controller(True)
+
+        s = time.perf_counter()
+        controller.run()
+        elapsed = time.perf_counter() - s
+
+        self.assertLess(elapsed, 2 * LATENCY)
+        self.assertEqual([p.name() for p in controller.running_report_providers], ['ce', 'co', 'ta'])
+        self.assertEqual(controller.reports_in_progress['co'], ['co:123456789012'])
+
+    def test_serial_providers(self):
+        """Without concurrent mode providers run one after another."""
+        controller = self.make_controller(False)
+
+        s = time.perf_counter()
+        controller.run()
+        elapsed = time.perf_counter() - s
+
+        self.assertGreaterEqual(elapsed, 3 * LATENCY)
+        self.assertEqual(len(controller.reports_in_progress), 3)
+
+
+class TestCowReportControllerAsync(unittest.TestCase):
+    """Test cases for the async report collection of CowReportController."""
+
+    def make_report(self, executor, name, work, timeout=None):
+        report = MagicMock()
+        report.name.return_value = name
+        report.async_timeout.return_value = timeout
+        report.async_submit_time = time.monotonic()
+        report.async_future = executor.submit(work)
+        return report
+
+    def test_collect_async_reports(self):
+        """Completed reports are returned, failed and timed out reports are recorded as failures."""
+        controller = CowReportController.__new__(CowReportController)
+        controller.logger = logging.getLogger(__name__)
+        controller.appConfig = MagicMock()
+        controller.appConfig.internals = {'internals': {'concurrency': {'async_report_timeout': 5}}}
+
+        def fail():
+            raise RuntimeError('query failed')
+
+        provider = MagicMock()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            fast = self.make_report(executor, 'fast', lambda: time.sleep(0.05))
+            failed = self.make_report(executor, 'failed', fail)
+            slow = self.make_report(executor, 'slow', lambda: time.sleep(1), timeout=0.2)
+            cached = MagicMock(async_future=None)
+            provider.reports_in_progress = [fast, failed, slow, cached]
+
+            s = time.perf_counter()
+            completed = controller.collect_async_reports(provider)
+            elapsed = time.perf_counter() - s
+
+        self.assertLess(elapsed, 1)
+        self.assertEqual(completed, [cached, fast])
+        failures = [(c.args[0], type(c.args[3])) for c in provider.record_report_failure.call_args_list]
+        self.assertEqual(failures, [(failed, RuntimeError), (slow, TimeoutError)])
+        provider.cancel_report.assert_called_once_with(slow)
+
+if __name__ == '__main__':
+    unittest.main()
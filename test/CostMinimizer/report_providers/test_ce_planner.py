@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock
+import logging
+
+from CostMinimizer.report_providers.ce_reports.ce import CeReports
+
+
+class TestCePlanner(unittest.TestCase):
+    """Test cases for the get_cost_and_usage request planner of CeReports."""
+
+    def make_provider(self):
+        provider = CeReports.__new__(CeReports)
+        provider.logger = logging.getLogger(__name__)
+        provider.planned_requests = {}
+        provider.report_request_keys = {}
+        return provider
+
+    def make_report(self, name, group_by, calls, domain='CE'):
+        report = MagicMock()
+        report.name.return_value = name
+        report.domain_name.return_value = domain
+        report.sql.return_value = {'Name': name, 'GroupBy': group_by}
+        report.get_cost_and_usage_request.side_effect = lambda GroupBy, *args: {'Granularity': 'MONTHLY', 'GroupBy': GroupBy}
+
+        def get_results(request):
+            calls.append(request)
+            return [{'TimePeriod': {'Start': '2026-09-01'}, 'Groups': []}]
+
+        report.get_cost_and_usage_results.side_effect = get_results
+        return report
+
+    def test_paired_reports_share_one_request(self):
+        """Reports with identical requests get the same results from a single API call."""
+        calls = []
+        accounts = [{'Type': 'DIMENSION', 'Key': 'LINKED_ACCOUNT'}]
+        reports = [
+            self.make_report('Accounts', accounts, calls),
+            self.make_report('AccountsChange', accounts, calls),
+            self.make_report('Services', [{'Type': 'DIMENSION', 'Key': 'SERVICE'}], calls),
+            self.make_report('RIUtilization', [], calls, domain='RI')]
+
+        provider = self.make_provider()
+        provider.prepare_reports(reports)
+
+        self.assertEqual(len(provider.planned_requests), 2)
+        self.assertNotIn('RIUtilization', provider.report_request_keys)
+
+        first = provider.get_planned_results(reports[0])
+        second = provider.get_planned_results(reports[1])
+        provider.get_planned_results(reports[2])
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 2)
+        self.assertIsNone(provider.get_planned_results(reports[3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import MagicMock
+import tempfile
+import logging
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from CostMinimizer.report_providers.report_checkpoint import ReportCheckpointStore
+from CostMinimizer.report_providers.report_providers import ReportProviderBase
+
+
+class Provider(ReportProviderBase):
+
+    def name(self):
+        return 'cur'
+
+    def run_additional_logic_for_provider(self, report_object, additional_input_data=None):
+        pass
+
+
+class TestReportCheckpoint(unittest.TestCase):
+    """Test cases for checkpointing and resuming reports."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_report(self, name, data=None):
+        report = MagicMock(spec=['name', 'write_to_db'])
+        report.name.return_value = name
+        report.write_to_db.return_value = True
+        report.report_result = [{'Name': name, 'Data': data, 'Type': 'table'}] if data is not None else []
+        report.execution_ids = {name: 'query-1'}
+        return report
+
+    def make_provider(self, resume_execution_id=None):
+        provider = Provider.__new__(Provider)
+        provider.logger = logging.getLogger(__name__)
+        provider.account_discovery = None
+        provider.dependent_report = None
+        provider.appConfig = MagicMock()
+        provider.appConfig.app_path = Path(self.tmp.name)
+        provider.appConfig.internals = {'internals': {'reports': {'checkpoint_directory': 'checkpoints'}}}
+        provider.appConfig.get_execution_id.return_value = 'exec1'
+        provider.appConfig.resume_execution_id = resume_execution_id
+        provider.appConfig.report_time = '2026-10-19-10-00'
+        return provider
+
+    def test_save_and_restore(self):
+        """A checkpointed DataFrame is restored on a new report object."""
+        store = ReportCheckpointStore(self.tmp.name, 'exec1')
+        df = pd.DataFrame({'line_item_resource_id': ['i-1', 'i-2'], 'cost': [1.5, 2.0]})
+        store.save('cur', self.make_report('ec2_cost', df))
+
+        restored = self.make_report('ec2_cost')
+        self.assertTrue(store.restore('cur', restored))
+        pd.testing.assert_frame_equal(restored.report_result[0]['Data'], df)
+        self.assertEqual(restored.execution_ids, {'ec2_cost': 'query-1'})
+        self.assertEqual([m['report_name'] for m in store.completed_reports()], ['ec2_cost'])
+
+        self.assertFalse(store.restore('cur', self.make_report('missing')))
+
+    def test_checkpoint_records_completed_history(self):
+        """A successful execution is checkpointed and recorded as COMPLETED, then restored on resume."""
+        provider = self.make_provider()
+        provider.execute_report = lambda report_object, display: None
+        provider.appConfig.internals['internals']['concurrency'] = {'report_timeout': 5}
+
+        report = self.make_report('ec2_cost', pd.DataFrame({'cost': [1.0]}))
+        self.assertTrue(provider.execute_and_checkpoint(report, True))
+
+        request = provider.appConfig.database.insert_record.call_args[0][0]
+        self.assertEqual(request['status'], 'COMPLETED')
+        self.assertEqual(request['report_id'], 'exec1')
+        self.assertTrue(report.execution_recorded)
+
+        resumed = self.make_provider(resume_execution_id='exec1')
+        restored = self.make_report('ec2_cost')
+        self.assertTrue(resumed.restore_report(restored))
+        self.assertTrue(restored.restored_from_checkpoint)
+        self.assertFalse(resumed.restore_report(self.make_report('not_run')))
+
+    def test_failed_query_is_not_checkpointed(self):
+        """A report that logged its query failure and returned is recorded as FAILED, not restored on resume."""
+        provider = self.make_provider()
+        report = self.make_report('ec2_cost', pd.DataFrame())
+        report.fail_query = True
+        report.fail_reason = 'Athena Query failed with state: FAILED'
+
+        provider.checkpoint_report(report)
+
+        request = provider.appConfig.database.insert_record.call_args[0][0]
+        self.assertEqual(request['status'], 'FAILED')
+        self.assertFalse(self.make_provider(resume_execution_id='exec1').restore_report(self.make_report('ec2_cost')))
+
+    def test_delete_and_purge(self):
+        """The checkpoints of a run are deleted on request, runs older than the retention are purged."""
+        for execution_id in ('done', 'old', 'recent'):
+            ReportCheckpointStore(self.tmp.name, execution_id).save('cur', self.make_report('ec2_cost', pd.DataFrame()))
+
+        ReportCheckpointStore(self.tmp.name, 'done').delete()
+        old = Path(self.tmp.name) / 'old'
+        os.utime(old, (time.time() - 8 * 86400, time.time() - 8 * 86400))
+
+        self.assertEqual(ReportCheckpointStore.purge_expired(self.tmp.name, 7), ['old'])
+        self.assertEqual(sorted(p.name for p in Path(self.tmp.name).iterdir()), ['recent'])
+
+if __name__ == '__main__':
+    unittest.main()
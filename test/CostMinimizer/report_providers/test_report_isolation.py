@@ -0,0 +1,206 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import logging
+import threading
+import time
+
+from CostMinimizer.report_providers.report_providers import ReportProviderBase
+
+
+class Provider(ReportProviderBase):
+
+    def name(self):
+        return 'test'
+
+    def run_additional_logic_for_provider(self, report_object, additional_input_data=None):
+        pass
+
+
+class Report:
+
+    def __init__(self, name):
+        self.report_name = name
+        self.report_result = []
+        self.failed_report_logs = {}
+
+    def name(self):
+        return self.report_name
+
+
+class TestReportIsolation(unittest.TestCase):
+    """Test cases for the isolation boundary of ReportProviderBase.execute_report_isolated."""
+
+    def make_provider(self, execute, report_timeout=5):
+        provider = Provider.__new__(Provider)
+        provider.logger = logging.getLogger(__name__)
+        provider.appConfig = MagicMock()
+        provider.appConfig.internals = {'internals': {'concurrency': {'report_timeout': report_timeout}}}
+        provider.failed_reports = []
+        provider.execute_report = execute
+        provider.cancel_report = MagicMock()
+        return provider
+
+    def make_report(self, name):
+        report = MagicMock()
+        report.name.return_value = name
+        report.failed_report_logs = {}
+        return report
+
+    def test_exception_is_recorded(self):
+        """A report raising an exception is failed with a structured record instead of exiting."""
+        def execute(report_object, display):
+            raise RuntimeError('athena unavailable')
+
+        provider = self.make_provider(execute)
+        report = self.make_report('failing')
+
+        self.assertFalse(provider.execute_report_isolated(report, True))
+
+        failure = report.failed_report_logs['failing'][0]
+        self.assertEqual(failure['phase'], 'execute')
+        self.assertEqual(failure['exception'], 'RuntimeError')
+        self.assertEqual(failure['message'], 'athena unavailable')
+        self.assertEqual(report.status, 'FAILED')
+        self.assertEqual(provider.failed_reports, [report])
+
+    def test_timeout_is_recorded(self):
+        """A report running past the report timeout is abandoned and cancelled."""
+        provider = self.make_provider(lambda report_object, display: time.sleep(1), report_timeout=0.1)
+        report = self.make_report('slow')
+
+        s = time.perf_counter()
+        self.assertFalse(provider.execute_report_isolated(report, True))
+
+        self.assertLess(time.perf_counter() - s, 0.5)
+        self.assertEqual(report.status, 'TIMEOUT')
+        self.assertEqual(report.failed_report_logs['slow'][0]['exception'], 'TimeoutError')
+        provider.cancel_report.assert_called_once_with(report)
+
+    def test_success(self):
+        """A report executing normally is not recorded as failed."""
+        provider = self.make_provider(lambda report_object, display, cached: None)
+        report = self.make_report('ok')
+
+        self.assertTrue(provider.execute_report_isolated(report, True, cached=False))
+        self.assertEqual(provider.failed_reports, [])
+
+    def test_report_steps_are_isolated(self):
+        """An exception before execution or a failed dependency only fails its own report."""
+        provider = self.make_provider(lambda report_object, display: None)
+        provider.run_additional_logic_for_provider = MagicMock(side_effect=KeyError('cur_table'))
+
+        failing = self.make_report('failing')
+        failing.report_dependency_list = []
+        provider._run_report(failing, None, True, MagicMock(results={}), [])
+
+        dependent = self.make_report('dependent')
+        dependent.report_dependency_list = [{'dependency_report_name': 'shared'}]
+        scheduler = MagicMock(results={'dependency:cur.shared': RuntimeError('dependency failed')})
+        provider._run_report(dependent, None, True, scheduler, ['dependency:cur.shared'])
+
+        self.assertEqual(failing.failed_report_logs['failing'][0]['phase'], 'setup')
+        self.assertEqual(dependent.failed_report_logs['dependent'][0]['phase'], 'dependency')
+        self.assertEqual(provider.failed_reports, [failing, dependent])
+
+    def test_no_timeout_runs_inline(self):
+        """Without a report timeout the report executes on the calling thread."""
+        threads = []
+        provider = self.make_provider(lambda report_object, display: threads.append(threading.current_thread()), report_timeout=None)
+
+        self.assertTrue(provider.execute_report_isolated(self.make_report('inline'), True))
+        self.assertEqual(threads, [threading.current_thread()])
+
+    def test_abandoned_execution_does_not_write_to_report(self):
+        """The writes of an execution abandoned after the timeout do not reach the report."""
+        release = threading.Event()
+        finished = threading.Event()
+
+        def execute(report_object, display):
+            release.wait(5)
+            report_object.report_result.append('late')
+            report_object.fail_query = True
+            finished.set()
+
+        provider = self.make_provider(execute, report_timeout=0.1)
+        report = Report('slow')
+
+        self.assertFalse(provider.execute_report_isolated(report, True))
+        release.set()
+        self.assertTrue(finished.wait(5))
+
+        self.assertEqual(report.report_result, [])
+        self.assertFalse(hasattr(report, 'fail_query'))
+        self.assertEqual(report.status, 'TIMEOUT')
+
+    def test_completed_execution_writes_to_report(self):
+        """The results of an execution completed within the timeout are set on the report."""
+        def execute(report_object, display):
+            report_object.report_result.append('rows')
+            report_object.query_id = 'query'
+
+        provider = self.make_provider(execute)
+        report = Report('ok')
+
+        self.assertTrue(provider.execute_report_isolated(report, True))
+        self.assertEqual(report.report_result, ['rows'])
+        self.assertEqual(report.query_id, 'query')
+
+
+class TestAsyncReportSubmission(unittest.TestCase):
+    """Test cases for ReportProviderBase.submit_report."""
+
+    def setUp(self):
+        ReportProviderBase._async_slots = None
+        self.addCleanup(setattr, ReportProviderBase, '_async_slots', None)
+
+    def make_provider(self, execute):
+        provider = Provider.__new__(Provider)
+        provider.logger = logging.getLogger(__name__)
+        provider.execute_report = execute
+        provider.checkpoint_report = MagicMock()
+        return provider
+
+    def test_async_report_has_no_isolation_timeout(self):
+        """The async execution runs the report directly, exceptions are left to the report controller."""
+        def execute(report_object, display):
+            raise RuntimeError('athena unavailable')
+
+        provider = self.make_provider(execute)
+        provider.execute_report_isolated = MagicMock()
+        report = MagicMock()
+
+        with patch('CostMinimizer.report_providers.report_providers.Config') as mock_config:
+            mock_config.return_value.internals = {'internals': {'concurrency': {'max_async_workers': 2}}}
+            provider.submit_report(report, True)
+
+        with self.assertRaises(RuntimeError):
+            report.async_future.result(timeout=5)
+        provider.execute_report_isolated.assert_not_called()
+        provider.checkpoint_report.assert_not_called()
+
+    def test_abandoned_report_is_not_checkpointed(self):
+        """A report timed out by the controller while running does not checkpoint its late result."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def execute(report_object, display):
+            started.set()
+            release.wait(5)
+
+        provider = self.make_provider(execute)
+        report = MagicMock()
+
+        with patch('CostMinimizer.report_providers.report_providers.Config') as mock_config:
+            mock_config.return_value.internals = {'internals': {'concurrency': {'max_async_workers': 2}}}
+            provider.submit_report(report, True)
+
+        self.assertTrue(started.wait(5))
+        self.assertFalse(report.async_future.cancel())
+        report.async_abandoned = True
+        release.set()
+
+        self.assertFalse(report.async_future.result(timeout=5))
+        provider.checkpoint_report.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
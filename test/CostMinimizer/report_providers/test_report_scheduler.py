@@ -0,0 +1,229 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor, Future
+import logging
+import time
+
+from CostMinimizer.report_providers.report_scheduler import ReportScheduler, ReportDependencyCycleException
+from CostMinimizer.report_providers.report_providers import ReportProviderBase
+from CostMinimizer.service_helpers.compute_optimizer import ComputeOptimizerQuery
+from CostMinimizer.service_helpers.cost_explorer import CostAllocationTagCatalog
+from CostMinimizer.service_helpers.dynamodb import GlobalTableInspector
+from CostMinimizer.service_helpers.cloudtrail import TrailInventory
+
+
+class TestReportScheduler(unittest.TestCase):
+    """Test cases for the ReportScheduler class."""
+
+    def test_dependencies_run_first_and_once(self):
+        """A shared dependency runs once, before each of its dependents."""
+        calls = []
+
+        def task(name, delay=0.0):
+            def run():
+                time.sleep(delay)
+                calls.append(name)
+                return name
+            return run
+
+        scheduler = ReportScheduler(max_workers=4)
+        for report in ('a', 'b'):
+            scheduler.add('dependency:cur.shared', task('shared', 0.1))
+            scheduler.add(f'report:{report}', task(report), ['dependency:cur.shared'])
+        scheduler.add('report:c', task('c', 0.05))
+
+        results = scheduler.run()
+
+        self.assertEqual(calls.count('shared'), 1)
+        self.assertLess(calls.index('shared'), calls.index('a'))
+        self.assertLess(calls.index('shared'), calls.index('b'))
+        self.assertEqual(results['report:a'], 'a')
+
+        path = [key for key, _ in scheduler.critical_path()]
+        self.assertEqual(path[0], 'dependency:cur.shared')
+        self.assertIn('critical path: dependency:cur.shared', scheduler.summary())
+
+    def test_independent_reports_run_concurrently(self):
+        """Independent reports overlap up to max_workers."""
+        scheduler = ReportScheduler(max_workers=3)
+        for report in ('a', 'b', 'c'):
+            scheduler.add(f'report:{report}', lambda: time.sleep(0.2))
+
+        s = time.perf_counter()
+        scheduler.run()
+
+        self.assertLess(time.perf_counter() - s, 0.4)
+
+    def test_unknown_dependency(self):
+        """A dependency that was never added is rejected."""
+        scheduler = ReportScheduler()
+        scheduler.add('report:a', lambda: None, ['dependency:missing'])
+
+        with self.assertRaises(ReportDependencyCycleException):
+            scheduler.run()
+
+    def test_task_exception_propagates(self):
+        """The exception of a failed task is raised by run()."""
+        def fail():
+            raise ValueError('boom')
+
+        scheduler = ReportScheduler(max_workers=2)
+        scheduler.add('report:a', fail)
+
+        with self.assertRaises(ValueError):
+            scheduler.run()
+
+
+class TestDependencyReportSharing(unittest.TestCase):
+    """Test cases for the dependency sharing of ReportProviderBase."""
+
+    def test_dependency_runs_once_across_providers(self):
+        """Concurrent dependents of the same dependency share one execution."""
+        class Provider(ReportProviderBase):
+            def run_additional_logic_for_provider(self, report_object, additional_input_data=None):
+                pass
+
+        executions = []
+
+        def execute(report_object, report, cow_execution_type):
+            time.sleep(0.1)
+            executions.append(report['dependency_report_name'])
+            return 'data'
+
+        providers = []
+        for _ in range(4):
+            provider = Provider.__new__(Provider)
+            provider.logger = logging.getLogger(__name__)
+            provider.appConfig = MagicMock()
+            provider.appConfig.report_time = 'test-dependency-sharing'
+            provider._execute_dependency_report = execute
+            providers.append(provider)
+
+        dependency = {'dependency_report_provider': 'cur', 'dependency_report_name': 'shared', 'dependency_report_class': 'Shared'}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda p: p.run_dependency_report(MagicMock(), dependency, 'sync'), providers))
+
+        self.assertEqual(executions, ['shared'])
+        self.assertEqual(results, ['data'] * 4)
+
+        # a new run does not reuse the results of the previous one
+        ReportProviderBase.reset_run_state()
+        self.assertEqual(ReportProviderBase._dependency_results, {})
+        providers[0].run_dependency_report(MagicMock(), dependency, 'sync')
+        self.assertEqual(executions, ['shared', 'shared'])
+
+    def test_reset_run_state_clears_the_service_caches(self):
+        """The service caches kept for a run are emptied before the next run."""
+        ComputeOptimizerQuery._summaries['client'] = []
+        CostAllocationTagCatalog._tag_values['key'] = ([], 0)
+        GlobalTableInspector._versions['key'] = '2019.11.21'
+        TrailInventory._trails['key'] = []
+
+        ReportProviderBase.reset_run_state()
+
+        self.assertEqual(ComputeOptimizerQuery._summaries, {})
+        self.assertEqual(CostAllocationTagCatalog._tag_values, {})
+        self.assertEqual(GlobalTableInspector._versions, {})
+        self.assertEqual(TrailInventory._trails, {})
+
+    def make_provider(self):
+        class Provider(ReportProviderBase):
+            def name(self):
+                return 'cur'
+
+            def run_additional_logic_for_provider(self, report_object, additional_input_data=None):
+                pass
+
+        provider = Provider.__new__(Provider)
+        provider.logger = logging.getLogger(__name__)
+        provider.appConfig = MagicMock()
+        provider.appConfig.report_time = 'test-report-execution'
+        provider.failed_reports = []
+        return provider
+
+    def make_report(self):
+        report_object = MagicMock()
+        report_object.name.return_value = 'shared'
+        report_object.report_dependency_list = []
+        report_object.async_future = None
+        return report_object
+
+    def test_selected_report_and_dependency_execute_once(self):
+        """A selected report that is also a dependency executes once, the other run adopts its results."""
+        ReportProviderBase.reset_run_state()
+        selected, dependency = self.make_provider(), self.make_provider()
+        executions = []
+
+        def run_steps(report_object, additional_input_data, display):
+            executions.append(report_object)
+            report_object.report_result = [{'Data': 'rows'}]
+
+        selected._run_report_steps = run_steps
+        dependency._run_report_steps = run_steps
+
+        selected_report, dependency_report = self.make_report(), self.make_report()
+        selected._run_report(selected_report, None, False, MagicMock(), [])
+        dependency._run_report(dependency_report, None, False, MagicMock(), [])
+
+        self.assertEqual(executions, [selected_report])
+        self.assertEqual(dependency_report.report_result, [{'Data': 'rows'}])
+        self.assertTrue(dependency_report.execution_recorded)
+
+    def test_failed_execution_fails_the_adopting_run(self):
+        """A report whose shared execution failed is failed in the other run too."""
+        ReportProviderBase.reset_run_state()
+        selected, dependency = self.make_provider(), self.make_provider()
+
+        def fail(report_object, additional_input_data, display):
+            raise ValueError('boom')
+
+        selected._run_report_steps = fail
+        selected.record_report_failure = MagicMock()
+        dependency.record_report_failure = MagicMock()
+
+        selected._run_report(self.make_report(), None, False, MagicMock(), [])
+        dependency._run_report(self.make_report(), None, False, MagicMock(), [])
+
+        dependency.record_report_failure.assert_called_once()
+
+    def test_dependency_data_in_async_mode(self):
+        """In async mode the dependency reports are waited for and their data is returned."""
+        provider = self.make_provider()
+        provider.module_path = 'CostMinimizer.report_providers'
+        provider.appConfig.cow_execution_type = 'async'
+
+        dependency_provider = MagicMock()
+        dependency_provider.wait_for_async_reports.return_value = ['executed report']
+        dependency_provider.get_data.return_value = 'data'
+        module = MagicMock()
+        module.CurReports.return_value = dependency_provider
+
+        dependency = {'dependency_report_provider': 'cur', 'dependency_report_name': 'shared', 'dependency_report_class': 'Shared'}
+        with patch('CostMinimizer.report_providers.report_providers.importlib.import_module', return_value=module):
+            data = provider._execute_dependency_report(self.make_report(), dependency, 'async')
+
+        self.assertEqual(data, 'data')
+        self.assertEqual(dependency_provider.fetch_data.call_args[0][0], ['executed report'])
+
+    def test_wait_for_async_reports(self):
+        """Completed async reports are returned, abandoned and failed ones are not."""
+        provider = self.make_provider()
+        provider.record_report_failure = MagicMock()
+
+        reports = []
+        for result in (True, False, ValueError('boom')):
+            report_object = self.make_report()
+            report_object.async_future = Future()
+            report_object.async_submit_time = time.monotonic()
+            report_object.async_timeout.return_value = 5
+            if isinstance(result, Exception):
+                report_object.async_future.set_exception(result)
+            else:
+                report_object.async_future.set_result(result)
+            reports.append(report_object)
+
+        self.assertEqual(provider.wait_for_async_reports(reports), reports[:1])
+        provider.record_report_failure.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+from datetime import datetime, timezone
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from CostMinimizer.report_providers.cur_reports.cur_base import AWSSnapshots
+
+
+class FakeEc2:
+    '''describe_snapshots over a fixed set of snapshots, deleted ids fail the whole call like EC2'''
+    def __init__(self, existing):
+        self.existing = existing
+        self.calls = []
+        # first snapshot id of a batch -> errors raised by the next calls for that batch
+        self.errors = {}
+
+    def describe_snapshots(self, SnapshotIds):
+        self.calls.append(list(SnapshotIds))
+        if self.errors.get(SnapshotIds[0]):
+            raise self.errors[SnapshotIds[0]].pop(0)
+        missing = [s for s in SnapshotIds if s not in self.existing]
+        if missing:
+            raise ClientError({'Error': {'Code': 'InvalidSnapshot.NotFound', 'Message': f"The snapshot '{missing[0]}' does not exist."}}, 'DescribeSnapshots')
+        return {'Snapshots': [{'SnapshotId': s, 'VolumeSize': 8, 'State': 'completed', 'Description': '',
+            'StartTime': datetime(2023, 1, 1, tzinfo=timezone.utc)} for s in SnapshotIds]}
+
+
+class FakeEbs:
+    '''list_snapshot_blocks returning 2 pages of 3 blocks per snapshot'''
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.unreachable = set()
+
+    def list_snapshot_blocks(self, SnapshotId, MaxResults, NextToken=None):
+        with self.lock:
+            self.calls += 1
+        if SnapshotId in self.unreachable:
+            raise EndpointConnectionError(endpoint_url='https://ebs.us-east-1.amazonaws.com')
+        if NextToken is None:
+            return {'Blocks': [{}] * 3, 'NextToken': 'page-2'}
+        return {'Blocks': [{}] * 3}
+
+
+@pytest.mark.usefixtures('tooling_database', 'mock_config')
+class TestAWSSnapshots(unittest.TestCase):
+    """Test cases for the batched snapshot metadata engine of AWSSnapshots."""
+
+    database_tables = ['cowsnapshotinfo']
+    config_target = 'CostMinimizer.report_providers.cur_reports.cur_base.Config'
+    config_internals = {'ebs_snapshots': {'max_workers': 4}}
+
+    def setUp(self):
+        existing = {f'snap-{i:017x}' for i in range(1500)}
+        self.ec2 = FakeEc2(existing)
+        self.ebs = FakeEbs()
+
+        self.mock_config_instance.get_client.side_effect = lambda service, region_name=None: self.ec2 if service == 'ec2' else self.ebs
+
+        app = MagicMock()
+        app.database = self.database
+        self.snapshots = AWSSnapshots(app)
+
+    def test_batched_and_cached(self):
+        """Snapshots are described in batches of 1000, deleted ones are skipped and completed ones cached."""
+        requested = [(f'snap-{i:017x}', 'US East (N. Virginia)') for i in range(1500)] + [('snap-deadbeef', 'US East (N. Virginia)')]
+
+        info = self.snapshots.get_snapshots_info(requested)
+
+        self.assertEqual(len(info), 1500)
+        self.assertEqual(info['snap-00000000000000000']['block_count'], 6)
+        self.assertEqual(info['snap-00000000000000000']['actual_data_size_bytes'], 6 * 512 * 1024)
+        # 1000 + (501 with the deleted snapshot, retried with 500)
+        self.assertEqual([len(c) for c in self.ec2.calls], [1000, 501, 500])
+        self.assertEqual(self.ebs.calls, 3000)
+
+        self.ec2.calls.clear()
+        again = self.snapshots.get_snapshot_info('snap-00000000000000000', 'US East (N. Virginia)')
+        self.assertEqual(again['start_time'], datetime(2023, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(self.ec2.calls, [])
+        self.assertEqual(self.ebs.calls, 3000)
+
+    def test_failing_batch_is_retried_then_skipped(self):
+        """A throttled batch is retried, a batch failing every attempt is skipped without dropping the others."""
+        self.snapshots.RETRY_DELAY = 0
+        throttling = lambda: ClientError({'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Request limit exceeded.'}}, 'DescribeSnapshots')
+        self.ec2.errors['snap-00000000000000000'] = [throttling()]
+        self.ec2.errors['snap-000000000000003e8'] = [throttling() for _ in range(AWSSnapshots.DESCRIBE_ATTEMPTS)]
+        requested = [(f'snap-{i:017x}', 'US East (N. Virginia)') for i in range(1500)]
+
+        info = self.snapshots.get_snapshots_info(requested)
+
+        self.assertEqual(len(info), 1000)
+        self.assertIn('snap-00000000000000000', info)
+        self.assertNotIn('snap-000000000000003e8', info)
+        self.assertEqual([len(c) for c in self.ec2.calls], [1000, 1000] + [500] * AWSSnapshots.DESCRIBE_ATTEMPTS)
+
+    def test_unreachable_block_api_keeps_the_snapshot(self):
+        """A connection error while counting blocks leaves the block count unknown and the snapshot uncached."""
+        self.ebs.unreachable.add('snap-00000000000000001')
+        requested = [(f'snap-{i:017x}', 'US East (N. Virginia)') for i in range(3)]
+
+        info = self.snapshots.get_snapshots_info(requested)
+
+        self.assertEqual(len(info), 3)
+        self.assertNotIn('block_count', info['snap-00000000000000001'])
+        self.assertEqual(info['snap-00000000000000002']['block_count'], 6)
+        self.assertEqual(sorted(self.database.get_snapshot_info([s for s, _ in requested])), ['snap-00000000000000000', 'snap-00000000000000002'])
+
+if __name__ == '__main__':
+    unittest.main()
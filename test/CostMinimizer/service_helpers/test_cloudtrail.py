@@ -0,0 +1,51 @@
+import unittest
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from CostMinimizer.service_helpers.cloudtrail import TrailInventory
+
+
+@pytest.mark.usefixtures('mock_config')
+class TestTrailInventory(unittest.TestCase):
+    """Test cases for the TrailInventory class."""
+
+    config_target = 'CostMinimizer.service_helpers.cloudtrail.Config'
+    config_internals = {'cloudtrail': {'max_workers': 1}}
+
+    def setUp(self):
+        self.client = boto3.client('cloudtrail', region_name='us-east-1',
+            aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.stubber = Stubber(self.client)
+
+        self.mock_config_instance.get_client.return_value = self.client
+
+        TrailInventory._trails = {}
+        self.addCleanup(setattr, TrailInventory, '_trails', {})
+
+    def test_trails_are_paged_described_and_memoized(self):
+        """list_trails pages are followed, trails are described by ARN and a region is only read once per run."""
+        arns = [f'arn:aws:cloudtrail:us-east-1:111111111111:trail/{name}' for name in ('management', 'data')]
+
+        self.stubber.add_response('list_trails', {'Trails': [{'TrailARN': arns[0]}], 'NextToken': 'page-2'}, {})
+        self.stubber.add_response('list_trails', {'Trails': [{'TrailARN': arns[1]}]}, {'NextToken': 'page-2'})
+        self.stubber.add_response('describe_trails',
+            {'trailList': [
+                {'TrailARN': arns[0], 'Name': 'management', 'HomeRegion': 'us-east-1', 'IsMultiRegionTrail': True},
+                {'TrailARN': arns[1], 'Name': 'data', 'HomeRegion': 'us-east-1', 'IsMultiRegionTrail': False}]},
+            {'trailNameList': arns, 'includeShadowTrails': True})
+
+        with self.stubber:
+            inventory = TrailInventory(account='111111111111')
+            df = inventory.get_trails(['us-east-1'])
+            again = inventory.get_trails(['us-east-1'])
+
+        self.assertEqual(list(df['cloudtrail_name']), ['management', 'data'])
+        self.assertEqual(list(df['is_multi_region_trail']), [True, False])
+        self.assertEqual(df.to_dict('records'), again.to_dict('records'))
+        self.stubber.assert_no_pending_responses()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import time
+import unittest
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+import boto3
+import pytest
+from botocore.stub import Stubber, ANY
+
+from CostMinimizer.service_helpers.cloudwatch import MetricDataFetcher, metric_spec
+
+
+@pytest.mark.usefixtures('mock_config')
+class TestMetricDataFetcher(unittest.TestCase):
+    """Test cases for the MetricDataFetcher class."""
+
+    config_target = 'CostMinimizer.service_helpers.cloudwatch.Config'
+    config_internals = {'cloudwatch': {'cache_retention_days': 35}}
+
+    def setUp(self):
+        self.client = boto3.client('cloudwatch', region_name='us-east-1',
+            aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.stubber = Stubber(self.client)
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_directory.cleanup)
+
+        self.mock_config_instance.get_account_client.return_value = self.client
+
+        self.specs = [metric_spec('AWS/DocDB', 'DatabaseConnectionsMax', {'DBClusterIdentifier': f'cluster-{i}'}, stat='Sum') for i in range(501)]
+        self.end_time = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+        self.start_time = self.end_time - timedelta(days=7)
+
+    def stub_requests(self):
+        expected = {'MetricDataQueries': ANY, 'StartTime': self.start_time, 'EndTime': self.end_time}
+        stamp = self.start_time
+        self.stubber.add_response('get_metric_data',
+            {'MetricDataResults': [{'Id': 'm0', 'Label': 'cluster-0', 'Timestamps': [stamp], 'Values': [1.0]}], 'NextToken': 'page-2'},
+            expected)
+        self.stubber.add_response('get_metric_data',
+            {'MetricDataResults': [{'Id': 'm0', 'Label': 'cluster-0', 'Timestamps': [stamp], 'Values': [2.0]},
+                                   {'Id': 'm499', 'Label': 'cluster-499', 'Timestamps': [stamp], 'Values': [3.0]}]},
+            dict(expected, NextToken='page-2'))
+        self.stubber.add_response('get_metric_data',
+            {'MetricDataResults': [{'Id': 'm0', 'Label': 'cluster-500', 'Timestamps': [stamp], 'Values': [4.0]}]},
+            expected)
+
+    def test_queries_are_packed_and_closed_windows_cached(self):
+        """501 metrics take 2 requests plus a NextToken page, a closed window is read from the cache."""
+        self.stub_requests()
+
+        with self.stubber:
+            fetcher = MetricDataFetcher(max_workers=2, cache_directory=self.cache_directory.name)
+            df = fetcher.fetch({('111111111111', 'us-east-1'): self.specs}, self.start_time, self.end_time)
+            cached = fetcher.fetch({('111111111111', 'us-east-1'): self.specs}, self.start_time, self.end_time)
+
+        self.stubber.assert_no_pending_responses()
+        self.assertEqual(df.groupby('label')['value'].sum().to_dict(), {'cluster-0': 3.0, 'cluster-499': 3.0, 'cluster-500': 4.0})
+        self.assertEqual(set(df['account']), {'111111111111'})
+        self.assertTrue(cached.equals(df))
+
+    def test_each_account_uses_its_own_client(self):
+        """The metrics of a linked account are read with a client of that account."""
+        self.stubber.add_response('get_metric_data', {'MetricDataResults': []})
+        self.stubber.add_response('get_metric_data', {'MetricDataResults': []})
+
+        with self.stubber:
+            fetcher = MetricDataFetcher(max_workers=1, cache_directory=self.cache_directory.name)
+            fetcher.fetch({('111111111111', 'us-east-1'): self.specs[:1], ('222222222222', 'eu-west-1'): self.specs[:1]}, self.start_time, self.end_time)
+
+        calls = [c.args for c in self.mock_config_instance.get_account_client.call_args_list]
+        self.assertEqual(sorted(calls), [('111111111111', 'cloudwatch'), ('222222222222', 'cloudwatch')])
+        self.assertEqual(sorted(c.kwargs['region_name'] for c in self.mock_config_instance.get_account_client.call_args_list), ['eu-west-1', 'us-east-1'])
+
+    def test_failed_account_is_reported_and_not_cached(self):
+        """An account whose role cannot be assumed has no row, is listed in failed_batches and is not cached."""
+        self.mock_config_instance.get_account_client.side_effect = RuntimeError('AccessDenied')
+
+        fetcher = MetricDataFetcher(max_workers=1, cache_directory=self.cache_directory.name)
+        df = fetcher.fetch({('222222222222', 'us-east-1'): self.specs[:1]}, self.start_time, self.end_time)
+
+        self.assertTrue(df.empty)
+        self.assertEqual(fetcher.failed_batches, {('222222222222', 'us-east-1')})
+        self.assertEqual(list(Path(self.cache_directory.name).glob('*.pkl')), [])
+
+    def test_expired_cache_files_are_purged(self):
+        """Cache files older than cache_retention_days are deleted, recent ones are kept."""
+        directory = Path(self.cache_directory.name)
+        expired, recent = directory / 'expired.pkl', directory / 'recent.pkl'
+        expired.touch()
+        recent.touch()
+        old = time.time() - 36 * 86400
+        os.utime(expired, (old, old))
+
+        purged = MetricDataFetcher(cache_directory=self.cache_directory.name).purge_expired_cache()
+
+        self.assertEqual(purged, ['expired.pkl'])
+        self.assertFalse(expired.exists())
+        self.assertTrue(recent.exists())
+
+if __name__ == '__main__':
+    unittest.main()
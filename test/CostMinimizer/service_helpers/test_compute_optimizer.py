@@ -0,0 +1,128 @@
+import unittest
+import io
+import os
+
+import boto3
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from CostMinimizer.service_helpers.compute_optimizer import ComputeOptimizerQuery, EC2_EXPORT_FIELDS
+
+EXPORT_FIXTURE = os.path.join(os.path.dirname(__file__), 'data', 'co_ec2_instance_recommendations.csv')
+
+
+def make_recommendation(instance_id):
+    return {
+        'accountId': '111111111111',
+        'instanceArn': f'arn:aws:ec2:us-east-1:111111111111:instance/{instance_id}',
+        'instanceName': instance_id,
+        'currentInstanceType': 'm5.large',
+        'finding': 'Overprovisioned',
+        'recommendationOptions': [{'instanceType': 'm6g.large', 'rank': 1}]
+    }
+
+
+@pytest.mark.usefixtures('mock_config')
+class TestComputeOptimizerQuery(unittest.TestCase):
+    """Test cases for the ComputeOptimizerQuery class."""
+
+    config_target = 'CostMinimizer.service_helpers.compute_optimizer.Config'
+    config_internals = {'compute_optimizer': {}}
+
+    def setUp(self):
+        credentials = {'region_name': 'us-east-1', 'aws_access_key_id': 'testing', 'aws_secret_access_key': 'testing'}
+        self.client = boto3.client('compute-optimizer', **credentials)
+        self.s3_client = boto3.client('s3', **credentials)
+        self.stubber = Stubber(self.client)
+        self.s3_stubber = Stubber(self.s3_client)
+
+    def set_co_config(self, co_config):
+        self.mock_config_instance.internals = {'internals': {'compute_optimizer': co_config}}
+
+    def stub_summaries(self, count):
+        self.stubber.add_response('get_recommendation_summaries', {'recommendationSummaries': [
+            {'recommendationResourceType': 'Ec2Instance', 'accountId': '111111111111',
+             'savingsOpportunity': {'estimatedMonthlySavings': {'currency': 'USD', 'value': 250.0}},
+             'summaries': [{'name': 'Overprovisioned', 'value': count - 1}, {'name': 'Underprovisioned', 'value': 1},
+                           {'name': 'Optimized', 'value': 4000}]},
+            {'recommendationResourceType': 'Ec2Instance', 'accountId': '222222222222',
+             'savingsOpportunity': {'estimatedMonthlySavings': {'currency': 'USD', 'value': 0.0}},
+             'summaries': [{'name': 'Overprovisioned', 'value': 3}]},
+            {'recommendationResourceType': 'EbsVolume', 'accountId': '111111111111',
+             'summaries': [{'name': 'Optimized', 'value': 500}]}]})
+
+    def test_recommendations_are_paginated(self):
+        """By default all pages are read without a summary plan when no export bucket is configured."""
+        self.stubber.add_response('get_ec2_instance_recommendations',
+            {'instanceRecommendations': [make_recommendation('i-1'), make_recommendation('i-2')], 'nextToken': 'page-2'},
+            {'maxResults': 1000})
+        self.stubber.add_response('get_ec2_instance_recommendations',
+            {'instanceRecommendations': [make_recommendation('i-3')]},
+            {'maxResults': 1000, 'nextToken': 'page-2'})
+
+        with self.stubber:
+            recommendations = ComputeOptimizerQuery(self.client).get_ec2_instance_recommendations()
+
+        self.assertEqual([r['instanceName'] for r in recommendations], ['i-1', 'i-2', 'i-3'])
+        self.stubber.assert_no_pending_responses()
+
+    def test_summary_first_skips_optimized_resources(self):
+        """Only accounts and findings with a savings opportunity are requested, the summaries are read once."""
+        self.set_co_config({'export_bucket': 'exports', 'bulk_export_threshold': 100, 'summary_first': True})
+        self.stub_summaries(10)
+        self.stubber.add_response('get_ec2_instance_recommendations',
+            {'instanceRecommendations': [make_recommendation('i-1')]},
+            {'maxResults': 1000, 'accountIds': ['111111111111'],
+             'filters': [{'name': 'Finding', 'values': ['Overprovisioned', 'Underprovisioned']}]})
+
+        with self.stubber:
+            query = ComputeOptimizerQuery(self.client, self.s3_client)
+            recommendations = query.get_ec2_instance_recommendations()
+            # no EBS volume to improve: no get_ebs_volume_recommendations call
+            self.assertEqual(query.get_ebs_volume_recommendations(), [])
+
+        self.assertEqual(len(recommendations), 1)
+        self.stubber.assert_no_pending_responses()
+
+    def test_large_fleet_is_exported(self):
+        """Above the threshold, the recommendations are exported to S3 and read from the CSV.
+
+        The summaries do not reflect the recommendation preferences, so every account and finding is exported.
+        """
+        self.set_co_config({'export_bucket': 'exports', 'export_key_prefix': 'co', 'bulk_export_threshold': 100,
+            'export_poll_interval': 0, 'summary_first': True})
+        preferences = {'cpuVendorArchitectures': ['AWS_ARM64']}
+        destination = {'bucket': 'exports', 'key': 'co/ec2.csv', 'metadataKey': 'co/ec2.json'}
+
+        self.stub_summaries(100)
+        self.stubber.add_response('export_ec2_instance_recommendations',
+            {'jobId': 'job-1', 's3Destination': destination},
+            {'s3DestinationConfig': {'bucket': 'exports', 'keyPrefix': 'co'}, 'fieldsToExport': EC2_EXPORT_FIELDS,
+             'fileFormat': 'Csv', 'recommendationPreferences': preferences})
+        for status in ('InProgress', 'Complete'):
+            self.stubber.add_response('describe_recommendation_export_jobs',
+                {'recommendationExportJobs': [{'jobId': 'job-1', 'status': status}]}, {'jobIds': ['job-1']})
+
+        with open(EXPORT_FIXTURE, 'rb') as f:
+            data = f.read()
+        self.s3_stubber.add_response('get_object', {'Body': StreamingBody(io.BytesIO(data), len(data))},
+            {'Bucket': 'exports', 'Key': 'co/ec2.csv'})
+
+        with self.stubber, self.s3_stubber:
+            recommendations = ComputeOptimizerQuery(self.client, self.s3_client).get_ec2_instance_recommendations(preferences)
+
+        self.stubber.assert_no_pending_responses()
+        self.s3_stubber.assert_no_pending_responses()
+        self.assertEqual(len(recommendations), 3)
+
+        first = recommendations[0]
+        self.assertEqual(first['currentInstanceType'], 'm5.2xlarge')
+        self.assertEqual([o['instanceType'] for o in first['recommendationOptions']], ['m6g.xlarge', 'm5.xlarge'])
+        self.assertEqual(first['recommendationOptions'][0]['rank'], 1)
+        self.assertEqual(first['recommendationOptions'][0]['savingsOpportunity']['estimatedMonthlySavings']['value'], 120.5)
+        self.assertEqual(recommendations[1]['instanceName'], '')
+        self.assertEqual(recommendations[2]['recommendationOptions'][0]['savingsOpportunity']['estimatedMonthlySavings']['value'], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import tempfile
+import threading
+from datetime import date
+
+import pytest
+from dateutil.relativedelta import relativedelta
+
+from CostMinimizer.service_helpers.cost_explorer import ClosedMonthCache, CostAllocationTagCatalog
+
+
+@pytest.mark.usefixtures('mock_config')
+class TestClosedMonthCache(unittest.TestCase):
+    """Test cases for the ClosedMonthCache class."""
+
+    config_target = 'CostMinimizer.service_helpers.cost_explorer.Config'
+
+    def setUp(self):
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_directory.cleanup)
+
+        # 12 closed months followed by the open month
+        end = date.today().replace(day=1) + relativedelta(months=1)
+        start = end - relativedelta(months=13)
+        self.request = {
+            'TimePeriod': {'Start': start.isoformat(), 'End': end.isoformat()},
+            'Granularity': 'MONTHLY',
+            'Metrics': ['UnblendedCost'],
+            'GroupBy': [{'Type': 'DIMENSION', 'Key': 'SERVICE'}]}
+
+        self.client = MagicMock()
+        self.client.get_cost_and_usage.side_effect = self.get_cost_and_usage
+
+        self.mock_config_instance.get_caller_identity.return_value = {'Account': '111111111111'}
+        self.mock_config_instance.customers.get_customer_profile_name.return_value = 'customer-a'
+
+    def get_cost_and_usage(self, TimePeriod, **kwargs):
+        results = []
+        for start, end in ClosedMonthCache.split_months(TimePeriod):
+            results.append({
+                'TimePeriod': {'Start': start, 'End': end},
+                'Total': {},
+                'Groups': [{'Keys': ['Amazon EC2'], 'Metrics': {'UnblendedCost': {'Amount': '1.0', 'Unit': 'USD'}}}],
+                'Estimated': end > date.today().isoformat()})
+        return {'ResultsByTime': results}
+
+    def test_closed_months_are_served_from_disk(self):
+        """Only the open month is requested again once the closed months are cached."""
+        cache = ClosedMonthCache(cache_directory=self.cache_directory.name, grace_days=0)
+
+        first = cache.get_results(self.client, self.request)
+        second = cache.get_results(self.client, self.request)
+
+        self.assertEqual(len(first), 13)
+        self.assertEqual(first, second)
+        self.assertEqual(self.client.get_cost_and_usage.call_count, 2)
+
+        open_month = self.client.get_cost_and_usage.call_args[1]['TimePeriod']
+        self.assertEqual(open_month['Start'], date.today().replace(day=1).isoformat())
+
+    def test_cache_is_scoped_to_the_account(self):
+        """The same request shape made from another account is not served the cached months of the first one."""
+        ClosedMonthCache(cache_directory=self.cache_directory.name, grace_days=0).get_results(self.client, self.request)
+        other = ClosedMonthCache(cache_directory=self.cache_directory.name, grace_days=0, account='222222222222')
+
+        self.assertNotEqual(other.get_shape_key(self.request), ClosedMonthCache(cache_directory=self.cache_directory.name).get_shape_key(self.request))
+        self.assertEqual(len(other.get_results(self.client, self.request)), 13)
+        self.assertEqual(self.client.get_cost_and_usage.call_count, 2)
+        self.assertEqual(self.client.get_cost_and_usage.call_args[1]['TimePeriod'], self.request['TimePeriod'])
+
+        # another customer profile of the same account is a separate cache as well
+        profile = ClosedMonthCache(cache_directory=self.cache_directory.name, profile_name='customer-b')
+        self.assertNotEqual(profile.get_shape_key(self.request), other.get_shape_key(self.request))
+        self.assertNotEqual(profile.get_shape_key(self.request), ClosedMonthCache(cache_directory=self.cache_directory.name).get_shape_key(self.request))
+
+    def test_pages_of_a_month_are_merged(self):
+        """Groups of a month returned over several pages end up in a single result."""
+        page = {'TimePeriod': {'Start': '2026-01-01', 'End': '2026-02-01'}, 'Groups': [{'Keys': ['a']}]}
+        self.client.get_cost_and_usage.side_effect = [
+            {'ResultsByTime': [page], 'NextPageToken': 'page-2'},
+            {'ResultsByTime': [dict(page, Groups=[{'Keys': ['b']}])]}]
+
+        results = ClosedMonthCache.fetch(self.client, {'TimePeriod': page['TimePeriod'], 'Granularity': 'MONTHLY'})
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual([g['Keys'][0] for g in results[0]['Groups']], ['a', 'b'])
+        self.assertEqual(self.client.get_cost_and_usage.call_args[1]['NextPageToken'], 'page-2')
+
+
+@pytest.mark.usefixtures('tooling_database', 'mock_config')
+class TestCostAllocationTagCatalog(unittest.TestCase):
+    """Test cases for the CostAllocationTagCatalog class."""
+
+    database_tables = ['cowcetagcatalog']
+    config_target = 'CostMinimizer.service_helpers.cost_explorer.Config'
+    config_internals = {'ce_reports': {'tag_catalog_ttl': 3600}}
+
+    def setUp(self):
+        CostAllocationTagCatalog.reset()
+        self.addCleanup(CostAllocationTagCatalog.reset)
+        self.mock_config_instance.get_caller_identity.return_value = {'Account': '111111111111'}
+
+        self.client = MagicMock()
+        self.client.get_tags.side_effect = [
+            {'Tags': ['prod'], 'NextPageToken': 'page-2'},
+            {'Tags': ['dev']}]
+
+    def test_tag_values_are_fetched_once(self):
+        """All reports share one paged get_tags pass, later runs read the stored values."""
+        args = ('team', '*', '2025-10-01', '2026-10-19')
+
+        self.assertEqual(CostAllocationTagCatalog(self.client).get_tag_values(*args), ['prod', 'dev'])
+        self.assertEqual(CostAllocationTagCatalog(self.client).get_tag_values(*args), ['prod', 'dev'])
+        self.assertEqual(self.client.get_tags.call_count, 2)
+
+        # a new run within the ttl is served from the database
+        CostAllocationTagCatalog.reset()
+        self.assertEqual(CostAllocationTagCatalog(self.client).get_tag_values(*args), ['prod', 'dev'])
+        self.assertEqual(self.client.get_tags.call_count, 2)
+
+    def test_tag_values_are_scoped_to_the_account(self):
+        """Another account does not read the values stored for the first one."""
+        args = ('team', '*', '2025-10-01', '2026-10-19')
+        self.client.get_tags.side_effect = [{'Tags': ['prod']}, {'Tags': ['sandbox']}]
+
+        self.assertEqual(CostAllocationTagCatalog(self.client).get_tag_values(*args), ['prod'])
+        self.assertEqual(CostAllocationTagCatalog(self.client, account='222222222222').get_tag_values(*args), ['sandbox'])
+
+        CostAllocationTagCatalog.reset()
+        self.assertEqual(CostAllocationTagCatalog(self.client).get_tag_values(*args), ['prod'])
+        self.assertEqual(self.client.get_tags.call_count, 2)
+
+    def test_tag_values_in_memory_expire_after_the_ttl(self):
+        """Values kept in memory longer than tag_catalog_ttl are fetched again."""
+        args = ('team', '*', '2025-10-01', '2026-10-19')
+        self.client.get_tags.side_effect = [{'Tags': ['prod']}, {'Tags': ['sandbox']}]
+
+        with patch('CostMinimizer.service_helpers.cost_explorer.time.time', return_value=1000.0):
+            self.assertEqual(CostAllocationTagCatalog(self.client).get_tag_values(*args), ['prod'])
+        with patch('CostMinimizer.service_helpers.cost_explorer.time.time', return_value=1000.0 + 3600):
+            self.assertEqual(CostAllocationTagCatalog(self.client).get_tag_values(*args), ['sandbox'])
+
+        self.assertEqual(self.client.get_tags.call_count, 2)
+
+    def test_slow_fetch_does_not_block_other_tags(self):
+        """A tag key being fetched only holds its own lock, other tag keys are served meanwhile."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def get_tags(TagKey, **kwargs):
+            if TagKey == 'team':
+                started.set()
+                release.wait(5)
+            return {'Tags': [TagKey]}
+        self.client.get_tags.side_effect = get_tags
+
+        slow = threading.Thread(target=CostAllocationTagCatalog(self.client).get_tag_values, args=('team', '*', '2025-10-01', '2026-10-19'))
+        slow.start()
+        self.assertTrue(started.wait(5))
+
+        self.assertEqual(CostAllocationTagCatalog(self.client).get_tag_values('env', '*', '2025-10-01', '2026-10-19'), ['env'])
+        self.assertTrue(slow.is_alive())
+
+        release.set()
+        slow.join(5)
+        self.assertEqual(CostAllocationTagCatalog(self.client).get_tag_values('team', '*', '2025-10-01', '2026-10-19'), ['team'])
+        self.assertEqual(self.client.get_tags.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from CostMinimizer.service_helpers.dynamodb import GlobalTableInspector
+
+
+@pytest.mark.usefixtures('mock_config')
+class TestGlobalTableInspector(unittest.TestCase):
+    """Test cases for the GlobalTableInspector class."""
+
+    config_target = 'CostMinimizer.service_helpers.dynamodb.Config'
+    config_internals = {'dynamodb': {'max_workers': 1}}
+
+    def setUp(self):
+        self.client = boto3.client('dynamodb', region_name='us-east-1',
+            aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.stubber = Stubber(self.client)
+
+        self.mock_config_instance.get_account_client.return_value = self.client
+
+        GlobalTableInspector._versions = {}
+        self.addCleanup(setattr, GlobalTableInspector, '_versions', {})
+
+    def test_tables_are_listed_by_page_and_described_once(self):
+        """All list_global_tables pages are read and each table is described once per run."""
+        self.stubber.add_response('list_global_tables',
+            {'GlobalTables': [{'GlobalTableName': 'orders'}], 'LastEvaluatedGlobalTableName': 'orders'},
+            {'Limit': 100})
+        self.stubber.add_response('list_global_tables',
+            {'GlobalTables': [{'GlobalTableName': 'users'}]},
+            {'Limit': 100, 'ExclusiveStartGlobalTableName': 'orders'})
+        self.stubber.add_response('describe_table', {'Table': {'TableName': 'orders', 'GlobalTableVersion': '2017.11.29'}}, {'TableName': 'orders'})
+        self.stubber.add_client_error('describe_table', 'ResourceNotFoundException', expected_params={'TableName': 'users'})
+        # second run: only the listing is requested again
+        self.stubber.add_response('list_global_tables', {'GlobalTables': [{'GlobalTableName': 'orders'}, {'GlobalTableName': 'users'}]}, {'Limit': 100})
+
+        with self.stubber:
+            inspector = GlobalTableInspector(account='111111111111')
+            df = inspector.get_global_tables(['us-east-1'])
+            again = inspector.get_global_tables(['us-east-1'])
+
+        self.assertEqual(list(df['global_table_name']), ['orders', 'users'])
+        self.assertEqual(list(df['global_table_version']), ['2017.11.29', ''])
+        self.assertEqual(df.to_dict('records'), again.to_dict('records'))
+        self.stubber.assert_no_pending_responses()
+
+        self.mock_config_instance.get_account_client.assert_called_with('111111111111', 'dynamodb', region_name='us-east-1')
+
+    def test_region_not_listed_is_reported(self):
+        """A region whose global tables cannot be listed, e.g. no role in the account, is in failed_regions."""
+        self.stubber.add_client_error('list_global_tables', 'AccessDeniedException', expected_params={'Limit': 100})
+
+        with self.stubber:
+            inspector = GlobalTableInspector(account='222222222222')
+            df = inspector.get_global_tables(['us-east-1'])
+
+        self.assertTrue(df.empty)
+        self.assertEqual(inspector.failed_regions, {'us-east-1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
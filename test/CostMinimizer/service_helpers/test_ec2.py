@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import MagicMock
+import pandas as pd
+import pytest
+
+from CostMinimizer.service_helpers.ec2 import Ec2Query
+
+
+@pytest.mark.usefixtures('mock_config')
+class TestEc2Query(unittest.TestCase):
+    """Test cases for the precondition CUR lookups of Ec2Query."""
+
+    config_target = 'CostMinimizer.service_helpers.ec2.Config'
+
+    def setUp(self):
+        self.report = MagicMock()
+        self.report.get_report_dataframe.return_value = pd.DataFrame({
+            'line_item_resource_id': ['i-1', 'i-2', 'i-1', 'i-3'],
+            'line_item_unblended_cost': ['12.5', '3', '99', 'n/a']
+        })
+
+        self.mock_config_instance.precondition_reports.precondition_reports_in_progress = [self.report]
+
+        Ec2Query._cost_index = None
+        Ec2Query._cost_index_source = None
+
+    def test_single_lookup(self):
+        """First row of a resource is used, unknown or unparsable costs are 0.0."""
+        query = Ec2Query()
+
+        self.assertEqual(query.get_instance_unblended_cost_from_cur('i-1'), (12.5, 'usd'))
+        self.assertEqual(query.get_instance_unblended_cost_from_cur('i-3'), (0.0, 'usd'))
+        self.assertEqual(query.get_instance_unblended_cost_from_cur('i-9'), (0.0, 'usd'))
+
+    def test_batch_lookup_builds_index_once(self):
+        """The dataframe is read once across lookups and Ec2Query instances."""
+        result = Ec2Query().get_instances_unblended_cost_from_cur(['i-1', 'i-2'])
+        Ec2Query().get_instance_unblended_cost_from_cur('i-2')
+
+        self.assertEqual(result, {'i-1': (12.5, 'usd'), 'i-2': (3.0, 'usd')})
+        self.report.get_report_dataframe.assert_called_once()
+
+    def test_new_precondition_report_rebuilds_index(self):
+        """A new precondition report, e.g. for the next run, is indexed again."""
+        self.assertEqual(Ec2Query().get_instance_unblended_cost_from_cur('i-2'), (3.0, 'usd'))
+
+        report = MagicMock()
+        report.get_report_dataframe.return_value = pd.DataFrame({'line_item_resource_id': ['i-2'], 'line_item_unblended_cost': ['7']})
+        self.mock_config_instance.precondition_reports.precondition_reports_in_progress = [report]
+
+        self.assertEqual(Ec2Query().get_instance_unblended_cost_from_cur('i-2'), (7.0, 'usd'))
+
+if __name__ == '__main__':
+    unittest.main()
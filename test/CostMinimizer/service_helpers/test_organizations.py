@@ -0,0 +1,92 @@
+import unittest
+from datetime import datetime
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from CostMinimizer.service_helpers.organizations import OrganizationSnapshot
+
+
+def make_account(account_id):
+    return {
+        'Id': account_id,
+        'Arn': f'arn:aws:organizations::111111111111:account/o-example/{account_id}',
+        'Email': f'{account_id}@example.com',
+        'Name': f'account-{account_id}',
+        'Status': 'ACTIVE',
+        'JoinedMethod': 'CREATED',
+        'JoinedTimestamp': datetime(2024, 1, 1)
+    }
+
+
+@pytest.mark.usefixtures('tooling_database', 'mock_config')
+class TestOrganizationSnapshot(unittest.TestCase):
+    """Test cases for the OrganizationSnapshot class."""
+
+    database_tables = ['coworgsnapshot', 'coworgaccounts']
+    config_target = 'CostMinimizer.service_helpers.organizations.Config'
+
+    def setUp(self):
+        self.client = boto3.client('organizations', region_name='us-east-1',
+            aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.stubber = Stubber(self.client)
+
+    def stub_organization(self):
+        self.stubber.add_response('describe_organization',
+            {'Organization': {'Id': 'o-example', 'MasterAccountId': '111111111111'}})
+
+    def stub_pages(self, *pages):
+        token = None
+        for i, page in enumerate(pages):
+            response = {'Accounts': [make_account(a) for a in page]}
+            if i < len(pages) - 1:
+                response['NextToken'] = f'token-{i}'
+            self.stubber.add_response('list_accounts', response, {'NextToken': token} if token else {})
+            token = response.get('NextToken')
+
+    def test_snapshot_is_paginated_and_reused(self):
+        """All list_accounts pages are crawled once, the next run is served from the database."""
+        self.stub_organization()
+        self.stub_pages(['111111111111', '222222222222'], ['333333333333'])
+
+        with self.stubber:
+            snapshot = OrganizationSnapshot(client=self.client)
+            organization = snapshot.describe('111111111111')
+            accounts = snapshot.list_accounts(organization['organization_id'])
+
+            self.assertTrue(organization['is_payer'])
+            self.assertEqual([a['Id'] for a in accounts], ['111111111111', '222222222222', '333333333333'])
+
+            # no stubbed response left: any further API call would fail
+            rerun = OrganizationSnapshot(client=self.client)
+            self.assertTrue(rerun.describe('111111111111')['is_payer'])
+            self.assertEqual(len(rerun.list_accounts('o-example')), 3)
+        self.stubber.assert_no_pending_responses()
+
+    def test_expired_snapshot_is_refreshed(self):
+        """An expired snapshot is crawled again and accounts that left the organization are removed."""
+        self.stub_pages(['111111111111', '222222222222'])
+        self.stub_pages(['111111111111', '444444444444'])
+
+        with self.stubber:
+            OrganizationSnapshot(client=self.client).list_accounts('o-example')
+            accounts = OrganizationSnapshot(client=self.client, ttl=0).list_accounts('o-example')
+
+        self.assertEqual([a['Id'] for a in accounts], ['111111111111', '444444444444'])
+        stored, _ = self.database.get_org_accounts('o-example')
+        self.assertEqual([a['Id'] for a in stored], ['111111111111', '444444444444'])
+
+    def test_standalone_account(self):
+        """An account outside of any organization is cached as a standalone account."""
+        self.stubber.add_client_error('describe_organization', 'AWSOrganizationsNotInUseException')
+
+        with self.stubber:
+            organization = OrganizationSnapshot(client=self.client).describe('555555555555')
+            self.assertFalse(OrganizationSnapshot(client=self.client).describe('555555555555')['is_payer'])
+
+        self.assertFalse(organization['is_payer'])
+        self.assertIsNone(organization['organization_id'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from CostMinimizer.service_helpers.savings_plans import SavingsPlansRatesLoader
+
+
+def make_result(instance_type, rate, offering_id='offering-1'):
+    return {
+        'savingsPlanOffering': {
+            'offeringId': offering_id,
+            'paymentOption': 'No Upfront',
+            'planType': 'Compute',
+            'durationSeconds': 31536000,
+            'currency': 'USD',
+            'planDescription': '1 year No Upfront Compute Savings Plan'
+        },
+        'rate': str(rate),
+        'unit': 'Hrs',
+        'productType': 'EC2',
+        'serviceCode': 'AmazonEC2',
+        'usageType': f'USE1-BoxUsage:{instance_type}',
+        'operation': 'RunInstances',
+        'properties': [
+            {'name': 'region', 'value': 'us-east-1'},
+            {'name': 'instanceType', 'value': instance_type},
+            {'name': 'tenancy', 'value': 'shared'}
+        ]
+    }
+
+
+@pytest.mark.usefixtures('tooling_database', 'mock_config')
+class TestSavingsPlansRatesLoader(unittest.TestCase):
+    """Test cases for the SavingsPlansRatesLoader class."""
+
+    database_tables = ['cowsavingsplanrates']
+    config_target = 'CostMinimizer.service_helpers.savings_plans.Config'
+
+    def setUp(self):
+        self.client = boto3.client('savingsplans', region_name='us-east-1',
+            aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.stubber = Stubber(self.client)
+
+    def test_load_pages_and_upserts(self):
+        """Rates of every page are written, and a reload updates existing rows."""
+        expected = {
+            'products': ['EC2'],
+            'savingsPlanTypes': ['Compute'],
+            'filters': [{'name': 'region', 'values': ['us-east-1']}],
+            'maxResults': 1000
+        }
+        self.stubber.add_response('describe_savings_plans_offering_rates',
+            {'searchResults': [make_result('m5.large', 0.068)], 'nextToken': 'page-2'}, expected)
+        self.stubber.add_response('describe_savings_plans_offering_rates',
+            {'searchResults': [make_result('c5.large', 0.061)]}, dict(expected, nextToken='page-2'))
+        self.stubber.add_response('describe_savings_plans_offering_rates',
+            {'searchResults': [make_result('m5.large', 0.070)]}, expected)
+
+        loader = SavingsPlansRatesLoader(client=self.client, products=['EC2'], plan_types=['Compute'])
+        with self.stubber:
+            self.assertEqual(loader.load(['us-east-1']), 2)
+            self.assertEqual(loader.load(['us-east-1']), 1)
+
+        df = self.database.get_savings_plan_rates_from_db(region='us-east-1', instance_types=['m5.large', 'c5.large'])
+        self.assertEqual(len(df), 2)
+        rates = dict(zip(df['instance_type'], df['rate']))
+        self.assertAlmostEqual(rates['m5.large'], 0.070)
+        self.assertAlmostEqual(rates['c5.large'], 0.061)
+
+    def test_load_skips_failed_product(self):
+        """An API error for one product does not stop the load."""
+        self.stubber.add_client_error('describe_savings_plans_offering_rates', 'ValidationException')
+        self.stubber.add_response('describe_savings_plans_offering_rates',
+            {'searchResults': [make_result('m5.large', 0.068)]})
+
+        loader = SavingsPlansRatesLoader(client=self.client, products=['Lambda', 'EC2'], plan_types=['Compute'])
+        with self.stubber:
+            self.assertEqual(loader.load(['us-east-1']), 1)
+
+    def test_refresh_only_loads_stale_regions(self):
+        """Regions loaded within rates_ttl are not requested again."""
+        self.stubber.add_response('describe_savings_plans_offering_rates',
+            {'searchResults': [make_result('m5.large', 0.068)]})
+
+        loader = SavingsPlansRatesLoader(client=self.client, products=['EC2'], plan_types=['Compute'])
+        with self.stubber:
+            self.assertEqual(loader.refresh(['us-east-1']), 1)
+            self.assertEqual(loader.refresh(['us-east-1']), 0)
+
+        self.stubber.assert_no_pending_responses()
+
+    def test_refresh_is_per_product_type(self):
+        """Loaded EC2 rates do not make the missing Lambda rates of the same region look fresh."""
+        self.stubber.add_response('describe_savings_plans_offering_rates',
+            {'searchResults': [make_result('m5.large', 0.068)]})
+        self.stubber.add_response('describe_savings_plans_offering_rates',
+            {'searchResults': []},
+            {'products': ['Lambda'], 'savingsPlanTypes': ['Compute'], 'filters': [{'name': 'region', 'values': ['us-east-1']}], 'maxResults': 1000})
+
+        with self.stubber:
+            SavingsPlansRatesLoader(client=self.client, products=['EC2'], plan_types=['Compute']).refresh(['us-east-1'])
+            self.assertEqual(SavingsPlansRatesLoader(client=self.client, products=['EC2', 'Lambda'], plan_types=['Compute']).refresh(['us-east-1']), 0)
+
+        self.stubber.assert_no_pending_responses()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from CostMinimizer.service_helpers.trusted_advisor import TrustedAdvisorChecks
+
+
+def make_check(check_id, name):
+    return {'id': check_id, 'name': name, 'description': '', 'category': 'cost_optimizing', 'metadata': ['Region', 'Name']}
+
+
+def make_summary(check_id, flagged):
+    return {'checkId': check_id, 'timestamp': '2024-01-01T00:00:00Z', 'status': 'warning' if flagged else 'ok',
+        'hasFlaggedResources': flagged > 0, 'categorySpecificSummary': {},
+        'resourcesSummary': {'resourcesProcessed': 10, 'resourcesFlagged': flagged, 'resourcesIgnored': 0, 'resourcesSuppressed': 0}}
+
+
+@pytest.mark.usefixtures('tooling_database', 'mock_config')
+class TestTrustedAdvisorChecks(unittest.TestCase):
+    """Test cases for the TrustedAdvisorChecks class."""
+
+    database_tables = ['cowtachecks']
+    config_target = 'CostMinimizer.service_helpers.trusted_advisor.Config'
+    config_internals = {'trusted_advisor': {'max_workers': 1}}
+
+    def setUp(self):
+        self.client = boto3.client('support', region_name='us-east-1',
+            aws_access_key_id='testing', aws_secret_access_key='testing')
+        self.stubber = Stubber(self.client)
+
+    def test_catalog_is_persisted(self):
+        """The catalog is fetched once and read from the database by the next run."""
+        self.stubber.add_response('describe_trusted_advisor_checks',
+            {'checks': [make_check('c1', 'Idle Load Balancers'), make_check('c2', 'Low Utilization Amazon EC2 Instances')]},
+            {'language': 'en'})
+
+        with self.stubber:
+            self.assertEqual(TrustedAdvisorChecks(self.client).get_catalog()['Idle Load Balancers']['id'], 'c1')
+            catalog = TrustedAdvisorChecks(self.client).get_catalog()
+
+        self.assertEqual(catalog['Low Utilization Amazon EC2 Instances']['metadata'], ['Region', 'Name'])
+        self.stubber.assert_no_pending_responses()
+
+    def test_checks_without_flagged_resources_are_skipped(self):
+        """Only the results of checks with flagged resources are requested."""
+        self.stubber.add_response('describe_trusted_advisor_check_summaries',
+            {'summaries': [make_summary('c1', 2), make_summary('c2', 0)]}, {'checkIds': ['c1', 'c2']})
+        result = dict(make_summary('c1', 2), flaggedResources=[{'status': 'warning', 'resourceId': 'r1', 'metadata': ['us-east-1', 'lb']}])
+        del result['hasFlaggedResources']
+        self.stubber.add_response('describe_trusted_advisor_check_result', {'result': result}, {'checkId': 'c1', 'language': 'en'})
+
+        with self.stubber:
+            checks = TrustedAdvisorChecks(self.client)
+            checks.prefetch(['c2', 'c1', 'c1'])
+
+            self.assertEqual(len(checks.describe_trusted_advisor_check_result(checkId='c1')['result']['flaggedResources']), 1)
+            skipped = checks.describe_trusted_advisor_check_result(checkId='c2')['result']
+
+        self.assertEqual(skipped['flaggedResources'], [])
+        self.assertEqual(skipped['status'], 'ok')
+        self.stubber.assert_no_pending_responses()
+
+if __name__ == '__main__':
+    unittest.main()
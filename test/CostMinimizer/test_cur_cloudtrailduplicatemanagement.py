@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import pandas as pd
+
+from CostMinimizer.report_providers.cur_reports.reports.cur_cloudtrailduplicatemanagement import CurCloudtrailduplicatemanagement
+
+TRAIL_ARN = 'arn:aws:cloudtrail:us-east-1:123456789012:trail/management'
+
+
+def athena_row(*values):
+    return {'Data': [{'VarCharValue': value} for value in values]}
+
+
+class TestCurCloudtrailduplicatemanagement(unittest.TestCase):
+
+    def setUp(self):
+        app_config = MagicMock()
+        app_config.selected_regions = ['us-east-1']
+        self.report = CurCloudtrailduplicatemanagement(app_config)
+        self.report.logger = MagicMock()
+
+    def add_cur_report(self, rows):
+        header = athena_row('line_item_usage_account_id', 'product_region_code', 'line_item_resource_id', 'cost')
+        with patch.object(self.report, 'run_athena_query', return_value=[header] + rows):
+            self.report.addCurReport(MagicMock(), 'SELECT 1', (2, 0, 2, 0), (3, 1, 3, -1), [3, 4], [1])
+        return self.report.report_result[0]['Data']
+
+    @patch('CostMinimizer.report_providers.cur_reports.reports.cur_cloudtrailduplicatemanagement.TrailInventory')
+    def test_trails_are_joined_by_region(self, mock_inventory):
+        """The trails of the product_region_code regions are joined on the trail ARN"""
+        mock_inventory.return_value.get_trails.return_value = pd.DataFrame([
+            {'trail_arn': TRAIL_ARN, 'cloudtrail_name': 'management', 'is_multi_region_trail': True}])
+
+        df = self.add_cur_report([athena_row('123456789012', 'us-east-1', TRAIL_ARN, '12.5')])
+
+        mock_inventory.return_value.get_trails.assert_called_once_with(['us-east-1'])
+        self.assertEqual(df[['cloudtrail_name', 'is_multi_region_trail']].values.tolist(), [['management', True]])
+
+    @patch('CostMinimizer.report_providers.cur_reports.reports.cur_cloudtrailduplicatemanagement.TrailInventory')
+    def test_trail_columns_default_when_the_trails_cannot_be_read(self, mock_inventory):
+        """A failed trail lookup keeps the CUR rows with the default trail columns"""
+        mock_inventory.return_value.get_trails.side_effect = RuntimeError('AccessDenied')
+
+        df = self.add_cur_report([athena_row('123456789012', 'us-east-1', TRAIL_ARN, '12.5')])
+
+        self.assertEqual(list(df.columns), self.report.get_required_columns())
+        self.assertEqual(df[['cloudtrail_name', 'is_multi_region_trail']].values.tolist(), [['Unknown', False]])
+
+    def test_empty_result_has_every_column(self):
+        """An empty CUR result still has the expected columns"""
+        df = self.add_cur_report([])
+
+        self.assertTrue(df.empty)
+        self.assertEqual(list(df.columns), self.report.get_required_columns())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import pandas as pd
+import sys
+import os
+
+# Add the src directory to the path so we can import the module
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
+
+from CostMinimizer.report_providers.cur_reports.reports.cur_dynamodblegacyglobaltablescost import CurDynamodblegacyglobaltablescost
+
+class TestCurDynamodblegacyglobaltablescost(unittest.TestCase):
+
+    def setUp(self):
+        app_config = MagicMock()
+        app_config.selected_regions = ['us-east-1']
+        app_config.selected_accounts = ['123456789012']
+        self.report = CurDynamodblegacyglobaltablescost(app_config)
+        self.report.logger = MagicMock()
+
+    @patch('CostMinimizer.report_providers.cur_reports.reports.cur_dynamodblegacyglobaltablescost.GlobalTableInspector')
+    def test_process_check_data(self, mock_inspector):
+        """Each CUR account is inspected on its own, a region that could not be listed is not inspected"""
+        def inspector(account):
+            instance = MagicMock()
+            if account == '123456789012':
+                instance.get_global_tables.return_value = pd.DataFrame([
+                    {'line_item_usage_account_id': '123456789012', 'region': 'us-east-1', 'global_table_name': 'orders', 'global_table_version': '2017.11.29'}])
+                instance.failed_regions = set()
+            else:
+                instance.get_global_tables.return_value = pd.DataFrame(columns=['line_item_usage_account_id', 'region', 'global_table_name', 'global_table_version'])
+                instance.failed_regions = {'us-east-1'}
+            return instance
+        mock_inspector.side_effect = inspector
+
+        cur_df = pd.DataFrame([
+            {'line_item_usage_account_id': '123456789012', 'region': 'us-east-1', 'global_table_name': 'orders'},
+            {'line_item_usage_account_id': '123456789012', 'region': 'us-east-1', 'global_table_name': 'users'},
+            {'line_item_usage_account_id': '210987654321', 'region': 'us-east-1', 'global_table_name': 'orders'}])
+
+        df = self.report.process_check_data(cur_df)
+
+        self.assertEqual(sorted(c.kwargs['account'] for c in mock_inspector.call_args_list), ['123456789012', '210987654321'])
+        self.assertEqual(list(df['global_table_version']), ['2017.11.29', '', 'not inspected'])
+
+if __name__ == '__main__':
+    unittest.main()